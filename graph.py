@@ -1,8 +1,502 @@
+import mmap
+import multiprocessing
+import os
+import re
 import string
-from typing import Union
+import struct
+import sys
+import threading
+import zlib
+from bisect import bisect_right
+from collections import Counter, OrderedDict, deque
+from heapq import heappop, heappush
+from itertools import chain, islice
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from enum import Enum
+from functools import wraps
+from multiprocessing.shared_memory import SharedMemory
+from types import MappingProxyType
+from typing import NamedTuple, Union
+
+import numpy as np
 
 GraphDict = dict[Union[int, str], list[int | str]]
 GraphDictWeight = dict[Union[int, str], list[list[int | str]]]
+AdjacencyDict = dict[Union[int, str], dict[Union[int, str], int]]
+
+# доля ребер от V², ниже которой all_pairs_distances считает граф разреженным
+SPARSE_DENSITY = 0.05
+
+# сколько строк массива ребер NumPy add_edges переводит в объекты Python за раз
+EDGES_CHUNK_SIZE = 65536
+
+# сколько ячеек матрицы смежности (строк × V) разбирать и записывать за раз при работе с текстовыми файлами
+MATRIX_CHUNK_CELLS = 1 << 20
+
+# признаки дробной записи числа в матрице смежности: точка, экспонента, inf, nan
+MATRIX_FLOAT_CHARS = re.compile(rb'[.eEiInN]')
+
+# экранирование в списке ребер: поля разделяются табуляцией, спецсимволы названий - обратной косой чертой
+EDGE_LIST_ESCAPES = {'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'}
+EDGE_LIST_UNESCAPES = {'t': '\t', 'n': '\n', 'r': '\r'}
+
+# двоичный снимок графа (Graph.save / Graph.load)
+SNAPSHOT_MAGIC = b'GRAPHCSR'
+SNAPSHOT_VERSION = 2
+SNAPSHOT_HEADER = struct.Struct('<8sIIIqqqq')
+SNAPSHOT_HEADER_SIZE = 64
+SNAPSHOT_INT_WEIGHTS, SNAPSHOT_FLOAT_WEIGHTS = 0, 1
+SNAPSHOT_INT_LABELS, SNAPSHOT_STR_LABELS = 0, 1
+
+# количество итераций уточнения цветов Вейсфейлера-Лемана по умолчанию
+WL_ITERATIONS = 3
+
+# размер кэша результатов запросов по умолчанию (Graph.enable_cache)
+QUERY_CACHE_ENTRIES = 128
+
+
+class GraphEventKind(Enum):
+    """
+    Виды изменений графа
+    """
+
+    VERTEX_ADDED = 'vertex_added'
+    # удаляется вместе со всеми инцидентными ребрами: перед ним для каждого из них отправляется EDGE_REMOVED
+    VERTEX_REMOVED = 'vertex_removed'
+    EDGE_ADDED = 'edge_added'
+    EDGE_REMOVED = 'edge_removed'
+    EDGE_REWEIGHTED = 'edge_reweighted'
+    # весь словарь смежности заменен (создание из матрицы, чтение из файла)
+    GRAPH_RESET = 'graph_reset'
+
+
+class GraphEvent(NamedTuple):
+    """
+    Событие изменения графа, передается подписчикам Graph.subscribe
+
+    Атрибуты
+        kind: GraphEventKind
+            вид изменения
+        version: int
+            номер версии графа после изменения, строго возрастает
+        start_vertex: str | int | None
+            вершина или начальная вершина ребра
+        end_vertex: str | int | None
+            конечная вершина ребра
+        weight: int | None
+            вес ребра (для EDGE_REWEIGHTED - новый вес)
+    """
+
+    kind: GraphEventKind
+    version: int
+    start_vertex: str | int | None = None
+    end_vertex: str | int | None = None
+    weight: int | None = None
+
+
+def _estimate_size(value) -> int:
+    """
+    Приблизительный размер результата запроса в байтах для бюджета памяти QueryCache
+
+    Учитываются вложенные списки, кортежи, словари (в том числе MappingProxyType) и массивы NumPy
+    """
+
+    if isinstance(value, np.ndarray):
+        # sys.getsizeof уже учитывает данные массива, который ими владеет
+        return sys.getsizeof(value) + (0 if value.flags.owndata else value.nbytes)
+
+    size = sys.getsizeof(value)
+    if isinstance(value, Mapping):
+        size += sum(_estimate_size(k) + _estimate_size(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple)):
+        size += sum(_estimate_size(item) for item in value)
+
+    return size
+
+
+class QueryCache:
+    """
+    LRU-кэш результатов запросов к графу
+
+    Ключ - (имя метода, аргументы, версия графа). При изменении графа версия растет,
+    поэтому старые результаты никогда не возвращаются; при первом обращении
+    после изменения кэш очищается целиком
+
+    Атрибуты
+        max_entries: int
+            наибольшее число хранимых результатов
+        max_bytes: int | None
+            бюджет памяти в байтах (оценка по _estimate_size), None - без ограничения
+        hits, misses, evictions: int
+            счетчики попаданий, промахов и вытеснений
+    """
+
+    def __init__(self, max_entries: int = QUERY_CACHE_ENTRIES, max_bytes: int | None = None) -> None:
+        if max_entries < 1:
+            raise Exception("Размер кэша должен быть положительным", "max_entries < 1")
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # ключ -> (результат, оценка размера); порядок - от давно использованных к недавним
+        self._entries: OrderedDict = OrderedDict()
+        self._bytes = 0
+        self._version: int | None = None
+
+
+    def get(self, key: tuple, version: int) -> tuple[bool, object]:
+        """
+        Поиск результата в кэше
+
+        Возвращает кортеж (найден ли результат, результат)
+        """
+
+        if version != self._version:
+            self.clear()
+            self._version = version
+
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return False, None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return True, entry[0]
+
+
+    def put(self, key: tuple, value: object) -> None:
+        """
+        Сохранение результата с вытеснением давно не использованных записей
+
+        Результат больше всего бюджета памяти не сохраняется
+        """
+
+        size = _estimate_size(value) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+
+        self._entries[key] = (value, size)
+        self._bytes += size
+
+        while len(self._entries) > self.max_entries or (self.max_bytes is not None and self._bytes > self.max_bytes):
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+            self.evictions += 1
+
+
+    def clear(self) -> None:
+        """
+        Удаление всех записей (счетчики сохраняются)
+        """
+
+        self._entries.clear()
+        self._bytes = 0
+
+
+    def stats(self) -> dict[str, int]:
+        """
+        Статистика кэша: попадания, промахи, вытеснения, число записей и оценка занятой памяти
+        """
+
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self._entries),
+            'bytes': self._bytes,
+        }
+
+
+def _cached_query(method: Callable) -> Callable:
+    """
+    Декоратор метода Graph: результат берется из кэша запросов, если он включен (Graph.enable_cache)
+
+    Метод должен возвращать неизменяемый результат (кортежи, массивы NumPy только для чтения),
+    тогда один объект можно выдавать при каждом попадании. Без включенного кэша
+    накладные расходы - одна проверка атрибута
+    """
+
+    name = method.__name__
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        cache = self._query_cache
+        if cache is None:
+            return method(self, *args, **kwargs)
+
+        key = (name, args, tuple(sorted(kwargs.items())))
+        try:
+            found, value = cache.get(key, self._version)
+        except TypeError:
+            # нехешируемые аргументы - считаем без кэша
+            return method(self, *args, **kwargs)
+
+        if not found:
+            value = method(self, *args, **kwargs)
+            cache.put(key, value)
+
+        # кэшируемые методы возвращают неизменяемые результаты, поэтому объект из кэша отдается без копии
+        return value
+
+    return wrapper
+
+
+def _synchronized(method: Callable) -> Callable:
+    """
+    Декоратор метода FrozenGraph, заполняющего ленивый кэш (массивы CSR, битовая матрица,
+    таблица расстояний, система непересекающихся множеств): вызов выполняется под
+    блокировкой снимка, поэтому кэш заполняется одним потоком, а остальные получают
+    уже готовый результат
+    """
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._cache_lock:
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+def _csr_bfs_levels(indptr: np.ndarray, indices: np.ndarray, source: int, max_depth: int | None = None,
+                    targets: np.ndarray | None = None) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Поуровневый обход в ширину по массивам CSR векторными операциями NumPy
+
+    На каждом уровне соседи всего фронта собираются одним срезом по indptr,
+    уже посещенные вершины отсекаются маской, остальные образуют следующий фронт
+
+    Параметры
+    ---------
+    indptr, indices: np.ndarray
+        массивы CSR (см. Graph.get_adjacency_sparse)
+    source: int
+        номер стартовой вершины
+    max_depth: int | None
+        максимальное число уровней, по умолчанию без ограничения
+    targets: np.ndarray | None
+        номера вершин, после достижения всех которых обход останавливается
+
+    Возвращает (расстояния, родители) - массивы int64 длины V,
+    у недостижимых вершин расстояние и родитель -1, у стартовой родитель -1
+    """
+
+    vertices_count = len(indptr) - 1
+    distances = np.full(vertices_count, -1, dtype=np.int64)
+    parents = np.full(vertices_count, -1, dtype=np.int64)
+
+    distances[source] = 0
+    frontier = np.array([source], dtype=np.int64)
+    level = 0
+
+    while len(frontier) and (max_depth is None or level < max_depth):
+        if targets is not None and (distances[targets] >= 0).all():
+            break
+
+        starts = indptr[frontier]
+        counts = indptr[frontier + 1] - starts
+        total = int(counts.sum())
+        if not total:
+            break
+
+        # номера ребер всех вершин фронта: starts[i], starts[i] + 1, ... подряд для каждой вершины
+        offsets = np.cumsum(counts) - counts
+        positions = np.repeat(starts - offsets, counts) + np.arange(total)
+        neighbors = indices[positions]
+        sources = np.repeat(frontier, counts)
+
+        fresh = distances[neighbors] < 0
+        frontier, first = np.unique(neighbors[fresh], return_index=True)
+
+        level += 1
+        distances[frontier] = level
+        parents[frontier] = sources[fresh][first]
+
+    return distances, parents
+
+
+def _csr_sorted_rows(indptr: np.ndarray, indices: np.ndarray,
+                     weights: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Упорядочивание соседей внутри каждой строки CSR по номеру (для двоичного поиска)
+
+    Уже упорядоченные массивы (например, отображенные из файла Graph.save) не копируются
+
+    Возвращает (indices, weights)
+    """
+
+    if len(indices) < 2:
+        return indices, weights
+
+    # убывание номера допустимо только на границе строк
+    drops = np.flatnonzero(indices[1:] <= indices[:-1]) + 1
+    if np.isin(drops, indptr).all():
+        return indices, weights
+
+    rows = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+    order = np.lexsort((indices, rows))
+
+    return indices[order], weights[order]
+
+
+def _csr_dijkstra(indptr: np.ndarray, indices: np.ndarray, weights: np.ndarray, source: int,
+                  targets: Iterable[int] | None = None) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Алгоритм Дейкстры по массивам CSR на двоичной куче
+
+    Веса должны быть неотрицательными, проверка остается вызывающему коду
+
+    Параметры
+    ---------
+    indptr, indices, weights: np.ndarray
+        массивы CSR (см. Graph.get_adjacency_sparse)
+    source: int
+        номер стартовой вершины
+    targets: Iterable[int] | None
+        номера вершин, после фиксации расстояний до всех которых поиск останавливается
+
+    Возвращает (расстояния, родители) - массивы float64 и int64 длины V,
+    у недостигнутых вершин расстояние inf и родитель -1, у стартовой родитель -1
+    """
+
+    remaining = set(targets) if targets is not None else None
+    distances = {source: 0}
+    parents = {}
+    settled = []
+    done = set()
+
+    # номера вершин - целые числа, поэтому в куче их можно сравнивать без счетчика
+    heap = [(0, source)]
+
+    while heap:
+        distance, current_node = heappop(heap)
+        if current_node in done:
+            continue
+        done.add(current_node)
+        settled.append(current_node)
+
+        if remaining is not None:
+            remaining.discard(current_node)
+            if not remaining:
+                break
+
+        start, end = int(indptr[current_node]), int(indptr[current_node + 1])
+        for neighbor_node, weight in zip(indices[start:end].tolist(), weights[start:end].tolist()):
+            new_distance = distance + weight
+            if neighbor_node not in distances or new_distance < distances[neighbor_node]:
+                distances[neighbor_node] = new_distance
+                parents[neighbor_node] = current_node
+                heappush(heap, (new_distance, neighbor_node))
+
+    # в результат попадают только зафиксированные вершины, остальные расстояния могут быть не окончательными
+    result_distances = np.full(len(indptr) - 1, np.inf)
+    result_parents = np.full(len(indptr) - 1, -1, dtype=np.int64)
+    settled_ids = np.array(settled, dtype=np.int64)
+    result_distances[settled_ids] = [distances[node] for node in settled]
+    result_parents[settled_ids[1:]] = [parents[node] for node in settled[1:]]
+
+    return result_distances, result_parents
+
+
+def _csr_hop_distances(indptr: np.ndarray, indices: np.ndarray, weights: np.ndarray, source: int) -> np.ndarray:
+    return _csr_bfs_levels(indptr, indices, source)[0]
+
+
+def _csr_weighted_distances(indptr: np.ndarray, indices: np.ndarray, weights: np.ndarray, source: int) -> np.ndarray:
+    return _csr_dijkstra(indptr, indices, weights, source)[0]
+
+
+def _csr_paths_to_targets(indptr: np.ndarray, indices: np.ndarray, weights: np.ndarray, source: int,
+                          targets: list[int], weighted: bool) -> dict:
+    """
+    Кратчайшие пути от одного источника до нескольких целей одним поиском,
+    который останавливается, как только все цели достигнуты
+
+    Возвращает {номер цели: (путь из номеров вершин, длина пути) или None}
+    """
+
+    if weighted:
+        distances, parents = _csr_dijkstra(indptr, indices, weights, source, targets)
+        reached = np.isfinite(distances)
+    else:
+        distances, parents = _csr_bfs_levels(indptr, indices, source, targets=np.array(targets, dtype=np.int64))
+        reached = distances >= 0
+
+    result = {}
+    for target in targets:
+        if not reached[target]:
+            result[target] = None
+            continue
+
+        path = [target]
+        while parents[path[-1]] >= 0:
+            path.append(int(parents[path[-1]]))
+        path.reverse()
+
+        distance = distances[target].item()
+        # веса-целые числа дают целую длину, как у Graph.shortest_path
+        result[target] = (path, int(distance) if weights.dtype.kind == 'i' else distance)
+
+    return result
+
+
+# алгоритмы Graph.run_many: имя -> функция (indptr, indices, weights, номер источника)
+RUN_MANY_ALGORITHMS = {
+    'bfs': _csr_hop_distances,
+    'dijkstra': _csr_weighted_distances,
+}
+
+# массивы CSR, подключенные рабочим процессом к общей памяти (см. _attach_shared_csr)
+_shared_csr: tuple | None = None
+
+
+def _share_csr(arrays: Sequence[np.ndarray]) -> tuple[SharedMemory, list]:
+    """
+    Копирование массивов в один блок общей памяти, каждый массив выровнен по 8 байт
+
+    Возвращает (блок общей памяти, раскладка [(dtype, смещение, длина)])
+    """
+
+    layout = []
+    size = 0
+    for array in arrays:
+        layout.append((array.dtype.str, size, len(array)))
+        size += (array.nbytes + 7) // 8 * 8
+
+    shared = SharedMemory(create=True, size=max(size, 1))
+    for array, (dtype, offset, count) in zip(arrays, layout):
+        np.ndarray(count, dtype=dtype, buffer=shared.buf, offset=offset)[:] = array
+
+    return shared, layout
+
+
+def _attach_shared_csr(name: str, layout: list, algorithm: str | Callable) -> None:
+    """
+    Инициализатор рабочего процесса: подключение к массивам CSR в общей памяти без копирования
+    """
+
+    global _shared_csr
+
+    shared = SharedMemory(name=name)
+    arrays = [np.ndarray(count, dtype=dtype, buffer=shared.buf, offset=offset) for dtype, offset, count in layout]
+    # блок хранится вместе с массивами, иначе его буфер освободится
+    _shared_csr = (shared, arrays, RUN_MANY_ALGORITHMS.get(algorithm, algorithm))
+
+
+def _run_shared_csr(task: tuple) -> tuple:
+    """
+    Задача рабочего процесса: запуск алгоритма из одного источника
+
+    Возвращает (вершина-источник, результат алгоритма)
+    """
+
+    vertex, source, *extra = task
+    _, (indptr, indices, weights), algorithm = _shared_csr
+
+    return vertex, algorithm(indptr, indices, weights, source, *extra)
 
 
 class Graph:
@@ -14,6 +508,9 @@ class Graph:
             словарь графа
         weighted_graph: bool
             флаг взвешенного графа
+
+    Внутри граф хранится как словарь смежности {вершина: {сосед: вес}},
+    поэтому проверка ребра, получение веса, добавление и удаление ребра - O(1)
     """
 
     def __init__(self, graph_dict: GraphDict | GraphDictWeight = {}, weighted_graph: bool | None = None) -> None:
@@ -40,28 +537,77 @@ class Graph:
         """
 
 
-        self._graph_dict: GraphDict | GraphDictWeight = graph_dict.copy()
-
+        self._graph_dict: AdjacencyDict = {}
 
         # проверка на взвешенный или невзвешенный граф
         if weighted_graph is None:
-            if self._graph_dict:
-                if type(self._graph_dict[list(self._graph_dict.keys())[0]][0]) == list:
-                    weighted_graph = True
-
-        # если нужно, преобразование в взвешенный
-        if not weighted_graph:
-            self.__convert_to_weighted_graph()
+            weighted_graph = any(
+                neighbors and isinstance(neighbors[0], (list, tuple)) for neighbors in graph_dict.values()
+            )
+
+        # построение словаря смежности, невзвешенные ребра получают вес 1
+        for vertex, neighbors in graph_dict.items():
+            if weighted_graph:
+                self._graph_dict[vertex] = {neighbor: weight for neighbor, weight in neighbors}
+            else:
+                self._graph_dict[vertex] = dict.fromkeys(neighbors, 1)
+
+        # граф неориентированный: достраиваем обратные ребра и недостающие вершины,
+        # чтобы список соседей вершины всегда совпадал с обратными ссылками на нее
+        for vertex, neighbors in list(self._graph_dict.items()):
+            for neighbor, weight in neighbors.items():
+                self._graph_dict.setdefault(neighbor, {}).setdefault(vertex, weight)
 
         self.curr_idx = 0
 
+        # номер версии графа, увеличивается при каждом изменении; по нему сбрасываются кэши
+        self._version = 0
+        self._all_pairs_cache: tuple | None = None
+        self._bits_cache: tuple | None = None
+        self._numbers_cache: tuple | None = None
+        self._csr_cache: tuple | None = None
+
+        # система непересекающихся множеств для компонент связности, актуальна при _uf_version == _version;
+        # строится при создании графа и дальше обновляется при add_vertex, add_edge и add_edges
+        self._uf_parent: dict = {}
+        self._uf_size: dict = {}
+        self._components_count = 0
+        self._uf_version = -1
+
+        # счетчики размера графа и гистограмма степеней {степень: количество вершин}
+        self._degree_counts: Counter = Counter()
+        self._degree_sum = 0
+        self._loops_count = 0
+        self._max_degree = 0
+        # вершины, словари соседей которых общие со снимком (см. freeze), копируются при первой записи
+        self._cow_shared: set = set()
+        self._recount()
+        self._union_find()
+
+        # подписчики на события изменения графа (см. subscribe)
+        self._listeners: list[Callable[[GraphEvent], None]] = []
+
+        # кэш результатов запросов, по умолчанию выключен (см. enable_cache)
+        self._query_cache: QueryCache | None = None
+
 
     def get_graph_weighted(self) -> GraphDictWeight:
         """
         Метод для получения взвешенного графа
+
+        Возвращает копию графа в виде GraphDictWeight
+
+        Пример использования:
+
+            graph = Graph({'A': ['B', 'C'],
+                           'B': ['A', 'C'],
+                           'C': ['A', 'B']})
+            print(graph.get_graph_weighted())
+
+            # {'A': [['B', 1], ['C', 1]], 'B': [['A', 1], ['C', 1]], 'C': [['A', 1], ['B', 1]]}
         """
 
-        return self._graph_dict
+        return {v: [[n, w] for n, w in neighbors.items()] for v, neighbors in self._graph_dict.items()}
     
 
     def get_graph_not_weight(self) -> GraphDict:
@@ -80,28 +626,7 @@ class Graph:
             # {'A': ['B', 'C'], 'B': ['A', 'C'], 'C': ['A', 'B']}
         """
 
-        return {i: [el[0] for el in self._graph_dict[i]] for i in self._graph_dict}
-
-
-    def __convert_to_weighted_graph(self) -> None:
-        """
-        Метод реобразования из невзшенного в взвешенный граф (self._graph_dict) с весом ребра 1
-
-        Используется только в методах класса
-
-        Возвращает None
-
-        Пример использования:
-
-            graph = Graph({'A': ['B', 'C'],
-                           'B': ['A', 'C'],
-                           'C': ['A', 'B']})
-            print(graph._graph_dict)
-
-            # {'A': [['B', 1], ['C', 1]], 'B': [['A', 1], ['C', 1]], 'C': [['A', 1], ['B', 1]]}
-        """
-        for v in self._graph_dict:
-            self._graph_dict[v] = [[j, 1] for j in self._graph_dict[v]]
+        return {v: list(neighbors) for v, neighbors in self._graph_dict.items()}
 
 
     def find_vertex_list(self, vertex: str | int, find_vertex: str | int) -> list[str | int, int] | None:
@@ -126,13 +651,66 @@ class Graph:
 
             # ['C', 1]
         """
-        for el in self._graph_dict[vertex]:
-            if el[0] == find_vertex:
-                return el
+        neighbors = self._graph_dict[vertex]
+        if find_vertex in neighbors:
+            return [find_vertex, neighbors[find_vertex]]
 
         return None
 
 
+    def has_edge(self, start_vertex: str | int, end_vertex: str | int) -> bool:
+        """
+        Метод проверки наличия ребра
+
+        Параметры
+        ---------
+        start_vertex: str | int
+            начальная вершина ребра
+        end_vertex: str | int
+            конечная вершина ребра
+
+        Возвращает bool
+
+        Пример использования:
+
+            graph = Graph({'A': ['B'],
+                           'B': ['A'],
+                           'C': []})
+            print(graph.has_edge('A', 'B')) # True
+            print(graph.has_edge('A', 'C')) # False
+        """
+
+        neighbors = self._graph_dict.get(start_vertex)
+        return neighbors is not None and end_vertex in neighbors
+
+
+    def get_edge_weight(self, start_vertex: str | int, end_vertex: str | int) -> int | None:
+        """
+        Метод получения веса ребра
+
+        Параметры
+        ---------
+        start_vertex: str | int
+            начальная вершина ребра
+        end_vertex: str | int
+            конечная вершина ребра
+
+        Возвращает вес ребра или None, если ребра нет
+
+        Пример использования:
+
+            graph = Graph({'A': [['B', 4]],
+                           'B': [['A', 4]]})
+            print(graph.get_edge_weight('A', 'B')) # 4
+        """
+
+        neighbors = self._graph_dict.get(start_vertex)
+        if neighbors is None:
+            return None
+
+        return neighbors.get(end_vertex)
+
+
     def get_vertices(self) -> list[str, int]:
         """
         Метод получения всех вершин графа
@@ -152,7 +730,8 @@ class Graph:
         return [vertex for vertex in self._graph_dict]
 
 
-    def get_edges(self, weights: bool = True) -> list[int | str] | list[int | str]:
+    @_cached_query
+    def get_edges(self, weights: bool = True) -> tuple[tuple, ...]:
         """
         Метод получения всех ребер графа
 
@@ -163,8 +742,8 @@ class Graph:
             возвращение с весами или нет
 
 
-        Возвращает список из ребер в виде [[['A', 'B'], 1], [['B', 'C'], 1]]
-        Если невзвешенный - [['A', 'B'], ['B', 'C']]
+        Возвращает кортеж из ребер в виде ((('A', 'B'), 1), (('B', 'C'), 1))
+        Если невзвешенный - (('A', 'B'), ('B', 'C'))
 
 
         Пример использования:
@@ -174,19 +753,18 @@ class Graph:
                            'C': ['A', 'B']})
             graph.get_edges()
 
-            # [[['A', 'B'], 1], [['A', 'C'], 1], [['B', 'A'], 1], [['B', 'C'], 1], [['C', 'A'], 1], [['C', 'B'], 1]]
+            # ((('A', 'B'), 1), (('A', 'C'), 1), (('B', 'A'), 1), (('B', 'C'), 1), (('C', 'A'), 1), (('C', 'B'), 1))
         """
 
         edges_list: list = list()
 
         for start_vertex in self._graph_dict:
-            for value_vertex in self._graph_dict[start_vertex]:
-                end_vertex, weight = value_vertex
+            for end_vertex, weight in self._graph_dict[start_vertex].items():
                 if weights:
-                    edges_list.append([[start_vertex, end_vertex], weight])
+                    edges_list.append(((start_vertex, end_vertex), weight))
                 else:
-                    edges_list.append([start_vertex, end_vertex])
-        return sorted(edges_list)
+                    edges_list.append((start_vertex, end_vertex))
+        return tuple(sorted(edges_list))
 
 
     def add_vertex(self, vertex: str | int) -> None:
@@ -209,7 +787,10 @@ class Graph:
         """
 
         if vertex not in self._graph_dict:
-            self._graph_dict[vertex] = []
+            self._graph_dict[vertex] = {}
+            self._degree_change(None, 0)
+            self._mutated(GraphEventKind.VERTEX_ADDED, vertex)
+            self._union_find_update(vertex)
 
 
     def add_vertices(self, vertices: list[str | int]) -> None:
@@ -258,12 +839,21 @@ class Graph:
         if vertex_remove not in self._graph_dict:
             raise Exception("Вершина ис нот найти", "Нету такой вершины")
 
-        for vertex in self._graph_dict:
-            vertex_data = self.find_vertex_list(vertex, vertex_remove)
-            if vertex_data:
-                self._graph_dict[vertex].remove(vertex_data)
+        # граф неориентированный, поэтому ссылки на вершину есть только у ее соседей
+        neighbors = self._graph_dict.pop(vertex_remove)
+        self._degree_change(len(neighbors), None)
+        self._loops_count -= vertex_remove in neighbors
 
-        self._graph_dict.pop(vertex_remove)
+        for neighbor in neighbors:
+            if neighbor != vertex_remove:
+                neighbor_neighbors = self._own(neighbor)
+                del neighbor_neighbors[vertex_remove]
+                self._degree_change(len(neighbor_neighbors) + 1, len(neighbor_neighbors))
+
+        if self._listeners:
+            for neighbor, weight in neighbors.items():
+                self._mutated(GraphEventKind.EDGE_REMOVED, vertex_remove, neighbor, weight)
+        self._mutated(GraphEventKind.VERTEX_REMOVED, vertex_remove)
 
 
     def delete_vertices(self, vertices_remove: list[str | int]) -> None:
@@ -276,7 +866,8 @@ class Graph:
             удаляемые вершины
 
         Возвращает None
-        Вызывает исключение, в случае если какая-либо вершина из списка не найдена
+        Вызывает исключение, в случае если какая-либо вершина из списка не найдена,
+        при этом граф не изменяется
 
 
         Пример использования:
@@ -287,8 +878,36 @@ class Graph:
             graph.delete_vertices(['B', 'C']) # None
         """
 
+        vertices_remove = set(vertices_remove)
+
+        for vertex in vertices_remove:
+            if vertex not in self._graph_dict:
+                raise Exception("Вершина ис нот найти", "Нету такой вершины")
+
+        # удаленные ребра запоминаются только для подписчиков на события, ребро между
+        # двумя удаляемыми вершинами - один раз
+        removed_edges: dict | None = {} if self._listeners else None
+
+        # за один проход по спискам соседей удаляемых вершин чистим оставшиеся вершины
+        for vertex in vertices_remove:
+            neighbors = self._graph_dict.pop(vertex)
+            if removed_edges is not None:
+                removed_edges[vertex] = [(neighbor, weight) for neighbor, weight in neighbors.items()
+                                         if neighbor not in removed_edges]
+            self._degree_change(len(neighbors), None)
+            self._loops_count -= vertex in neighbors
+
+            for neighbor in neighbors:
+                if neighbor not in vertices_remove:
+                    neighbor_neighbors = self._own(neighbor)
+                    del neighbor_neighbors[vertex]
+                    self._degree_change(len(neighbor_neighbors) + 1, len(neighbor_neighbors))
+
         for vertex in vertices_remove:
-            self.delete_vertex(vertex)
+            if removed_edges is not None:
+                for neighbor, weight in removed_edges[vertex]:
+                    self._mutated(GraphEventKind.EDGE_REMOVED, vertex, neighbor, weight)
+            self._mutated(GraphEventKind.VERTEX_REMOVED, vertex)
 
 
     def add_edge(self, start_vertex: str | int, end_vertex: str | int, weight: int = 1) -> None:
@@ -317,45 +936,74 @@ class Graph:
         if start_vertex not in self._graph_dict: self.add_vertex(start_vertex)
         if end_vertex not in self._graph_dict: self.add_vertex(end_vertex)
 
-        if not self.find_vertex_list(start_vertex, end_vertex):
-            self._graph_dict[start_vertex].append([end_vertex, weight])
-        if not self.find_vertex_list(end_vertex, start_vertex):
-            self._graph_dict[end_vertex].append([start_vertex, weight])
+        if end_vertex not in self._graph_dict[start_vertex]:
+            start_neighbors, end_neighbors = self._own(start_vertex), self._own(end_vertex)
+
+            start_neighbors[end_vertex] = weight
+            self._degree_change(len(start_neighbors) - 1, len(start_neighbors))
+            if start_vertex == end_vertex:
+                self._loops_count += 1
 
+            if start_vertex not in end_neighbors:
+                end_neighbors[start_vertex] = weight
+                self._degree_change(len(end_neighbors) - 1, len(end_neighbors))
 
-    def add_edges(self, edges: list[list[str | int, int]]) -> None:
+            self._mutated(GraphEventKind.EDGE_ADDED, start_vertex, end_vertex, weight)
+            self._union_find_update(start_vertex, end_vertex)
+
+
+    def set_edge_weight(self, start_vertex: str | int, end_vertex: str | int, weight: int) -> None:
         """
-        Метод добавления ребер
+        Метод изменения веса существующего ребра
 
         Параметры
         ---------
-        edges: list[list[str | int, int]]
-            список добавляемых ребер
+        start_vertex: str | int
+            начальная вершина ребра
+        end_vertex: str | int
+            конечная вершина ребра
+        weight: int
+            новый вес ребра
 
         Возвращает None
+        Вызывает исключение, в случае если ребро не найдено
 
         Пример использования:
 
-            graph = Graph({'A': ['B', 'C'],
-                           'B': ['A', 'C'],
-                           'C': ['A', 'B']})
-            graph.add_edges(['C', 'D', 3], ['D', 'A', 2]) # None
+            graph = Graph({'A': ['B'], 'B': ['A']})
+            graph.set_edge_weight('A', 'B', 5) # None
         """
 
-        for edge in edges:
-            self.add_edge(*edge)
+        if not self.has_edge(start_vertex, end_vertex):
+            raise Exception("Ребро ис нот найти", "Нету такого ребра")
 
+        if self._graph_dict[start_vertex][end_vertex] != weight:
+            union_find_current = self._uf_version == self._version
 
-    def delete_edge(self, start_vertex: str | int, end_vertex: str | int) -> None:
+            self._own(start_vertex)[end_vertex] = weight
+            self._own(end_vertex)[start_vertex] = weight
+            self._mutated(GraphEventKind.EDGE_REWEIGHTED, start_vertex, end_vertex, weight)
+
+            # изменение веса не меняет связность, поэтому актуальная система множеств остается актуальной
+            if union_find_current:
+                self._uf_version = self._version
+
+
+    def add_edges(self, edges: Iterable[Sequence] | np.ndarray, chunk_size: int = EDGES_CHUNK_SIZE) -> None:
         """
-        Метод удаления ребра
+        Метод добавления ребер
+
+        Ребра добавляются за один проход напрямую в словарь смежности, повторные ребра
+        пропускаются (как и в add_edge, остается первый вес). Любой итерируемый объект,
+        например генератор, читается потоково, без построения полного списка ребер
 
         Параметры
         ---------
-        start_vertex: str | int
-            начальная вершина ребра
-        start_vertex: str | int
-            начальная вершина ребра
+        edges: Iterable[Sequence] | np.ndarray
+            ребра в виде (начало, конец) или (начало, конец, вес), либо массив NumPy
+            формы (E, 2) или (E, 3)
+        chunk_size: int
+            сколько строк массива NumPy переводить в объекты Python за раз
 
         Возвращает None
 
@@ -364,28 +1012,176 @@ class Graph:
             graph = Graph({'A': ['B', 'C'],
                            'B': ['A', 'C'],
                            'C': ['A', 'B']})
-            graph.delete_edge('A', 'B') # None
+            graph.add_edges([['C', 'D', 3], ['D', 'A', 2]]) # None
+            graph.add_edges((i, i + 1) for i in range(1000)) # None
         """
 
-        if start_vertex in self._graph_dict and end_vertex in self._graph_dict:
-            self._graph_dict[start_vertex].remove(self.find_vertex_list(start_vertex, end_vertex))
-            self._graph_dict[end_vertex].remove(self.find_vertex_list(end_vertex, start_vertex))
-
+        if isinstance(edges, np.ndarray):
+            if edges.ndim != 2 or edges.shape[1] not in (2, 3):
+                raise Exception("Неверная форма массива ребер", edges.shape)
+            edges_array = edges
+            if edges_array.dtype.kind == 'f':
+                # в массиве с дробными весами концы ребер тоже дробные: номера вершин приводятся
+                # к целым отдельно от столбца весов, иначе вершинами станут 0.0, 1.0, ...
+                endpoints = edges_array[:, :2]
+                if not np.array_equal(endpoints, np.trunc(endpoints)):
+                    raise Exception("Номера вершин в массиве ребер должны быть целыми", edges_array.dtype)
+                edges = ((*ends, *weight) for start in range(0, len(edges_array), chunk_size)
+                         for ends, weight in zip(endpoints[start:start + chunk_size].astype(np.int64).tolist(),
+                                                 edges_array[start:start + chunk_size, 2:].tolist()))
+            else:
+                edges = (edge for start in range(0, len(edges_array), chunk_size)
+                         for edge in edges_array[start:start + chunk_size].tolist())
+
+        adjacency = self._graph_dict
+        shared = self._cow_shared
+        # актуальная система непересекающихся множеств обновляется по ходу загрузки
+        union_find_current = self._uf_version == self._version
+        # степени затронутых вершин до загрузки (None - новая вершина), гистограмма обновляется в конце
+        old_degrees: dict = {}
+        # новые ребра запоминаются только для подписчиков на события
+        added_edges: list | None = [] if self._listeners else None
 
-    def delete_edges(self, edges_remove: list[list[str | int, int]]) -> None:
+        for edge in edges:
+            if len(edge) == 2:
+                start_vertex, end_vertex = edge
+                weight = 1
+            else:
+                start_vertex, end_vertex, weight = edge
+
+            start_neighbors = adjacency.get(start_vertex)
+            if start_neighbors is None:
+                start_neighbors = adjacency[start_vertex] = {}
+                old_degrees[start_vertex] = None
+                if union_find_current:
+                    self._union_add(start_vertex)
+            end_neighbors = adjacency.get(end_vertex)
+            if end_neighbors is None:
+                end_neighbors = adjacency[end_vertex] = {}
+                old_degrees[end_vertex] = None
+                if union_find_current:
+                    self._union_add(end_vertex)
+
+            if shared and end_vertex not in start_neighbors:
+                start_neighbors, end_neighbors = self._own(start_vertex), self._own(end_vertex)
+
+            if end_vertex not in start_neighbors:
+                if start_vertex not in old_degrees:
+                    old_degrees[start_vertex] = len(start_neighbors)
+                start_neighbors[end_vertex] = weight
+                if start_vertex == end_vertex:
+                    self._loops_count += 1
+                if added_edges is not None:
+                    added_edges.append((start_vertex, end_vertex, weight))
+                if union_find_current:
+                    self._union(start_vertex, end_vertex)
+            if start_vertex not in end_neighbors:
+                if end_vertex not in old_degrees:
+                    old_degrees[end_vertex] = len(end_neighbors)
+                end_neighbors[start_vertex] = weight
+
+        for vertex, old_degree in old_degrees.items():
+            self._degree_change(old_degree, len(adjacency[vertex]))
+
+        if added_edges is None:
+            if old_degrees:
+                self._version += 1
+        else:
+            for vertex, old_degree in old_degrees.items():
+                if old_degree is None:
+                    self._mutated(GraphEventKind.VERTEX_ADDED, vertex)
+            for start_vertex, end_vertex, weight in added_edges:
+                self._mutated(GraphEventKind.EDGE_ADDED, start_vertex, end_vertex, weight)
+
+        if union_find_current:
+            self._uf_version = self._version
+
+
+    @classmethod
+    def from_edges(cls, edges: Iterable[Sequence] | np.ndarray, chunk_size: int = EDGES_CHUNK_SIZE) -> 'Graph':
         """
-        Метод удаления ребер
+        Метод создания графа из списка ребер
 
         Параметры
         ---------
-        edges: list[list[str | int, int]]
-            список удаляемых ребер
+        edges: Iterable[Sequence] | np.ndarray
+            ребра в виде (начало, конец) или (начало, конец, вес), генератор ребер
+            или массив NumPy формы (E, 2) или (E, 3)
+        chunk_size: int
+            сколько строк массива NumPy переводить в объекты Python за раз
 
-        Возвращает None
+        Возвращает Graph
 
         Пример использования:
 
-            graph = Graph({'A': ['B', 'C'],
+            print(Graph.from_edges([('A', 'B', 2), ('B', 'C', 1), ('A', 'B', 5)]))
+
+            # Граф с 3 вершинами и 4 ребрами
+
+            print(Graph.from_edges(np.array([[0, 1], [1, 2], [2, 0]])))
+
+            # Граф с 3 вершинами и 6 ребрами
+        """
+
+        graph = cls()
+        graph.add_edges(edges, chunk_size)
+
+        return graph
+
+
+    def delete_edge(self, start_vertex: str | int, end_vertex: str | int) -> None:
+        """
+        Метод удаления ребра
+
+        Параметры
+        ---------
+        start_vertex: str | int
+            начальная вершина ребра
+        start_vertex: str | int
+            начальная вершина ребра
+
+        Возвращает None
+        Если ребра (или какой-либо из вершин) нет, граф не изменяется
+
+        Пример использования:
+
+            graph = Graph({'A': ['B', 'C'],
+                           'B': ['A', 'C'],
+                           'C': ['A', 'B']})
+            graph.delete_edge('A', 'B') # None
+        """
+
+        # проверка до _own, чтобы не копировать общие со снимком словари соседей впустую
+        if not self.has_edge(start_vertex, end_vertex):
+            return
+
+        start_neighbors, end_neighbors = self._own(start_vertex), self._own(end_vertex)
+
+        weight = start_neighbors.pop(end_vertex)
+        self._degree_change(len(start_neighbors) + 1, len(start_neighbors))
+        if start_vertex == end_vertex:
+            self._loops_count -= 1
+        else:
+            del end_neighbors[start_vertex]
+            self._degree_change(len(end_neighbors) + 1, len(end_neighbors))
+
+        self._mutated(GraphEventKind.EDGE_REMOVED, start_vertex, end_vertex, weight)
+
+
+    def delete_edges(self, edges_remove: list[list[str | int, int]]) -> None:
+        """
+        Метод удаления ребер
+
+        Параметры
+        ---------
+        edges: list[list[str | int, int]]
+            список удаляемых ребер
+
+        Возвращает None
+
+        Пример использования:
+
+            graph = Graph({'A': ['B', 'C'],
                            'B': ['A', 'C'],
                            'C': ['A', 'B']})
             graph.delete_edges([['A', 'B'], ['B', 'C']]) # None
@@ -395,6 +1191,196 @@ class Graph:
             self.delete_edge(*edge)
 
 
+    def subscribe(self, listener: Callable[[GraphEvent], None]) -> None:
+        """
+        Метод подписки на события изменения графа
+
+        Подписчик вызывается синхронно после каждого изменения с GraphEvent.
+        Пока подписчиков нет, события не создаются
+
+        Параметры
+        ---------
+        listener: Callable[[GraphEvent], None]
+            обработчик событий
+
+        Возвращает None
+
+        Пример использования:
+
+            graph = Graph({'A': ['B'], 'B': ['A']})
+            graph.subscribe(print)
+            graph.add_edge('B', 'C', 2)
+
+            # GraphEvent(kind=<GraphEventKind.VERTEX_ADDED: 'vertex_added'>, version=1, start_vertex='C', ...)
+            # GraphEvent(kind=<GraphEventKind.EDGE_ADDED: 'edge_added'>, version=2, start_vertex='B', end_vertex='C', weight=2)
+        """
+
+        self._listeners.append(listener)
+
+
+    def unsubscribe(self, listener: Callable[[GraphEvent], None]) -> None:
+        """
+        Метод отписки от событий изменения графа
+
+        Параметры
+        ---------
+        listener: Callable[[GraphEvent], None]
+            ранее подписанный обработчик
+
+        Возвращает None
+        Вызывает исключение, в случае если обработчик не подписан
+        """
+
+        self._listeners.remove(listener)
+
+
+    def _mutated(self, kind: GraphEventKind, start_vertex: str | int | None = None,
+                 end_vertex: str | int | None = None, weight: int | None = None) -> None:
+        """
+        Отметка об изменении графа: увеличивает номер версии (по нему сбрасываются кэши)
+        и, если есть подписчики, рассылает им событие
+
+        Используется только в методах класса
+        """
+
+        self._version += 1
+
+        if self._listeners:
+            event = GraphEvent(kind, self._version, start_vertex, end_vertex, weight)
+            for listener in tuple(self._listeners):
+                listener(event)
+
+
+    def enable_cache(self, max_entries: int = QUERY_CACHE_ENTRIES, max_bytes: int | None = None) -> None:
+        """
+        Метод включения кэша результатов запросов
+
+        Кэшируются shortest_path, get_adjacency_matrix, get_edges и get_addition_graph.
+        Ключ кэша - (метод, аргументы, версия графа), поэтому любое изменение графа
+        (add_edge, delete_vertex и т.д.) делает старые результаты недействительными.
+        Эти методы и без кэша возвращают неизменяемые результаты (кортежи, массивы NumPy
+        только для чтения), поэтому из кэша выдается сохраненный объект без копирования
+
+        Параметры
+        ---------
+        max_entries: int
+            наибольшее число хранимых результатов
+        max_bytes: int | None
+            приблизительный бюджет памяти в байтах, по умолчанию без ограничения
+
+        Возвращает None
+
+        Пример использования:
+
+            graph = Graph({'A': ['B'], 'B': ['A']})
+            graph.enable_cache(max_entries=64)
+            graph.shortest_path('A', 'B')
+            graph.shortest_path('A', 'B')
+            print(graph.cache_stats())
+
+            # {'hits': 1, 'misses': 1, 'evictions': 0, 'entries': 1, 'bytes': 0}
+        """
+
+        self._query_cache = QueryCache(max_entries, max_bytes)
+
+
+    def disable_cache(self) -> None:
+        """
+        Метод выключения кэша результатов запросов, все записи удаляются
+
+        Возвращает None
+        """
+
+        self._query_cache = None
+
+
+    def cache_stats(self) -> dict[str, int] | None:
+        """
+        Метод получения статистики кэша результатов запросов
+
+        Возвращает словарь со счетчиками hits, misses, evictions, entries, bytes
+        или None, если кэш выключен
+        """
+
+        if self._query_cache is None:
+            return None
+
+        return self._query_cache.stats()
+
+
+    def freeze(self) -> 'FrozenGraph':
+        """
+        Метод получения неизменяемого снимка графа
+
+        Снимок не копирует ребра: словари соседей становятся общими для графа и снимка,
+        а граф копирует словарь соседей вершины только при первом его изменении
+        (копирование при записи). Поэтому снимок создается за O(V), а дальнейшие
+        изменения графа его не затрагивают. Снимок можно читать из любого числа
+        потоков (см. FrozenGraph)
+
+        Возвращает FrozenGraph
+
+        Пример использования:
+
+            graph = Graph({'A': ['B'], 'B': ['A']})
+            snapshot = graph.freeze()
+            graph.add_edge('B', 'C')
+            print(snapshot) # Граф с 2 вершинами и 2 ребрами
+            print(graph) # Граф с 3 вершинами и 4 ребрами
+        """
+
+        snapshot = self._shared_copy(FrozenGraph)
+        self._cow_shared = set(self._graph_dict)
+
+        return snapshot
+
+
+    def _shared_copy(self, cls: type) -> 'Graph':
+        """
+        Создание графа класса cls с общими словарями соседей за O(V)
+
+        Копируются только внешний словарь смежности, счетчики размера и, если она
+        актуальна, система непересекающихся множеств
+
+        Используется только в методах класса
+        """
+
+        graph = cls()
+        graph._graph_dict = dict(self._graph_dict)
+        graph._version = self._version
+
+        graph._degree_counts = self._degree_counts.copy()
+        graph._degree_sum = self._degree_sum
+        graph._loops_count = self._loops_count
+        graph._max_degree = self._max_degree
+
+        if self._uf_version == self._version:
+            graph._uf_parent, graph._uf_size = dict(self._uf_parent), dict(self._uf_size)
+            graph._components_count = self._components_count
+            graph._uf_version = self._version
+        else:
+            # система множеств пустого графа из cls() к новому словарю не относится
+            graph._uf_version = -1
+
+        return graph
+
+
+    def _own(self, vertex: str | int) -> dict:
+        """
+        Получение словаря соседей вершины для изменения: общий со снимком словарь
+        сначала копируется (см. freeze)
+
+        Используется только в методах класса
+        """
+
+        if vertex in self._cow_shared:
+            self._cow_shared.discard(vertex)
+            # копия через items, чтобы словари соседей CSRGraph не искали каждый ключ заново
+            self._graph_dict[vertex] = dict(self._graph_dict[vertex].items())
+
+        return self._graph_dict[vertex]
+
+
     # def show(self) -> None:
     #     """Показ графа визуально"""
     #     G = nx.Graph(self._graph_dict)
@@ -405,25 +1391,167 @@ class Graph:
     #     plt.show()
 
 
-    def is_subgraph(self, subgraph: GraphDict | GraphDictWeight) -> bool:
+    def is_subgraph(self, subgraph: 'Graph | GraphDict | GraphDictWeight', weights: bool = False) -> bool:
         """
         Метод проверки графа на подграф
 
+        Каждое ребро подграфа проверяется по словарю смежности данного графа за O(1),
+        поэтому проверка стоит O(V_sub + E_sub) и не зависит от размера данного графа
+
         Параметры
         ---------
-        subgraph: GraphDict | GraphDictWeight
+        subgraph: Graph | GraphDict | GraphDictWeight
             граф, который проверяем на подграф данному
+        weights: bool
+            по умолчанию False
+            True - веса ребер подграфа тоже должны совпадать
 
         Возвращает bool (True или False)
+
+        Пример использования:
+
+            graph = Graph({'A': [['B', 2], ['C', 1]],
+                           'B': [['A', 2], ['C', 1]],
+                           'C': [['A', 1], ['B', 1]]})
+            print(graph.is_subgraph({'A': ['B']})) # True
+            print(graph.is_subgraph({'A': [['B', 3]]}, weights=True)) # False
         """
 
-        for el in Graph(subgraph).get_edges(weights=False):
-            if el not in self.get_edges(weights=False):
+        if not isinstance(subgraph, Graph):
+            subgraph = Graph(subgraph)
+
+        adjacency = self._graph_dict
+
+        for vertex, neighbors in subgraph._graph_dict.items():
+            vertex_neighbors = adjacency.get(vertex)
+            if vertex_neighbors is None:
                 return False
+
+            for neighbor, weight in neighbors.items():
+                if neighbor not in vertex_neighbors:
+                    return False
+                if weights and vertex_neighbors[neighbor] != weight:
+                    return False
+
         return True
 
 
-    def dfs(self, start_node: str | int) -> list[str | int]:
+    def _traverse(self, start_node: str | int, breadth_first: bool, max_depth: int | None = None,
+                  stop: Callable[[str | int], bool] | None = None,
+                  on_discover: Callable[[str | int, int], None] | None = None,
+                  on_finish: Callable[[str | int], None] | None = None,
+                  on_edge: Callable[[str | int, str | int, int], None] | None = None) -> Iterator[str | int]:
+        """
+        Общее ядро обходов в глубину и в ширину
+
+        Читает словарь смежности напрямую, каждая вершина и каждое ребро
+        просматриваются один раз, поэтому обход стоит O(V + E).
+        При обходе в глубину с max_depth вершина, до которой позже нашелся более короткий
+        путь, просматривается заново с меньшей глубиной (повторно не выдается, но on_edge
+        и on_finish для нее вызываются снова), поэтому выдаются все вершины в пределах
+        max_depth ребер; такой обход стоит O((V + E) * max_depth)
+
+        Используется только в методах класса
+
+        Параметры
+        ---------
+        start_node: str | int
+            стартовая вершина
+        breadth_first: bool
+            True - обход в ширину (очередь deque), False - в глубину (стек итераторов)
+        max_depth: int | None
+            максимальная глубина (в ребрах от стартовой вершины), дальше которой обход не идет
+        stop: Callable[[вершина], bool] | None
+            предикат ранней остановки, обход завершается после вершины, для которой он вернул True
+        on_discover: Callable[[вершина, глубина], None] | None
+            вызывается при первом посещении вершины
+        on_finish: Callable[[вершина], None] | None
+            вызывается, когда все ребра вершины просмотрены
+        on_edge: Callable[[начало, конец, вес], None] | None
+            вызывается для каждого просмотренного ребра
+
+        Возвращает генератор с вершинами в порядке посещения
+        """
+
+        adjacency = self._graph_dict
+        # {вершина: наименьшая найденная глубина}
+        visited = {start_node: 0}
+
+        if on_discover is not None:
+            on_discover(start_node, 0)
+        yield start_node
+        if stop is not None and stop(start_node):
+            return
+
+        if breadth_first:
+            queue_nodes = deque([(start_node, 0)])
+
+            while queue_nodes:
+                current_node, depth = queue_nodes.popleft()
+
+                if max_depth is None or depth < max_depth:
+                    for neighbor_node, weight in adjacency[current_node].items():
+                        if on_edge is not None:
+                            on_edge(current_node, neighbor_node, weight)
+                        if neighbor_node in visited:
+                            continue
+
+                        visited[neighbor_node] = depth + 1
+                        if on_discover is not None:
+                            on_discover(neighbor_node, depth + 1)
+                        yield neighbor_node
+                        if stop is not None and stop(neighbor_node):
+                            return
+                        queue_nodes.append((neighbor_node, depth + 1))
+
+                if on_finish is not None:
+                    on_finish(current_node)
+
+            return
+
+        # В стеке лежат итераторы по соседям, поэтому вершина завершается
+        # только после того, как просмотрены все ее ребра
+        def neighbors_of(node, depth):
+            if max_depth is not None and depth >= max_depth:
+                return iter(())
+            return iter(adjacency[node].items())
+
+        stack = [(start_node, neighbors_of(start_node, 0), 0)]
+
+        while stack:
+            current_node, neighbors, depth = stack[-1]
+
+            for neighbor_node, weight in neighbors:
+                if on_edge is not None:
+                    on_edge(current_node, neighbor_node, weight)
+                if neighbor_node in visited:
+                    # более короткий путь до уже посещенной вершины: ее соседи могут оказаться
+                    # в пределах max_depth, поэтому вершина просматривается заново
+                    if max_depth is not None and depth + 1 < visited[neighbor_node]:
+                        visited[neighbor_node] = depth + 1
+                        stack.append((neighbor_node, neighbors_of(neighbor_node, depth + 1), depth + 1))
+                        break
+                    continue
+
+                visited[neighbor_node] = depth + 1
+                if on_discover is not None:
+                    on_discover(neighbor_node, depth + 1)
+                yield neighbor_node
+                if stop is not None and stop(neighbor_node):
+                    return
+                stack.append((neighbor_node, neighbors_of(neighbor_node, depth + 1), depth + 1))
+                break
+            else:
+                stack.pop()
+                if on_finish is not None:
+                    on_finish(current_node)
+
+
+    def dfs(self, start_node: str | int, max_depth: int | None = None,
+            stop: Callable[[str | int], bool] | None = None,
+            on_discover: Callable[[str | int, int], None] | None = None,
+            on_finish: Callable[[str | int], None] | None = None,
+            on_edge: Callable[[str | int, str | int, int], None] | None = None) -> Iterator[str | int]:
         """
         Метод прохода в глубину
 
@@ -431,6 +1559,12 @@ class Graph:
         ---------
         start_node: str | int
             стартовая вершина
+        max_depth: int | None
+            максимальная глубина обхода, по умолчанию без ограничения
+        stop: Callable[[вершина], bool] | None
+            предикат ранней остановки
+        on_discover, on_finish, on_edge: Callable | None
+            обработчики посещения вершины, завершения вершины и просмотра ребра (см. _traverse)
 
         Возвращает генератор с вершинами list[str | int], которые прошли
 
@@ -440,24 +1574,18 @@ class Graph:
                            'B': ['A', 'C'],
                            'C': ['A', 'B']})
             print(list(graph.dfs('A')))  # ['A', 'B', 'C']
+            print(list(graph.dfs('A', max_depth=1)))  # ['A', 'B', 'C']
+            print(list(graph.dfs('A', stop=lambda v: v == 'B')))  # ['A', 'B']
         """
 
-        visited_nodes = set()
-        stack = [start_node]
-
-        # Повторяем пока стек не будет пустым (не закончатся вершины)
-        while stack:
-            # Извлекаем текущую вершину из стека (берем последний элемент)
-            current_node = stack.pop()
-            # Проверяем на вхождение в посещенные вершины
-            if current_node not in visited_nodes:
-                visited_nodes.add(current_node)
-                yield current_node
-
-            stack.extend(set(self.get_graph_not_weight()[current_node]) - visited_nodes)
+        return self._traverse(start_node, False, max_depth, stop, on_discover, on_finish, on_edge)
 
 
-    def bfs(self, start_node: str | int) -> list[str | int]:
+    def bfs(self, start_node: str | int, max_depth: int | None = None,
+            stop: Callable[[str | int], bool] | None = None,
+            on_discover: Callable[[str | int, int], None] | None = None,
+            on_finish: Callable[[str | int], None] | None = None,
+            on_edge: Callable[[str | int, str | int, int], None] | None = None) -> Iterator[str | int]:
         """
         Метод прохода в ширину
 
@@ -465,6 +1593,12 @@ class Graph:
         ---------
         start_node: str | int
             стартовая вершина
+        max_depth: int | None
+            максимальная глубина обхода, по умолчанию без ограничения
+        stop: Callable[[вершина], bool] | None
+            предикат ранней остановки
+        on_discover, on_finish, on_edge: Callable | None
+            обработчики посещения вершины, завершения вершины и просмотра ребра (см. _traverse)
 
         Возвращает генератор с вершинами list[str | int], которые прошли
 
@@ -474,22 +1608,75 @@ class Graph:
                            'B': ['A', 'C'],
                            'C': ['A', 'B']})
             print(list(graph.bfs('A')))  # ['A', 'B', 'C']
+
+            depths = {}
+            list(graph.bfs('A', on_discover=depths.__setitem__))
+            print(depths)  # {'A': 0, 'B': 1, 'C': 1}
         """
 
-        visited_nodes = set()
-        queue_nodes = [start_node]
-        # Обходим граф, пока очередь не будет пустая
-        while queue_nodes:
-            current_node = queue_nodes.pop(0)
+        return self._traverse(start_node, True, max_depth, stop, on_discover, on_finish, on_edge)
+
+
+    def _simple_paths(self, start_node: str | int, finish_node: str | int,
+                      max_length: int | None = None, exact_length: bool = False,
+                      truncated: list[bool] | None = None) -> Iterator[list[str | int]]:
+        """
+        Перебор простых путей поиском в глубину с возвратом
+
+        В памяти хранится только текущий путь, множество его вершин и стек итераторов
+        по соседям, поэтому память пропорциональна длине пути, а не числу путей
+
+        Используется только в методах класса
 
-            if current_node not in visited_nodes:
-                visited_nodes.add(current_node)
+        Параметры
+        ---------
+        start_node: str | int
+            стартовая вершина
+        finish_node: str | int
+            конечная вершина
+        max_length: int | None
+            максимальная длина пути в ребрах
+        exact_length: bool
+            возвращать только пути длины ровно max_length
+        truncated: list[bool] | None
+            если передан, в truncated[0] записывается True, когда поиск был обрезан по max_length
+
+        Возвращает генератор с путями (каждый путь - новый список)
+        """
 
-                queue_nodes.extend(set(self.get_graph_not_weight()[current_node]) - visited_nodes)
-                yield current_node
+        adjacency = self._graph_dict
+        path = [start_node]
+        on_path = {start_node}
+        stack = [iter(adjacency[start_node])]
 
+        while stack:
+            for neighbor_node in stack[-1]:
+                if neighbor_node in on_path:
+                    continue
 
-    def dfs_paths(self, start_node: str | int, finish_node: str | int):
+                # длина пути в ребрах после добавления соседа
+                length = len(path)
+                if neighbor_node == finish_node:
+                    if not exact_length or length == max_length:
+                        yield path + [neighbor_node]
+                    continue
+
+                if max_length is not None and length >= max_length:
+                    if truncated is not None:
+                        truncated[0] = True
+                    continue
+
+                path.append(neighbor_node)
+                on_path.add(neighbor_node)
+                stack.append(iter(adjacency[neighbor_node]))
+                break
+            else:
+                stack.pop()
+                on_path.discard(path.pop())
+
+
+    def dfs_paths(self, start_node: str | int, finish_node: str | int,
+                  max_length: int | None = None, limit: int | None = None) -> Iterator[list[str | int]]:
         """
         Метод поиска путей в глубину
 
@@ -499,6 +1686,10 @@ class Graph:
             стартовая вершина
         finish_node: str | int
             конечная вершина
+        max_length: int | None
+            максимальная длина пути в ребрах, по умолчанию без ограничения
+        limit: int | None
+            максимальное количество путей, по умолчанию все пути
 
         Возвращает генератор с путями
 
@@ -509,30 +1700,31 @@ class Graph:
                    'C': ['A', 'B']})
             print(list(graph.dfs_paths('A', 'C')))
 
-            # [['A', 'C'], ['A', 'B', 'C']]
+            # [['A', 'B', 'C'], ['A', 'C']]
         """
-        stack: list = [(start_node, [start_node])]
-
-        while stack:
-            current_node, path = stack.pop()
 
-            for neighbor_node in set(self.get_graph_not_weight()[current_node]) - set(path):
-                if neighbor_node == finish_node:
-                    yield path + [neighbor_node]
-                else:
-                    stack.append((neighbor_node, path + [neighbor_node]))
+        return islice(self._simple_paths(start_node, finish_node, max_length), limit)
 
 
-    def bfs_paths(self, start_node: str | int, finish_node: str | int):
+    def bfs_paths(self, start_node: str | int, finish_node: str | int,
+                  max_length: int | None = None, limit: int | None = None) -> Iterator[list[str | int]]:
         """
         Метод поиска путей в ширину
 
+        Пути возвращаются в порядке неубывания длины. Вместо очереди частичных путей
+        используется поиск в глубину с постепенно увеличиваемой длиной, поэтому
+        память пропорциональна длине пути
+
         Параметры
         ---------
         start_node: str | int
             стартовая вершина
         finish_node: str | int
             конечная вершина
+        max_length: int | None
+            максимальная длина пути в ребрах, по умолчанию без ограничения
+        limit: int | None
+            максимальное количество путей, по умолчанию все пути
 
         Возвращает генератор с путями
 
@@ -545,21 +1737,24 @@ class Graph:
 
             # [['A', 'C'], ['A', 'B', 'C']]
         """
-        queue_nodes = [(start_node, [start_node])]
 
-        while queue_nodes:
+        def paths_by_length():
+            length = 1
+            while max_length is None or length <= max_length:
+                truncated = [False]
+                yield from self._simple_paths(start_node, finish_node, length, True, truncated)
+                # более длинных простых путей нет, если поиск ни разу не уперся в ограничение
+                if not truncated[0]:
+                    return
+                length += 1
 
-            current_node, path = queue_nodes.pop(0)
-            for neighbor_node in set(self.get_graph_not_weight()[current_node]) - set(path):
-                if neighbor_node == finish_node:
-                    yield path + [neighbor_node]
-                else:
-                    queue_nodes.append((neighbor_node, path + [neighbor_node]))
+        return islice(paths_by_length(), limit)
 
 
-    def shortest_path(self, start_node: str | int, finish_node: str | int) -> list[str| int]:
+    def k_shortest_paths(self, start_node: str | int, finish_node: str | int,
+                         k: int) -> list[tuple[list[str | int], int]]:
         """
-        Метод поиска кратчайшего пути
+        Метод поиска k кратчайших простых путей (алгоритм Йена)
 
         Параметры
         ---------
@@ -567,254 +1762,3401 @@ class Graph:
             стартовая вершина
         finish_node: str | int
             конечная вершина
+        k: int
+            количество путей
 
-        Возвращает список кратчайшего пути
+        Возвращает список не более чем из k кортежей (путь, длина пути) по возрастанию длины
 
         Пример использования:
 
-            graph = Graph({'A': ['B', 'C'],
-                   'B': ['A', 'C'],
-                   'C': ['A', 'B']})
-            print(list(graph.shortest_path('A', 'C')))
+            graph = Graph({'A': [['B', 1], ['C', 5]],
+                           'B': [['A', 1], ['C', 1]],
+                           'C': [['A', 5], ['B', 1]]})
+            print(graph.k_shortest_paths('A', 'C', 2))
 
-            # ['A', 'C']
+            # [(['A', 'B', 'C'], 2), (['A', 'C'], 5)]
         """
 
-        try:
-            return next(self.bfs_paths(start_node, finish_node))
-        except StopIteration:
-            return None
+        if k <= 0:
+            return []
 
+        distances, parents = self._dijkstra(start_node, finish_node)
+        if finish_node not in parents:
+            return []
 
-    def get_degree_vertex(self, vertex: str | int) -> int:
-        """
-        Метод получения степени вершины
+        found = [(self._build_path(parents, finish_node), distances[finish_node])]
+        candidates: list = []
+        seen = {tuple(found[0][0])}
+        counter = 0
 
-        Параметры
-        ---------
-        vertex: str | int
-            вершина, у которой нужно узнать степень
+        while len(found) < k:
+            previous_path = found[-1][0]
+            root_distance = 0
 
+            # ответвление от каждой вершины предыдущего пути
+            for spur_idx in range(len(previous_path) - 1):
+                spur_node = previous_path[spur_idx]
+                root_path = previous_path[:spur_idx + 1]
 
-        Возвращает int
+                # запрещаем ребра, по которым уже найденные пути с тем же началом уходят из spur_node
+                ignored_edges = {
+                    (path[spur_idx], path[spur_idx + 1]) for path, _ in found
+                    if len(path) > spur_idx + 1 and path[:spur_idx + 1] == root_path
+                }
+                ignored_nodes = set(root_path[:-1])
 
-        Пример использования:
+                spur_distances, spur_parents = self._dijkstra(spur_node, finish_node, ignored_nodes, ignored_edges)
+                if finish_node in spur_parents:
+                    path = root_path[:-1] + self._build_path(spur_parents, finish_node)
+                    if tuple(path) not in seen:
+                        seen.add(tuple(path))
+                        heappush(candidates, (root_distance + spur_distances[finish_node], counter, path))
+                        counter += 1
 
-            graph = Graph({'A': ['B', 'C'],
-                           'B': ['A', 'C'],
-                           'C': ['A', 'B']})
-            print(graph.get_degree_vertex('B')) # 2
-        """
-        return len(self._graph_dict[vertex])
+                root_distance += self._graph_dict[spur_node][previous_path[spur_idx + 1]]
 
+            if not candidates:
+                break
 
-    def is_isomorph(self, graph_isomorph: GraphDict | GraphDictWeight) -> bool:
-        """
-        Метод проверки графа на изоморфность
+            distance, _, path = heappop(candidates)
+            found.append((path, distance))
 
-        Параметры
-        ---------
-        graph_isomorph: GraphDict | GraphDictWeight
-            граф, который проверяем на изоморфность с данным
+        return found
 
-        Возвращает bool
 
-        Пример использования:
+    @staticmethod
+    def _build_path(parents: dict, finish_node: str | int) -> list[str | int]:
+        """
+        Метод восстановления пути по указателям на родителей
 
-            graph = Graph({
-                'A': ['B', 'C'],
-                'B': ['A', 'D', 'E'],
-                'C': ['A', 'F'],
-                'D': ['B'],
-                'E': ['B', 'F'],
-                'F': ['E', 'C'],
-            })
+        Используется только в методах класса
 
-            isomorph_graph = Graph({
-                'A': ['E', 'D', 'F'],
-                'B': ['F', 'C'],
-                'C': ['B', 'D', 'E'],
-                'D': ['A', 'C', 'E', 'F'],
-                'E': ['D', 'C', 'A'],
-                'F': ['A', 'D', 'B']
-            })
+        Параметры
+        ---------
+        parents: dict
+            словарь {вершина: родитель}, у стартовой вершины родитель None
+        finish_node: str | int
+            конечная вершина
 
-            print(graph.is_isomorph(isomorph_graph)) # True
+        Возвращает путь от стартовой вершины до finish_node
         """
 
-        graph_isomorph = Graph(graph_isomorph)
-
-        for i in self.get_vertices():
-            if set(self.get_vertices()) - set(self.get_graph_not_weight()[i]) - set(i) \
-                    != set(graph_isomorph.get_graph_not_weight()[i]):
-                return False
+        path = [finish_node]
+        while parents[path[-1]] is not None:
+            path.append(parents[path[-1]])
+        path.reverse()
 
-        return True
+        return path
 
 
-    def get_adjacency_vertices(self, vertex: str | int) -> list:
+    def _bfs_parents(self, start_node: str | int, finish_node: str | int | None = None) -> dict:
         """
-        Метод получения смежных вершин
+        Обход в ширину с указателями на родителей
+
+        Используется только в методах класса
 
         Параметры
         ---------
-        vertex: str | int
-            вершина, у которой нужно узнать смежные вершины
+        start_node: str | int
+            стартовая вершина
+        finish_node: str | int | None
+            вершина, после обнаружения которой обход останавливается
+
+        Возвращает словарь {вершина: родитель} в порядке обхода
+        """
+
+        adjacency = self._graph_dict
+        parents = {start_node: None}
+        queue_nodes = deque([start_node])
+
+        while queue_nodes:
+            current_node = queue_nodes.popleft()
+            if current_node == finish_node:
+                break
+
+            for neighbor_node in adjacency[current_node]:
+                if neighbor_node not in parents:
+                    parents[neighbor_node] = current_node
+                    queue_nodes.append(neighbor_node)
+
+        return parents
+
+
+    def _dijkstra(self, start_node: str | int, finish_node: str | int | None = None,
+                  ignored_nodes: set | None = None, ignored_edges: set | None = None) -> tuple[dict, dict]:
+        """
+        Алгоритм Дейкстры на двоичной куче с указателями на родителей
+
+        Используется только в методах класса
+
+        Параметры
+        ---------
+        start_node: str | int
+            стартовая вершина
+        finish_node: str | int | None
+            вершина, после фиксации расстояния до которой поиск останавливается
+        ignored_nodes: set | None
+            вершины, через которые нельзя проходить
+        ignored_edges: set | None
+            ребра (начало, конец), по которым нельзя проходить
+
+        Возвращает (расстояния, родители) - словари по вершинам
+        Вызывает исключение, если встретилось ребро с отрицательным весом
+        """
+
+        adjacency = self._graph_dict
+        distances = {start_node: 0}
+        parents = {start_node: None}
+
+        # счетчик в куче нужен, чтобы не сравнивать сами вершины (они могут быть разных типов)
+        heap = [(0, 0, start_node)]
+        counter = 1
+
+        while heap:
+            distance, _, current_node = heappop(heap)
+            # устаревшая запись в куче - вершина уже зафиксирована с меньшим расстоянием
+            if distance > distances[current_node]:
+                continue
+            if current_node == finish_node:
+                break
+
+            for neighbor_node, weight in adjacency[current_node].items():
+                if weight < 0:
+                    raise Exception("Отрицательный вес ребра", "Алгоритм Дейкстры работает только с неотрицательными весами")
+                if ignored_nodes and neighbor_node in ignored_nodes:
+                    continue
+                if ignored_edges and (current_node, neighbor_node) in ignored_edges:
+                    continue
+
+                new_distance = distance + weight
+                if neighbor_node not in distances or new_distance < distances[neighbor_node]:
+                    distances[neighbor_node] = new_distance
+                    parents[neighbor_node] = current_node
+                    heappush(heap, (new_distance, counter, neighbor_node))
+                    counter += 1
+
+        return distances, parents
+
+
+    @_cached_query
+    def shortest_path(self, start_node: str | int, finish_node: str | int,
+                      weighted: bool = False) -> tuple[str | int, ...] | tuple[tuple[str | int, ...], int] | None:
+        """
+        Метод поиска кратчайшего пути
+
+        Параметры
+        ---------
+        start_node: str | int
+            стартовая вершина
+        finish_node: str | int
+            конечная вершина
+        weighted: bool
+            по умолчанию False - путь с наименьшим числом ребер (обход в ширину)
+            True - путь с наименьшей суммой весов (алгоритм Дейкстры)
+
+        Возвращает кортеж вершин кратчайшего пути, при weighted=True - кортеж (путь, длина пути)
+        Если пути нет - None
+
+        Пример использования:
+
+            graph = Graph({'A': [['B', 1], ['C', 5]],
+                           'B': [['A', 1], ['C', 1]],
+                           'C': [['A', 5], ['B', 1]]})
+            print(graph.shortest_path('A', 'C'))  # ('A', 'C')
+            print(graph.shortest_path('A', 'C', weighted=True))  # (('A', 'B', 'C'), 2)
+        """
+
+        # вершины из разных компонент связности отсекаются без обхода, но только по актуальной
+        # системе множеств: перестраивать ее ради одного запроса дороже самого обхода
+        if (self._uf_version == self._version and start_node in self._graph_dict
+                and finish_node in self._graph_dict
+                and self._find_root(start_node) != self._find_root(finish_node)):
+            return None
+
+        if weighted:
+            distances, parents = self._dijkstra(start_node, finish_node)
+            if finish_node not in parents:
+                return None
+            return tuple(self._build_path(parents, finish_node)), distances[finish_node]
+
+        parents = self._bfs_parents(start_node, finish_node)
+        if finish_node not in parents:
+            return None
+
+        return tuple(self._build_path(parents, finish_node))
+
+
+    def shortest_path_lengths(self, start_node: str | int, weighted: bool = True) -> tuple[dict, dict]:
+        """
+        Метод поиска кратчайших расстояний от вершины до всех достижимых вершин
+
+        Параметры
+        ---------
+        start_node: str | int
+            стартовая вершина
+        weighted: bool
+            по умолчанию True - расстояние как сумма весов (алгоритм Дейкстры)
+            False - расстояние как число ребер (обход в ширину)
+
+        Возвращает кортеж (расстояния, родители):
+            расстояния - словарь {вершина: длина кратчайшего пути}
+            родители - словарь {вершина: предыдущая вершина на кратчайшем пути}
+
+        Пример использования:
+
+            graph = Graph({'A': [['B', 1], ['C', 5]],
+                           'B': [['A', 1], ['C', 1]],
+                           'C': [['A', 5], ['B', 1]]})
+            distances, parents = graph.shortest_path_lengths('A')
+            print(distances)  # {'A': 0, 'B': 1, 'C': 2}
+            print(parents)  # {'A': None, 'B': 'A', 'C': 'B'}
+        """
+
+        if weighted:
+            return self._dijkstra(start_node)
+
+        parents = self._bfs_parents(start_node)
+
+        # родители добавляются в порядке обхода в ширину, поэтому расстояние родителя уже известно
+        distances = {}
+        for node, parent in parents.items():
+            distances[node] = 0 if parent is None else distances[parent] + 1
+
+        return distances, parents
+
+
+    def _csr_view(self) -> tuple[np.ndarray, np.ndarray, np.ndarray, list, dict]:
+        """
+        Массивы CSR графа для векторных алгоритмов, кэшируются до следующего изменения графа
+
+        Используется только в методах класса
+
+        Возвращает (indptr, indices, weights, вершины, {вершина: номер})
+        """
+
+        if self._csr_cache is not None and self._csr_cache[0] == self._version:
+            return self._csr_cache[1]
+
+        indptr, indices, weights, vertices = self.get_adjacency_sparse()
+        result = (indptr, indices, weights, vertices, {vertex: idx for idx, vertex in enumerate(vertices)})
+        self._csr_cache = (self._version, result)
+
+        return result
+
+
+    def bfs_levels(self, start_node: str | int, max_depth: int | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Метод поуровневого обхода в ширину векторными операциями NumPy
+
+        Обрабатывает весь фронт обхода за раз (см. _csr_bfs_levels), поэтому на больших
+        графах работает в разы быстрее bfs, но возвращает не вершины по одной, а массивы.
+        Позиция в массивах - номер вершины в порядке get_vertices
+
+        Параметры
+        ---------
+        start_node: str | int
+            стартовая вершина
+        max_depth: int | None
+            максимальная глубина обхода, по умолчанию без ограничения
+
+        Возвращает (расстояния, родители) - массивы int64:
+            расстояния - число ребер от стартовой вершины, -1 для недостижимых
+            родители - номер предыдущей вершины на кратчайшем пути, -1 для стартовой и недостижимых
+        Вызывает исключение, в случае если вершина не найдена
+
+        Пример использования:
+
+            graph = Graph({'A': ['B', 'C'],
+                           'B': ['A', 'D'],
+                           'C': ['A'],
+                           'D': ['B']})
+            distances, parents = graph.bfs_levels('A')
+            print(distances)  # [0 1 1 2]
+            print(parents)  # [-1  0  0  1]
+        """
+
+        if start_node not in self._graph_dict:
+            raise Exception("Вершина ис нот найти", "Нету такой вершины")
+
+        indptr, indices, _, _, index = self._csr_view()
+
+        return _csr_bfs_levels(indptr, indices, index[start_node], max_depth)
+
+
+    def hop_distances(self, start_node: str | int, max_depth: int | None = None) -> np.ndarray:
+        """
+        Метод получения расстояний в ребрах от вершины до всех вершин (см. bfs_levels)
+
+        Параметры
+        ---------
+        start_node: str | int
+            стартовая вершина
+        max_depth: int | None
+            максимальная глубина обхода, по умолчанию без ограничения
+
+        Возвращает массив int64 в порядке get_vertices, -1 для недостижимых вершин
+
+        Пример использования:
+
+            graph = Graph({'A': ['B'], 'B': ['A'], 'C': []})
+            print(graph.hop_distances('A'))  # [ 0  1 -1]
+        """
+
+        return self.bfs_levels(start_node, max_depth)[0]
+
+
+    def run_many(self, sources: Iterable[str | int], algorithm: str | Callable = 'bfs',
+                 processes: int | None = None, chunksize: int = 1) -> Iterator[tuple[str | int, object]]:
+        """
+        Метод запуска алгоритма из многих источников на нескольких ядрах
+
+        Массивы CSR графа один раз копируются в общую память (multiprocessing.shared_memory),
+        рабочие процессы подключаются к ним без копирования, а источники раздаются
+        пулу процессов. Результаты возвращаются по мере готовности, а не в порядке sources
+
+        Параметры
+        ---------
+        sources: Iterable[str | int]
+            вершины-источники
+        algorithm: str | Callable
+            'bfs' (по умолчанию) - расстояния в ребрах, массив int64, -1 для недостижимых
+            'dijkstra' - взвешенные расстояния, массив float64, inf для недостижимых
+            либо функция уровня модуля (indptr, indices, weights, номер источника) -> результат
+        processes: int | None
+            количество рабочих процессов, по умолчанию - число ядер
+        chunksize: int
+            сколько источников отдавать процессу за раз
+
+        Возвращает генератор пар (источник, результат); позиция в массивах - номер вершины
+        в порядке get_vertices
+        Вызывает исключение, в случае если вершина не найдена, алгоритм неизвестен
+        или для 'dijkstra' есть ребро с отрицательным весом
+
+        Пример использования:
+
+            graph = Graph({'A': ['B'], 'B': ['A', 'C'], 'C': ['B']})
+            eccentricities = {source: int(distances.max()) for source, distances in graph.run_many(['A', 'B', 'C'])}
+            print(eccentricities) # {'A': 2, 'B': 1, 'C': 2}
+        """
+
+        if not callable(algorithm) and algorithm not in RUN_MANY_ALGORITHMS:
+            raise Exception("Неизвестный алгоритм", algorithm)
+
+        indptr, indices, weights, _, index = self._csr_view()
+
+        tasks = []
+        for vertex in sources:
+            if vertex not in index:
+                raise Exception("Вершина ис нот найти", "Нету такой вершины")
+            tasks.append((vertex, index[vertex]))
+
+        if algorithm == 'dijkstra' and len(weights) and weights.min() < 0:
+            raise Exception("Отрицательный вес ребра", "Алгоритм Дейкстры работает только с неотрицательными весами")
+
+        return self._run_shared(tasks, algorithm, (indptr, indices, weights), processes, chunksize)
+
+
+    def shortest_paths_many(self, pairs: Iterable[Sequence], weighted: bool = False, processes: int | None = None,
+                            ordered: bool = True) -> list | Iterator[tuple[tuple, object]]:
+        """
+        Метод поиска кратчайших путей для многих пар вершин
+
+        Пары группируются по стартовой вершине, и для каждой стартовой вершины выполняется
+        один поиск (обход в ширину или алгоритм Дейкстры), который останавливается, как только
+        достигнуты все ее конечные вершины. Поиски раздаются пулу процессов над массивами CSR
+        в общей памяти (см. run_many). Пары из разных компонент связности отсекаются без поиска
+
+        Параметры
+        ---------
+        pairs: Iterable[Sequence]
+            пары (стартовая вершина, конечная вершина)
+        weighted: bool
+            по умолчанию False - пути с наименьшим числом ребер, True - с наименьшей суммой весов
+        processes: int | None
+            количество рабочих процессов, по умолчанию - число ядер
+        ordered: bool
+            по умолчанию True - список результатов в порядке pairs,
+            False - генератор пар ((старт, конец), результат) в порядке готовности
+
+        Результат для пары - как у shortest_path: путь, при weighted=True кортеж (путь, длина),
+        None, если пути нет
+        Вызывает исключение, в случае если вершина не найдена или для weighted=True
+        есть ребро с отрицательным весом
+
+        Пример использования:
+
+            graph = Graph({'A': [['B', 1], ['C', 5]],
+                           'B': [['A', 1], ['C', 1]],
+                           'C': [['A', 5], ['B', 1]]})
+            print(graph.shortest_paths_many([('A', 'C'), ('A', 'B')], weighted=True))
+
+            # [(('A', 'B', 'C'), 2), (('A', 'B'), 1)]
+        """
+
+        indptr, indices, weights, vertices, index = self._csr_view()
+        pairs = [tuple(pair) for pair in pairs]
+
+        # {старт: {номер конечной вершины: номера пар}}
+        requests: dict = {}
+        unreachable = []
+        for position, (start_node, finish_node) in enumerate(pairs):
+            if start_node not in index or finish_node not in index:
+                raise Exception("Вершина ис нот найти", "Нету такой вершины")
+            if not self.connected(start_node, finish_node):
+                unreachable.append(position)
+                continue
+            requests.setdefault(start_node, {}).setdefault(index[finish_node], []).append(position)
+
+        if weighted and len(weights) and weights.min() < 0:
+            raise Exception("Отрицательный вес ребра", "Алгоритм Дейкстры работает только с неотрицательными весами")
+
+        tasks = [(start_node, index[start_node], list(targets), weighted) for start_node, targets in requests.items()]
+
+        # генератор (номер пары, результат) в порядке готовности
+        def completed():
+            for position in unreachable:
+                yield position, None
+
+            if not tasks:
+                return
+
+            for start_node, found in self._run_shared(tasks, _csr_paths_to_targets,
+                                                      (indptr, indices, weights), processes, 1):
+                for target, result in found.items():
+                    if result is not None:
+                        path = tuple(vertices[idx] for idx in result[0])
+                        result = (path, result[1]) if weighted else path
+                    for position in requests[start_node][target]:
+                        yield position, result
+
+        if not ordered:
+            return ((pairs[position], result) for position, result in completed())
+
+        results = [None] * len(pairs)
+        for position, result in completed():
+            results[position] = result
+
+        return results
+
+
+    @staticmethod
+    def _run_shared(tasks: list, algorithm: str | Callable, arrays: tuple,
+                    processes: int | None, chunksize: int) -> Iterator:
+        """
+        Раздача задач пулу процессов над массивами в общей памяти; блок общей памяти
+        и пул освобождаются, когда генератор исчерпан или закрыт
+
+        Используется только в методах класса
+        """
+
+        shared, layout = _share_csr(arrays)
+        try:
+            with multiprocessing.Pool(processes, _attach_shared_csr, (shared.name, layout, algorithm)) as pool:
+                yield from pool.imap_unordered(_run_shared_csr, tasks, chunksize)
+        finally:
+            shared.close()
+            shared.unlink()
+
+
+    def bidirectional_shortest_path(self, start_node: str | int, finish_node: str | int,
+                                    weighted: bool = False) -> tuple[list[str | int] | None, int | None, int]:
+        """
+        Метод поиска кратчайшего пути двунаправленным поиском
+
+        Поиск идет одновременно от начальной и от конечной вершины и останавливается,
+        когда фронты встречаются, поэтому для одной пары вершин просматривается
+        намного меньше вершин, чем при поиске от одной стартовой вершины
+
+        Параметры
+        ---------
+        start_node: str | int
+            стартовая вершина
+        finish_node: str | int
+            конечная вершина
+        weighted: bool
+            по умолчанию False - по числу ребер (двунаправленный обход в ширину)
+            True - по сумме весов (двунаправленный алгоритм Дейкстры)
+
+        Возвращает кортеж (путь, длина пути, число раскрытых вершин)
+        Если пути нет - (None, None, число раскрытых вершин)
+
+        Пример использования:
+
+            graph = Graph({'A': [['B', 1], ['C', 5]],
+                           'B': [['A', 1], ['C', 1]],
+                           'C': [['A', 5], ['B', 1]]})
+            print(graph.bidirectional_shortest_path('A', 'C'))  # (['A', 'C'], 1, 1)
+            print(graph.bidirectional_shortest_path('A', 'C', weighted=True))  # (['A', 'B', 'C'], 2, 2)
+        """
+
+        if start_node == finish_node:
+            return [start_node], 0, 0
+
+        if weighted:
+            meeting_node, distance, parents, expanded = self._bidirectional_dijkstra(start_node, finish_node)
+        else:
+            meeting_node, distance, parents, expanded = self._bidirectional_bfs(start_node, finish_node)
+
+        if meeting_node is None:
+            return None, None, expanded
+
+        forward_parents, backward_parents = parents
+        path = self._build_path(forward_parents, meeting_node)
+        node = backward_parents[meeting_node]
+        while node is not None:
+            path.append(node)
+            node = backward_parents[node]
+
+        return path, distance, expanded
+
+
+    def _bidirectional_bfs(self, start_node: str | int, finish_node: str | int) -> tuple:
+        """
+        Двунаправленный обход в ширину
+
+        На каждом шаге целиком раскрывается уровень меньшего из двух фронтов,
+        среди всех встреч на этом уровне выбирается кратчайшая
+
+        Используется только в методах класса
+
+        Возвращает (вершина встречи, длина пути, (родители вперед, родители назад), число раскрытых вершин)
+        """
+
+        adjacency = self._graph_dict
+        parents = ({start_node: None}, {finish_node: None})
+        depths = ({start_node: 0}, {finish_node: 0})
+        frontiers = ([start_node], [finish_node])
+        expanded = 0
+
+        while frontiers[0] and frontiers[1]:
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            side_parents, side_depths = parents[side], depths[side]
+            other_depths = depths[1 - side]
+
+            best_node, best_distance = None, None
+            next_frontier = []
+
+            for current_node in frontiers[side]:
+                expanded += 1
+                for neighbor_node in adjacency[current_node]:
+                    if neighbor_node not in side_depths:
+                        side_depths[neighbor_node] = side_depths[current_node] + 1
+                        side_parents[neighbor_node] = current_node
+                        next_frontier.append(neighbor_node)
+
+                    if neighbor_node in other_depths:
+                        distance = side_depths[neighbor_node] + other_depths[neighbor_node]
+                        if best_distance is None or distance < best_distance:
+                            best_node, best_distance = neighbor_node, distance
+
+            frontiers = (next_frontier, frontiers[1]) if side == 0 else (frontiers[0], next_frontier)
+
+            if best_node is not None:
+                return best_node, best_distance, parents, expanded
+
+        return None, None, parents, expanded
+
+
+    def _bidirectional_dijkstra(self, start_node: str | int, finish_node: str | int) -> tuple:
+        """
+        Двунаправленный алгоритм Дейкстры
+
+        Поиск останавливается, когда сумма минимумов двух куч не меньше лучшего
+        найденного пути
+
+        Используется только в методах класса
+
+        Возвращает (вершина встречи, длина пути, (родители вперед, родители назад), число раскрытых вершин)
+        """
+
+        adjacency = self._graph_dict
+        parents = ({start_node: None}, {finish_node: None})
+        distances = ({start_node: 0}, {finish_node: 0})
+        heaps = ([(0, 0, start_node)], [(0, 0, finish_node)])
+        counter = 1
+        expanded = 0
+        best_node, best_distance = None, None
+
+        while heaps[0] and heaps[1]:
+            if best_distance is not None and heaps[0][0][0] + heaps[1][0][0] >= best_distance:
+                break
+
+            side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+            side_distances, other_distances = distances[side], distances[1 - side]
+
+            distance, _, current_node = heappop(heaps[side])
+            if distance > side_distances[current_node]:
+                continue
+            expanded += 1
+
+            for neighbor_node, weight in adjacency[current_node].items():
+                if weight < 0:
+                    raise Exception("Отрицательный вес ребра", "Алгоритм Дейкстры работает только с неотрицательными весами")
+
+                new_distance = distance + weight
+                if neighbor_node not in side_distances or new_distance < side_distances[neighbor_node]:
+                    side_distances[neighbor_node] = new_distance
+                    parents[side][neighbor_node] = current_node
+                    heappush(heaps[side], (new_distance, counter, neighbor_node))
+                    counter += 1
+
+                if neighbor_node in other_distances:
+                    total = side_distances[neighbor_node] + other_distances[neighbor_node]
+                    if best_distance is None or total < best_distance:
+                        best_node, best_distance = neighbor_node, total
+
+        return best_node, best_distance, parents, expanded
+
+
+    def astar_path(self, start_node: str | int, finish_node: str | int,
+                   heuristic: Callable[[str | int, str | int], float]) -> tuple[list[str | int] | None, int | None, int]:
+        """
+        Метод поиска кратчайшего взвешенного пути алгоритмом A*
+
+        Параметры
+        ---------
+        start_node: str | int
+            стартовая вершина
+        finish_node: str | int
+            конечная вершина
+        heuristic: Callable[[вершина, конечная вершина], float]
+            допустимая эвристика - оценка снизу длины пути от вершины до конечной,
+            например, расстояние по координатам вершин
+
+        Возвращает кортеж (путь, длина пути, число раскрытых вершин)
+        Если пути нет - (None, None, число раскрытых вершин)
+
+        Пример использования:
+
+            coordinates = {'A': (0, 0), 'B': (1, 0), 'C': (2, 0)}
+
+            def distance(v, finish):
+                (x1, y1), (x2, y2) = coordinates[v], coordinates[finish]
+                return ((x1 - x2) ** 2 + (y1 - y2) ** 2) ** 0.5
+
+            graph = Graph({'A': [['B', 1], ['C', 5]],
+                           'B': [['A', 1], ['C', 1]],
+                           'C': [['A', 5], ['B', 1]]})
+            print(graph.astar_path('A', 'C', distance))  # (['A', 'B', 'C'], 2, 2)
+        """
+
+        adjacency = self._graph_dict
+        distances = {start_node: 0}
+        parents = {start_node: None}
+        heap = [(heuristic(start_node, finish_node), 0, start_node)]
+        counter = 1
+        expanded = 0
+
+        while heap:
+            estimate, _, current_node = heappop(heap)
+            distance = distances[current_node]
+            # устаревшая запись: вершина уже найдена с меньшей оценкой
+            if estimate > distance + heuristic(current_node, finish_node):
+                continue
+            if current_node == finish_node:
+                return self._build_path(parents, finish_node), distance, expanded
+            expanded += 1
+
+            for neighbor_node, weight in adjacency[current_node].items():
+                if weight < 0:
+                    raise Exception("Отрицательный вес ребра", "Алгоритм A* работает только с неотрицательными весами")
+
+                new_distance = distance + weight
+                if neighbor_node not in distances or new_distance < distances[neighbor_node]:
+                    distances[neighbor_node] = new_distance
+                    parents[neighbor_node] = current_node
+                    heappush(heap, (new_distance + heuristic(neighbor_node, finish_node), counter, neighbor_node))
+                    counter += 1
+
+        return None, None, expanded
+
+
+    def all_pairs_distances(self, method: str = 'auto') -> tuple[np.ndarray, dict]:
+        """
+        Метод получения таблицы кратчайших расстояний между всеми парами вершин
+
+        Результат кэшируется и пересчитывается только после изменения графа
+
+        Параметры
+        ---------
+        method: str
+            'floyd_warshall' - векторизованный алгоритм Флойда-Уоршелла по плотной матрице весов,
+                               на каждой опорной вершине одна операция над строкой и столбцом
+            'dijkstra' - алгоритм Дейкстры из каждой вершины, выгоднее на разреженных графах
+            'auto' (по умолчанию) - 'dijkstra', если доля ребер от V² меньше SPARSE_DENSITY,
+                                    иначе 'floyd_warshall'
+
+        Возвращает кортеж (матрица, индексы):
+            матрица - np.ndarray V×V (float, только для чтения), np.inf для недостижимых пар
+            индексы - словарь {вершина: номер строки и столбца}
+
+        Пример использования:
+
+            graph = Graph({'A': [['B', 1], ['C', 5]],
+                           'B': [['A', 1], ['C', 1]],
+                           'C': [['A', 5], ['B', 1]]})
+            distances, index = graph.all_pairs_distances()
+            print(distances[index['A'], index['C']])  # 2.0
+        """
+
+        if method not in ('auto', 'floyd_warshall', 'dijkstra'):
+            raise Exception("Неизвестный метод", method)
+
+        if self._all_pairs_cache is not None:
+            version, cached_method, result = self._all_pairs_cache
+            if version == self._version and (method == 'auto' or method == cached_method):
+                return result
+
+        rows, indices, weights, vertices = self.get_adjacency_sparse('coo')
+        index = {vertex: idx for idx, vertex in enumerate(vertices)}
+        vertices_count = len(vertices)
+
+        if method == 'auto':
+            is_sparse = vertices_count and len(indices) < SPARSE_DENSITY * vertices_count ** 2
+            method = 'dijkstra' if is_sparse else 'floyd_warshall'
+
+        distances = np.full((vertices_count, vertices_count), np.inf)
+
+        if method == 'floyd_warshall':
+            distances[rows, indices] = weights
+            np.fill_diagonal(distances, np.minimum(distances.diagonal(), 0))
+
+            # релаксация через опорную вершину k сразу для всех пар: столбец k + строка k
+            for k in range(vertices_count):
+                np.minimum(distances, distances[:, k, None] + distances[None, k, :], out=distances)
+        else:
+            for vertex in vertices:
+                row_distances, _ = self._dijkstra(vertex)
+                row = distances[index[vertex]]
+                for node, distance in row_distances.items():
+                    row[index[node]] = distance
+
+        distances.flags.writeable = False
+        result = (distances, index)
+        self._all_pairs_cache = (self._version, method, result)
+
+        return result
+
+
+    def _union_find_update(self, start_vertex: str | int, end_vertex: str | int | None = None) -> None:
+        """
+        Обновление системы непересекающихся множеств после добавления вершины или ребра
+
+        Вызывается сразу после изменения, увеличившего номер версии на 1. Если система
+        была актуальна до изменения, она обновляется за почти O(1), иначе остается
+        устаревшей и будет перестроена при следующем запросе (см. _union_find)
+
+        Используется только в методах класса
+
+        Параметры
+        ---------
+        start_vertex: str | int
+            добавленная вершина или начало добавленного ребра
+        end_vertex: str | int | None
+            конец добавленного ребра, None - если добавлена вершина
+        """
+
+        if self._uf_version != self._version - 1:
+            return
+        self._uf_version = self._version
+
+        if end_vertex is None:
+            self._union_add(start_vertex)
+        else:
+            self._union(start_vertex, end_vertex)
+
+
+    def _union_add(self, vertex: str | int) -> None:
+        """
+        Добавление новой вершины отдельным множеством
+
+        Используется только в методах класса
+        """
+
+        self._uf_parent[vertex] = vertex
+        self._uf_size[vertex] = 1
+        self._components_count += 1
+
+
+    def _union(self, start_vertex: str | int, end_vertex: str | int) -> None:
+        """
+        Объединение множеств концов ребра
+
+        Используется только в методах класса
+        """
+
+        start_root, end_root = self._find_root(start_vertex), self._find_root(end_vertex)
+        if start_root == end_root:
+            return
+
+        # объединение по размеру: меньшее дерево подвешивается к большему
+        if self._uf_size[start_root] < self._uf_size[end_root]:
+            start_root, end_root = end_root, start_root
+        self._uf_parent[end_root] = start_root
+        self._uf_size[start_root] += self._uf_size.pop(end_root)
+        self._components_count -= 1
+
+
+    def _find_root(self, vertex: str | int) -> str | int:
+        """
+        Поиск представителя множества вершины со сжатием пути (делением пополам)
+
+        Используется только в методах класса
+        """
+
+        parent = self._uf_parent
+        while parent[vertex] != vertex:
+            parent[vertex] = parent[parent[vertex]]
+            vertex = parent[vertex]
+
+        return vertex
+
+
+    def _union_find(self) -> None:
+        """
+        Перестройка системы непересекающихся множеств, если она устарела
+
+        После удалений вершин и ребер (и массовых загрузок) компоненты пересчитываются
+        одним обходом за O(V + E) при первом запросе
+
+        Используется только в методах класса
+        """
+
+        if self._uf_version == self._version:
+            return
+
+        adjacency = self._graph_dict
+        parent: dict = {}
+        size: dict = {}
+
+        for root in adjacency:
+            if root in parent:
+                continue
+
+            parent[root] = root
+            stack = [root]
+            while stack:
+                current_node = stack.pop()
+                for neighbor_node in adjacency[current_node]:
+                    if neighbor_node not in parent:
+                        parent[neighbor_node] = root
+                        stack.append(neighbor_node)
+            size[root] = 0
+
+        for vertex in parent:
+            size[parent[vertex]] += 1
+
+        self._uf_parent, self._uf_size = parent, size
+        self._components_count = len(size)
+        self._uf_version = self._version
+
+
+    def connected(self, start_vertex: str | int, end_vertex: str | int) -> bool:
+        """
+        Метод проверки, лежат ли две вершины в одной компоненте связности
+
+        Параметры
+        ---------
+        start_vertex: str | int
+            первая вершина
+        end_vertex: str | int
+            вторая вершина
+
+        Возвращает bool (False, если какой-либо вершины нет в графе)
+
+        Пример использования:
+
+            graph = Graph({'A': ['B'], 'B': ['A'], 'C': []})
+            print(graph.connected('A', 'B'), graph.connected('A', 'C')) # True False
+        """
+
+        if start_vertex not in self._graph_dict or end_vertex not in self._graph_dict:
+            return False
+
+        self._union_find()
+
+        return self._find_root(start_vertex) == self._find_root(end_vertex)
+
+
+    def component_of(self, vertex: str | int) -> str | int:
+        """
+        Метод получения представителя компоненты связности вершины
+
+        У вершин одной компоненты представитель общий. Представитель может
+        смениться после изменения графа
+
+        Параметры
+        ---------
+        vertex: str | int
+            вершина
+
+        Возвращает вершину-представителя
+        Вызывает исключение, в случае если вершина не найдена
+
+        Пример использования:
+
+            graph = Graph({'A': ['B'], 'B': ['A'], 'C': []})
+            print(graph.component_of('B')) # A
+        """
+
+        if vertex not in self._graph_dict:
+            raise Exception("Вершина ис нот найти", "Нету такой вершины")
+
+        self._union_find()
+
+        return self._find_root(vertex)
+
+
+    def component_count(self) -> int:
+        """
+        Метод получения количества компонент связности
+
+        Возвращает int
+
+        Пример использования:
+
+            graph = Graph({'A': ['B'], 'B': ['A'], 'C': []})
+            print(graph.component_count()) # 2
+        """
+
+        self._union_find()
+
+        return self._components_count
+
+
+    def _recount(self) -> None:
+        """
+        Пересчет счетчиков размера и гистограммы степеней по всему графу за O(V)
+
+        Вызывается после замены всего словаря смежности (создание, загрузка),
+        поэтому новые словари соседей ни с одним снимком не разделяются
+
+        Используется только в методах класса
+        """
+
+        adjacency = self._graph_dict
+        self._cow_shared = set()
+
+        self._degree_counts = Counter(len(neighbors) for neighbors in adjacency.values())
+        self._degree_sum = sum(degree * count for degree, count in self._degree_counts.items())
+        self._loops_count = sum(1 for vertex, neighbors in adjacency.items() if vertex in neighbors)
+        self._max_degree = max(self._degree_counts, default=0)
+
+
+    def _degree_change(self, old_degree: int | None, new_degree: int | None) -> None:
+        """
+        Обновление гистограммы степеней, суммы степеней и максимальной степени
+        при изменении степени одной вершины
+
+        Используется только в методах класса
+
+        Параметры
+        ---------
+        old_degree: int | None
+            степень до изменения, None - вершины не было
+        new_degree: int | None
+            степень после изменения, None - вершина удалена
+        """
+
+        counts = self._degree_counts
+
+        if old_degree is not None:
+            counts[old_degree] -= 1
+            if not counts[old_degree]:
+                del counts[old_degree]
+            self._degree_sum -= old_degree
+
+        if new_degree is not None:
+            counts[new_degree] += 1
+            self._degree_sum += new_degree
+            if new_degree > self._max_degree:
+                self._max_degree = new_degree
+
+        # максимум мог уменьшиться только если исчезла последняя вершина с максимальной степенью
+        while self._max_degree and not counts.get(self._max_degree):
+            self._max_degree -= 1
+
+
+    @property
+    def num_vertices(self) -> int:
+        """
+        Количество вершин, O(1)
+
+        Пример использования:
+
+            graph = Graph({'A': ['B'], 'B': ['A'], 'C': []})
+            print(graph.num_vertices) # 3
+        """
+
+        return len(self._graph_dict)
+
+
+    @property
+    def num_edges(self) -> int:
+        """
+        Количество неориентированных ребер (петля считается одним ребром), O(1)
+
+        Пример использования:
+
+            graph = Graph({'A': ['B'], 'B': ['A'], 'C': []})
+            print(graph.num_edges) # 1
+        """
+
+        return (self._degree_sum + self._loops_count) // 2
+
+
+    @property
+    def max_degree(self) -> int:
+        """
+        Максимальная степень вершины (0 для пустого графа), O(1)
+
+        Пример использования:
+
+            graph = Graph({'A': ['B', 'C'], 'B': ['A'], 'C': ['A']})
+            print(graph.max_degree) # 2
+        """
+
+        return self._max_degree
+
+
+    def degree_histogram(self) -> dict[int, int]:
+        """
+        Метод получения гистограммы степеней вершин
+
+        Гистограмма поддерживается при каждом изменении графа, метод только копирует ее
+
+        Возвращает словарь {степень: количество вершин} по возрастанию степени
+
+        Пример использования:
+
+            graph = Graph({'A': ['B', 'C'], 'B': ['A'], 'C': ['A'], 'D': []})
+            print(graph.degree_histogram()) # {0: 1, 1: 2, 2: 1}
+        """
+
+        return dict(sorted(self._degree_counts.items()))
+
+
+    def get_degree_vertex(self, vertex: str | int) -> int:
+        """
+        Метод получения степени вершины
+
+        Параметры
+        ---------
+        vertex: str | int
+            вершина, у которой нужно узнать степень
+
+
+        Возвращает int
+
+        Пример использования:
+
+            graph = Graph({'A': ['B', 'C'],
+                           'B': ['A', 'C'],
+                           'C': ['A', 'B']})
+            print(graph.get_degree_vertex('B')) # 2
+        """
+        return len(self._graph_dict[vertex])
+
+
+    def weisfeiler_lehman_colors(self, iterations: int = WL_ITERATIONS) -> dict:
+        """
+        Метод получения цветов вершин по алгоритму Вейсфейлера-Лемана
+
+        Начальный цвет вершины - ее степень и наличие петли, на каждой итерации цвет
+        заменяется хэшем от своего цвета и отсортированных цветов соседей. Цвета
+        не зависят от названий вершин, поэтому у соответствующих вершин изоморфных
+        графов они совпадают
+
+        Параметры
+        ---------
+        iterations: int
+            количество итераций уточнения
+
+        Возвращает словарь {вершина: цвет (int)}
+        """
+
+        adjacency = self._graph_dict
+        colors = {vertex: hash((len(neighbors), vertex in neighbors)) for vertex, neighbors in adjacency.items()}
+
+        for _ in range(iterations):
+            colors = {
+                vertex: hash((colors[vertex], tuple(sorted(colors[neighbor] for neighbor in neighbors))))
+                for vertex, neighbors in adjacency.items()
+            }
+
+        return colors
+
+
+    def weisfeiler_lehman_hash(self, iterations: int = WL_ITERATIONS) -> int:
+        """
+        Метод получения хэша графа по алгоритму Вейсфейлера-Лемана
+
+        У изоморфных графов хэши всегда равны, у неизоморфных - почти всегда различны,
+        поэтому хэш подходит для быстрого отсева при поиске дубликатов
+
+        Параметры
+        ---------
+        iterations: int
+            количество итераций уточнения
+
+        Возвращает int
+
+        Пример использования:
+
+            graph = Graph({'A': ['B'], 'B': ['A', 'C'], 'C': ['B']})
+            same_graph = Graph({1: [3], 2: [3], 3: [1, 2]})
+            print(graph.weisfeiler_lehman_hash() == same_graph.weisfeiler_lehman_hash()) # True
+        """
+
+        return hash(tuple(sorted(self.weisfeiler_lehman_colors(iterations).values())))
+
+
+    def _match_vertices(self, host: 'Graph', compatible: Callable[[str | int, str | int], bool],
+                        induced: bool, host_pools: dict | None = None,
+                        pool_key: Callable[[str | int], object] | None = None) -> Iterator[dict]:
+        """
+        Поиск отображений вершин данного графа (образца) в вершины графа host
+        поиском с возвратом в духе VF2
+
+        Вершины образца перебираются в порядке связности (каждая следующая, если возможно,
+        соседствует с уже отображенной), поэтому кандидаты берутся из соседей образа
+        уже отображенного соседа, а не из всех вершин host
+
+        Используется только в методах класса
+
+        Параметры
+        ---------
+        host: Graph
+            граф, в который ищется отображение
+        compatible: Callable[[вершина образца, вершина host], bool]
+            предварительный фильтр кандидатов (степени, цвета и т.п.)
+        induced: bool
+            True - несмежные вершины образца должны отображаться в несмежные (изоморфизм),
+            False - достаточно, чтобы ребра образца переходили в ребра (мономорфизм)
+        host_pools: dict | None
+            вершины host, сгруппированные по ключу, для вершин образца без отображенных соседей
+        pool_key: Callable[[вершина образца], ключ] | None
+            ключ группы host_pools для вершины образца
+
+        Возвращает генератор словарей {вершина образца: вершина host}
+        """
+
+        pattern_adjacency, host_adjacency = self._graph_dict, host._graph_dict
+
+        # порядок связности: компоненты по очереди, в каждой обход в ширину от вершины наибольшей степени
+        order: list = []
+        placed: set = set()
+        for root in sorted(pattern_adjacency, key=lambda v: len(pattern_adjacency[v]), reverse=True):
+            if root in placed:
+                continue
+            placed.add(root)
+            queue_nodes = deque([root])
+            while queue_nodes:
+                current_node = queue_nodes.popleft()
+                order.append(current_node)
+                for neighbor_node in sorted(pattern_adjacency[current_node],
+                                            key=lambda v: len(pattern_adjacency[v]), reverse=True):
+                    if neighbor_node not in placed:
+                        placed.add(neighbor_node)
+                        queue_nodes.append(neighbor_node)
+
+        position = {vertex: idx for idx, vertex in enumerate(order)}
+        earlier_neighbors = [
+            [neighbor for neighbor in pattern_adjacency[vertex] if position[neighbor] < idx]
+            for idx, vertex in enumerate(order)
+        ]
+
+        mapping: dict = {}
+        reverse: dict = {}
+
+        def candidates(idx):
+            vertex = order[idx]
+            if earlier_neighbors[idx]:
+                pool = host_adjacency[mapping[earlier_neighbors[idx][0]]]
+            elif host_pools is not None:
+                pool = host_pools.get(pool_key(vertex), ())
+            else:
+                pool = host_adjacency
+
+            for candidate in pool:
+                if candidate not in reverse and compatible(vertex, candidate):
+                    yield candidate
+
+        def feasible(idx, candidate):
+            vertex = order[idx]
+            candidate_neighbors = host_adjacency[candidate]
+
+            if (vertex in pattern_adjacency[vertex]) != (candidate in candidate_neighbors):
+                if induced or vertex in pattern_adjacency[vertex]:
+                    return False
+
+            for neighbor in earlier_neighbors[idx]:
+                if mapping[neighbor] not in candidate_neighbors:
+                    return False
+
+            if induced:
+                # отображенные соседи кандидата должны быть образами соседей вершины
+                mapped_neighbors = sum(1 for neighbor in candidate_neighbors
+                                       if neighbor in reverse and neighbor != candidate)
+                if mapped_neighbors != len(earlier_neighbors[idx]):
+                    return False
+
+            return True
+
+        if not order:
+            yield {}
+            return
+
+        stack = [candidates(0)]
+
+        while stack:
+            idx = len(stack) - 1
+
+            for candidate in stack[-1]:
+                if not feasible(idx, candidate):
+                    continue
+
+                mapping[order[idx]] = candidate
+                reverse[candidate] = order[idx]
+
+                if idx + 1 == len(order):
+                    yield dict(mapping)
+                    del reverse[mapping.pop(order[idx])]
+                    continue
+
+                stack.append(candidates(idx + 1))
+                break
+            else:
+                stack.pop()
+                if stack:
+                    del reverse[mapping.pop(order[len(stack) - 1])]
+
+
+    def find_isomorphism(self, graph_isomorph: 'Graph | GraphDict | GraphDictWeight') -> dict | None:
+        """
+        Метод поиска изоморфизма графов (веса ребер не учитываются)
+
+        Сначала сравниваются инварианты: число вершин и ребер, отсортированные степени
+        и цвета Вейсфейлера-Лемана - большинство неизоморфных пар отсеивается на этом шаге.
+        Затем соответствие вершин ищется поиском с возвратом, где кандидатами для вершины
+        служат только вершины того же цвета
+
+        Параметры
+        ---------
+        graph_isomorph: Graph | GraphDict | GraphDictWeight
+            граф, который проверяем на изоморфность с данным
+
+        Возвращает словарь {вершина данного графа: вершина graph_isomorph} или None
+
+        Пример использования:
+
+            graph = Graph({'A': ['B'], 'B': ['A', 'C'], 'C': ['B']})
+            print(graph.find_isomorphism({1: [3], 2: [3], 3: [1, 2]})) # {'B': 3, 'A': 1, 'C': 2}
+        """
+
+        if not isinstance(graph_isomorph, Graph):
+            graph_isomorph = Graph(graph_isomorph)
+
+        adjacency, other_adjacency = self._graph_dict, graph_isomorph._graph_dict
+
+        if len(adjacency) != len(other_adjacency):
+            return None
+        if sorted(map(len, adjacency.values())) != sorted(map(len, other_adjacency.values())):
+            return None
+
+        colors = self.weisfeiler_lehman_colors()
+        other_colors = graph_isomorph.weisfeiler_lehman_colors()
+        if sorted(colors.values()) != sorted(other_colors.values()):
+            return None
+
+        vertices_by_color: dict = {}
+        for vertex, color in other_colors.items():
+            vertices_by_color.setdefault(color, []).append(vertex)
+
+        return next(self._match_vertices(
+            graph_isomorph,
+            lambda vertex, candidate: colors[vertex] == other_colors[candidate],
+            induced=True,
+            host_pools=vertices_by_color,
+            pool_key=colors.__getitem__,
+        ), None)
+
+
+    def is_isomorph(self, graph_isomorph: 'Graph | GraphDict | GraphDictWeight') -> bool:
+        """
+        Метод проверки графа на изоморфность (веса ребер не учитываются)
+
+        Параметры
+        ---------
+        graph_isomorph: Graph | GraphDict | GraphDictWeight
+            граф, который проверяем на изоморфность с данным
+
+        Возвращает bool
+
+        Пример использования:
+
+            graph = Graph({
+                'A': ['B', 'C'],
+                'B': ['A', 'D', 'E'],
+                'C': ['A', 'F'],
+                'D': ['B'],
+                'E': ['B', 'F'],
+                'F': ['E', 'C'],
+            })
+
+            isomorph_graph = Graph({
+                1: [3, 6, 2],
+                2: [1, 4],
+                3: [1, 5],
+                4: [5, 2],
+                5: [3, 4],
+                6: [1]
+            })
+
+            print(graph.is_isomorph(isomorph_graph)) # True
+        """
+
+        return self.find_isomorphism(graph_isomorph) is not None
+
+
+    def find_subgraph_embeddings(self, pattern: 'Graph | GraphDict | GraphDictWeight', induced: bool = False,
+                                 limit: int | None = None) -> Iterator[dict]:
+        """
+        Метод поиска вложений графа-образца в данный граф (без учета названий и весов)
+
+        Вложение - отображение вершин образца в разные вершины данного графа, при котором
+        каждое ребро образца переходит в ребро (мономорфизм подграфа). Кандидаты
+        для вершины образца отбираются по степени и берутся из соседей образа уже
+        отображенного соседа, дальше работает поиск с возвратом
+
+        Параметры
+        ---------
+        pattern: Graph | GraphDict | GraphDictWeight
+            граф-образец
+        induced: bool
+            по умолчанию False
+            True - несмежные вершины образца должны переходить в несмежные (индуцированный подграф)
+        limit: int | None
+            максимальное количество вложений, по умолчанию все
+
+        Возвращает генератор словарей {вершина образца: вершина данного графа}.
+        Симметричные вложения (отличающиеся автоморфизмом образца) возвращаются отдельно
+
+        Пример использования:
+
+            graph = Graph({'A': ['B', 'C'],
+                           'B': ['A', 'C'],
+                           'C': ['A', 'B', 'D'],
+                           'D': ['C']})
+            print(next(graph.find_subgraph_embeddings({1: [2, 3], 2: [3]})))
+
+            # {1: 'A', 2: 'B', 3: 'C'}
+        """
+
+        if not isinstance(pattern, Graph):
+            pattern = Graph(pattern)
+
+        pattern_adjacency, host_adjacency = pattern._graph_dict, self._graph_dict
+
+        def compatible(vertex, candidate):
+            return len(host_adjacency[candidate]) >= len(pattern_adjacency[vertex])
+
+        return islice(pattern._match_vertices(self, compatible, induced), limit)
+
+
+    def get_adjacency_vertices(self, vertex: str | int) -> list:
+        """
+        Метод получения смежных вершин
+
+        Параметры
+        ---------
+        vertex: str | int
+            вершина, у которой нужно узнать смежные вершины
+
+        Возвращает list
+
+        Пример использования:
+
+            graph = Graph({'A': ['B', 'C'],
+                           'B': ['A', 'C'],
+                           'C': ['A', 'B']})
+            print(graph.get_adjacency_vertices('B')) # ['A', 'C']
+        """
+
+        return list(self._graph_dict[vertex])
+
+
+    def _vertex_numbers(self) -> tuple[list, dict, np.ndarray]:
+        """
+        Плотная нумерация вершин в порядке get_vertices за O(V), кэшируется до следующего изменения графа
+
+        Используется только в методах класса
+
+        Возвращает (вершины, {вершина: номер}, массив вершин dtype=object для выборки по номерам)
+        """
+
+        if self._numbers_cache is not None and self._numbers_cache[0] == self._version:
+            return self._numbers_cache[1]
+
+        vertices = self.get_vertices()
+        labels = np.empty(len(vertices), dtype=object)
+        labels[:] = vertices
+
+        result = (vertices, {vertex: idx for idx, vertex in enumerate(vertices)}, labels)
+        self._numbers_cache = (self._version, result)
+
+        return result
+
+
+    def _addition_row(self, vertex: str | int) -> list[str | int]:
+        """
+        Соседи вершины в дополнении по одной битовой строке: из строки всех единиц
+        (упакованные биты, как в _adjacency_bits) вычеркиваются соседи и сама вершина
+
+        Стоит O(степень) операций Python и O(V / 8) векторных операций над байтами,
+        битовая матрица всего графа не строится
+
+        Используется только в методах класса
+        """
+
+        vertices, index, labels = self._vertex_numbers()
+        neighbors = self._graph_dict[vertex]
+
+        positions = np.fromiter((index[neighbor] for neighbor in neighbors), dtype=np.int64, count=len(neighbors))
+        positions = np.append(positions, index[vertex])
+
+        row = np.packbits(np.ones(len(vertices), dtype=bool), bitorder='little')
+        np.bitwise_and.at(row, positions >> 3, ~(1 << (positions & 7)).astype(np.uint8))
+
+        return labels[np.flatnonzero(np.unpackbits(row, count=len(vertices), bitorder='little'))].tolist()
+
+
+    def _adjacency_bits(self) -> tuple[list, dict, np.ndarray]:
+        """
+        Битовое представление матрицы смежности
+
+        Вершины нумеруются подряд, строка i - упакованные биты (np.packbits, младший бит
+        первым) соседей вершины i, поэтому операции над строками идут по 8 вершин на байт
+        и векторно по всей матрице. Результат кэшируется до следующего изменения графа
+
+        Используется только в методах класса
+
+        Возвращает (вершины, {вершина: номер}, массив uint8 формы (V, ceil(V / 8)))
+        """
+
+        if self._bits_cache is not None and self._bits_cache[0] == self._version:
+            return self._bits_cache[1]
+
+        rows, columns, _, vertices = self.get_adjacency_sparse('coo')
+        index = {vertex: idx for idx, vertex in enumerate(vertices)}
+
+        bits = np.zeros((len(vertices), (len(vertices) + 7) // 8), dtype=np.uint8)
+        np.bitwise_or.at(bits, (rows, columns >> 3), (1 << (columns & 7)).astype(np.uint8))
+
+        result = (vertices, index, bits)
+        self._bits_cache = (self._version, result)
+
+        return result
+
+
+    def _addition_bits(self) -> tuple[list, dict, np.ndarray]:
+        """
+        Битовое представление дополнения графа: инверсия строк матрицы смежности
+        без диагонали и без битов выравнивания в последнем байте
+
+        Используется только в методах класса
+
+        Возвращает (вершины, {вершина: номер}, массив uint8 формы (V, ceil(V / 8)))
+        """
+
+        vertices, index, bits = self._adjacency_bits()
+        vertices_count = len(vertices)
+
+        addition = ~bits
+        addition &= np.packbits(np.ones(vertices_count, dtype=bool), bitorder='little')
+        diagonal = np.arange(vertices_count)
+        addition[diagonal, diagonal >> 3] &= ~(1 << (diagonal & 7)).astype(np.uint8)
+
+        return vertices, index, addition
+
+
+    @_cached_query
+    def get_addition_graph(self) -> Mapping[str | int, tuple]:
+        """
+        Метод получения дополнение простого графа
+
+        Дополнение строится по битовым строкам матрицы смежности (см. _adjacency_bits)
+
+        Возвращает неизменяемый словарь {вершина: кортеж соседей в дополнении},
+        его можно передать в Graph или is_addition_graph
+
+        Пример использования:
+
+            graph = Graph({'A': ['C'],
+                           'B': ['C'],
+                           'C': ['A', 'B']})
+            print(graph.get_addition_graph())
+
+            # {'A': ('B',), 'B': ('A',), 'C': ()}
+        """
+
+        vertices, _, addition = self._addition_bits()
+
+        return MappingProxyType({
+            vertex: tuple(vertices[idx] for idx in
+                          np.flatnonzero(np.unpackbits(row, count=len(vertices), bitorder='little')).tolist())
+            for vertex, row in zip(vertices, addition)
+        })
+
+
+    def get_addition_view(self) -> 'AdditionGraphView':
+        """
+        Метод получения ленивого представления дополнения графа
+
+        Словарь дополнения не строится: смежность в дополнении и степень вычисляются
+        по данному графу за O(1), а соседи - по битовой строке одной вершины (см. _addition_row)
+
+        Возвращает AdditionGraphView
+
+        Пример использования:
+
+            graph = Graph({'A': ['C'],
+                           'B': ['C'],
+                           'C': ['A', 'B']})
+            addition = graph.get_addition_view()
+            print(addition.has_edge('A', 'B'), addition.get_adjacency_vertices('C')) # True []
+        """
+
+        return AdditionGraphView(self)
+
+
+    def is_addition_graph(self, graph_addition: dict) -> bool:
+        """
+        Метод проверки графа на дополняюший граф
+
+        Битовые строки graph_addition сравниваются с битовыми строками дополнения
+        одной векторной операцией
+
+        Параметры
+        ---------
+        graph_addition: GraphDict
+            граф, который проверяем на дополнение с данным
+
+        Возвращает bool
+
+        Пример использования:
+
+            graph = Graph({'A': ['C'],
+                           'B': ['C'],
+                           'C': ['A', 'B']})
+            print(graph.is_addition_graph({'A': ['B'], 'B': ['A'], 'C': []})) # True
+        """
+
+        vertices, index, addition = self._addition_bits()
+
+        if len(graph_addition) != len(vertices) or any(vertex not in index for vertex in graph_addition):
+            return False
+
+        rows, columns = [], []
+        for vertex, neighbors in graph_addition.items():
+            for neighbor in neighbors:
+                if neighbor not in index:
+                    return False
+                rows.append(index[vertex])
+                columns.append(index[neighbor])
+
+        rows, columns = np.array(rows, dtype=np.int64), np.array(columns, dtype=np.int64)
+        bits = np.zeros_like(addition)
+        np.bitwise_or.at(bits, (rows, columns >> 3), (1 << (columns & 7)).astype(np.uint8))
+
+        return np.array_equal(bits, addition)
+
+
+    @_cached_query
+    def get_adjacency_matrix(self, as_array: bool = False) -> tuple[tuple[int, ...], ...] | np.ndarray:
+        """
+        Метод получения матрицы смежности
+
+        Параметры
+        ---------
+        as_array: bool
+            по умолчанию False - кортеж строк-кортежей
+            True - компактный массив NumPy V×V, заполняемый из CSR за O(V² + E)
+
+        Возвращает tuple[tuple[int, ...], ...] или np.ndarray только для чтения
+        (для изменения нужна копия matrix.copy())
+
+        Пример использования:
+
+            graph = {
+                'A': ['B', 'C'],
+                'B': ['A', 'D', 'E'],
+                'C': ['A', 'F'],
+                'D': ['B'],
+                'E': ['B', 'F'],
+                'F': ['E', 'C'],
+            }
+            print(Graph(graph).get_adjacency_matrix())
+
+            # ((0, 1, 1, 0, 0, 0), (1, 0, 0, 1, 1, 0), (1, 0, 0, 0, 0, 1), (0, 1, 0, 0, 0, 0), (0, 1, 0, 0, 0, 1), (0, 0, 1, 0, 1, 0))
+        """
+
+        if as_array:
+            indptr, indices, weights, vertices = self.get_adjacency_sparse()
+            matrix = np.zeros((len(vertices), len(vertices)), dtype=weights.dtype)
+            matrix[np.repeat(np.arange(len(vertices)), np.diff(indptr)), indices] = weights
+            matrix.setflags(write=False)
+            return matrix
+
+        vertices = self.get_vertices()
+
+        return tuple(tuple(self._graph_dict[v1].get(v2, 0) for v2 in vertices) for v1 in vertices)
+
+
+    def get_adjacency_sparse(self, sparse_format: str = 'csr') -> tuple[np.ndarray, np.ndarray, np.ndarray, list]:
+        """
+        Метод получения разреженной матрицы смежности за O(V + E)
+
+        Параметры
+        ---------
+        sparse_format: str
+            'csr' (по умолчанию) - (indptr, indices, weights, vertices):
+                соседи вершины vertices[i] - indices[indptr[i]:indptr[i + 1]]
+            'coo' - (rows, indices, weights, vertices): ребро k идет из rows[k] в indices[k]
+
+        Возвращает кортеж из массивов NumPy и списка вершин в порядке номеров.
+        Веса - int64, если все веса - целые числа (int) в пределах int64, иначе float64
+
+        Пример использования:
+
+            graph = Graph({'A': [['B', 2], ['C', 1]],
+                           'B': [['A', 2]],
+                           'C': [['A', 1]]})
+            indptr, indices, weights, vertices = graph.get_adjacency_sparse()
+            print(indptr, indices, weights, vertices)
+
+            # [0 2 3 4] [1 2 0 0] [2 1 2 1] ['A', 'B', 'C']
+        """
+
+        if sparse_format not in ('csr', 'coo'):
+            raise Exception("Неизвестный формат", sparse_format)
+
+        adjacency = self._graph_dict
+        vertices = self.get_vertices()
+        index = {vertex: idx for idx, vertex in enumerate(vertices)}
+
+        degrees = np.fromiter((len(neighbors) for neighbors in adjacency.values()), dtype=np.int64, count=len(vertices))
+        indptr = np.zeros(len(vertices) + 1, dtype=np.int64)
+        np.cumsum(degrees, out=indptr[1:])
+        edges_count = int(indptr[-1])
+
+        indices = np.fromiter((index[neighbor] for neighbors in adjacency.values() for neighbor in neighbors),
+                              dtype=np.int64, count=edges_count)
+        # целые веса переводятся в int64 напрямую, без float64, где теряются значения больше 2^53
+        weights_list = [weight for neighbors in adjacency.values() for weight in neighbors.values()]
+        weights = None
+        if all(isinstance(weight, (int, np.integer)) for weight in weights_list):
+            try:
+                weights = np.array(weights_list, dtype=np.int64)
+            except OverflowError:
+                pass
+        if weights is None:
+            weights = np.array(weights_list, dtype=np.float64)
+
+        if sparse_format == 'coo':
+            return np.repeat(np.arange(len(vertices), dtype=np.int64), degrees), indices, weights, vertices
+
+        return indptr, indices, weights, vertices
+
+
+    @staticmethod
+    def _default_labels(count: int) -> list[str]:
+        """
+        Метод получения стандартных названий вершин: A, B, ..., Z, AA, AB, ...
+
+        Используется только в методах класса
+
+        Параметры
+        ---------
+        count: int
+            количество вершин
+
+        Возвращает list[str]
+        """
+
+        letters = string.ascii_uppercase
+        labels = []
+
+        for number in range(1, count + 1):
+            label = ''
+            while number:
+                number, remainder = divmod(number - 1, len(letters))
+                label = letters[remainder] + label
+            labels.append(label)
+
+        return labels
+
+
+    def create_from_adjacency_matrix(self, matrix: list[list[int]] | np.ndarray,
+                                     labels: Sequence[str | int] | None = None):
+        """
+        Метод создания графа из матрицы смежности
+
+        Ненулевые ячейки находятся векторно, каждое неориентированное ребро
+        записывается в словарь смежности один раз. Если ребро задано и в (i, j),
+        и в (j, i), берется вес из первой по порядку строк ячейки, как при
+        последовательном add_edge
+
+        Параметры
+        ---------
+        matrix: list[list[int]] | np.ndarray
+            квадратная матрица смежности (список списков, массив NumPy или любой объект с буфером)
+        labels: Sequence[str | int] | None
+            названия вершин по порядку строк, по умолчанию A, B, ..., Z, AA, AB, ...
+
+        Возвращает Graph
+
+        Пример использования:
+
+
+            print(Graph().create_from_adjacency_matrix([[0, 1, 1, 0, 0, 0],
+                                                        [1, 0, 0, 1, 1, 0],
+                                                        [1, 0, 0, 0, 0, 1],
+                                                        [0, 1, 0, 0, 0, 0],
+                                                        [0, 1, 0, 0, 0, 1],
+                                                        [0, 0, 1, 0, 1, 0]]))
+
+            # Граф с 6 вершинами и 12 ребрами
+
+            print(Graph().create_from_adjacency_matrix(np.eye(3, k=1), labels=[10, 20, 30]).get_graph_weighted())
+
+            # {10: [[20, 1.0]], 20: [[10, 1.0], [30, 1.0]], 30: [[20, 1.0]]}
+        """
+
+        matrix = np.asarray(matrix)
+        if matrix.size == 0:
+            matrix = matrix.reshape(0, 0)
+        if matrix.ndim != 2 or matrix.shape[0] != matrix.shape[1]:
+            raise Exception("Матрица смежности должна быть квадратной", matrix.shape)
+
+        vertices_count = matrix.shape[0]
+        vertices = list(labels) if labels is not None else self._default_labels(vertices_count)
+        if len(vertices) != vertices_count:
+            raise Exception("Количество названий вершин не совпадает с размером матрицы", len(vertices))
+
+        # ненулевые ячейки в порядке строк; для пары (i, j) и (j, i) оставляем первую из них
+        rows, columns = np.nonzero(matrix)
+        low, high = np.minimum(rows, columns), np.maximum(rows, columns)
+        _, first = np.unique(low * vertices_count + high, return_index=True)
+        weights = matrix[rows[first], columns[first]]
+
+        adjacency: AdjacencyDict = {vertex: {} for vertex in vertices}
+        for low_idx, high_idx, weight in zip(low[first].tolist(), high[first].tolist(), weights.tolist()):
+            start_vertex, end_vertex = vertices[low_idx], vertices[high_idx]
+            adjacency[start_vertex][end_vertex] = weight
+            adjacency[end_vertex][start_vertex] = weight
+
+        self._graph_dict = adjacency
+        self._recount()
+        self._mutated(GraphEventKind.GRAPH_RESET)
+
+        return self
+
+
+    @staticmethod
+    def _read_lines(path: str, use_mmap: bool = False) -> Iterator[bytes]:
+        """
+        Построчное чтение файла в байтах, обычное или через отображение в память
+
+        Используется только в методах класса
+
+        Параметры
+        ---------
+        path: str
+            путь к файлу
+        use_mmap: bool
+            читать через mmap
+
+        Возвращает генератор строк (bytes)
+        """
+
+        with open(path, 'rb') as file:
+            if not use_mmap:
+                yield from file
+                return
+
+            # mmap нельзя создать для пустого файла
+            if os.fstat(file.fileno()).st_size == 0:
+                return
+
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                yield from iter(mapped.readline, b'')
+
+
+    @staticmethod
+    def _parse_matrix_rows(lines: list[bytes], columns: int, path: str) -> np.ndarray:
+        """
+        Разбор строк матрицы смежности в массив NumPy формы (строки, columns) парсером
+        np.loadtxt: int64, если в строках нет дробной записи чисел, иначе float64
+
+        Используется только в методах класса
+        """
+
+        try:
+            values = np.loadtxt(lines, dtype=np.float64, comments=None, ndmin=2)
+        except ValueError:
+            raise Exception("Строки матрицы смежности разной длины или содержат не числа", path)
+        if values.shape[1] != columns:
+            raise Exception("Строки матрицы смежности разной длины", path)
+
+        if any(MATRIX_FLOAT_CHARS.search(line) for line in lines):
+            return values
+        if not values.size or np.abs(values).max() < 2 ** 53:
+            return values.astype(np.int64)
+
+        # целые больше 2^53 в float64 неточны - такие куски разбираются как int64 по словам
+        try:
+            return np.array([line.split() for line in lines]).astype(np.int64)
+        except (ValueError, OverflowError):
+            return values
+
+
+    def read_adjacency_matrix(self, path: str, labels: Sequence[str | int] | None = None,
+                              use_mmap: bool = False, chunk_cells: int = MATRIX_CHUNK_CELLS):
+        """
+        Метод потокового чтения графа из текстового файла с матрицей смежности
+
+        Файл читается кусками примерно по chunk_cells ячеек (не меньше одной строки),
+        куски разбираются парсером NumPy, числа разделяются любыми пробельными
+        символами, пустые строки пропускаются. Вся матрица V×V в памяти не строится:
+        из каждого куска сразу берутся ненулевые ячейки
+
+        Параметры
+        ---------
+        path: str
+            путь к файлу
+        labels: Sequence[str | int] | None
+            названия вершин, по умолчанию A, B, ..., Z, AA, AB, ...
+        use_mmap: bool
+            читать файл через отображение в память (mmap)
+        chunk_cells: int
+            сколько ячеек матрицы разбирать за раз
+
+        Возвращает Graph
+        Вызывает исключение, если строки матрицы разной длины, содержат не числа
+        или матрица не квадратная,
+        при этом граф не изменяется: файл разбирается в новый граф, который заменяет
+        текущий только после успешного чтения
+
+        Пример использования:
+
+            graph = Graph().read_adjacency_matrix('graph.txt')
+        """
+
+        lines = (line for line in self._read_lines(path, use_mmap) if line.strip())
+        first_line = next(lines, None)
+        if first_line is None:
+            return self.create_from_adjacency_matrix([], labels)
+
+        vertices_count = len(first_line.split())
+        vertices = list(labels) if labels is not None else self._default_labels(vertices_count)
+        if len(vertices) != vertices_count:
+            raise Exception("Количество названий вершин не совпадает с размером матрицы", len(vertices))
+
+        loaded = Graph(dict.fromkeys(vertices, []))
+
+        row_idx = 0
+        lines = chain([first_line], lines)
+        chunk_rows = max(1, chunk_cells // vertices_count)
+
+        while chunk := list(islice(lines, chunk_rows)):
+            if row_idx + len(chunk) > vertices_count:
+                raise Exception("Матрица смежности должна быть квадратной", path)
+
+            matrix = self._parse_matrix_rows(chunk, vertices_count, path)
+            rows, columns = np.nonzero(matrix)
+            values = matrix[rows, columns]
+            loaded.add_edges((vertices[row_idx + row], vertices[column], weight)
+                             for row, column, weight in zip(rows.tolist(), columns.tolist(), values.tolist()))
+            row_idx += len(chunk)
+
+        if row_idx != vertices_count:
+            raise Exception("Матрица смежности должна быть квадратной", path)
+
+        return self._replace_with(loaded)
+
+
+    def _replace_with(self, graph: 'Graph') -> 'Graph':
+        """
+        Замена всего словаря смежности словарем другого графа (после успешного чтения файла)
+
+        Актуальная система непересекающихся множеств загруженного графа переходит вместе
+        со словарем, поэтому после чтения файла она не перестраивается
+
+        Используется только в методах класса
+
+        Возвращает этот граф
+        """
+
+        union_find_current = graph._uf_version == graph._version
+
+        self._graph_dict = graph._graph_dict
+        self._recount()
+        self._mutated(GraphEventKind.GRAPH_RESET)
+
+        if union_find_current:
+            self._uf_parent, self._uf_size = graph._uf_parent, graph._uf_size
+            self._components_count = graph._components_count
+            self._uf_version = self._version
+
+        return self
+
+
+    @staticmethod
+    def _escape_label(vertex: str | int) -> str:
+        """
+        Название вершины для списка ребер: обратная косая черта, табуляция и переводы строк
+        экранируются, # в начале названия - тоже, чтобы строка не стала комментарием
+
+        Используется только в методах класса
+        """
+
+        label = ''.join(EDGE_LIST_ESCAPES.get(char, char) for char in str(vertex))
+        return '\\' + label if label.startswith('#') else label
+
+
+    @staticmethod
+    def _unescape_label(label: str) -> str:
+        """
+        Обратное преобразование к _escape_label
+
+        Используется только в методах класса
+        """
+
+        return re.sub(r'\\(.)', lambda match: EDGE_LIST_UNESCAPES.get(match[1], match[1]), label)
+
+
+    def write_adjacency_matrix(self, path: str, chunk_cells: int = MATRIX_CHUNK_CELLS) -> None:
+        """
+        Метод потоковой записи матрицы смежности в текстовый файл
+
+        Строки матрицы строятся и записываются кусками примерно по chunk_cells ячеек
+        (не меньше одной строки), вся матрица в памяти не хранится
+
+        Параметры
+        ---------
+        path: str
+            путь к файлу
+        chunk_cells: int
+            сколько ячеек матрицы записывать за раз
+
+        Возвращает None
+        """
+
+        vertices = self.get_vertices()
+        index = {vertex: idx for idx, vertex in enumerate(vertices)}
+        chunk_rows = max(1, chunk_cells // max(len(vertices), 1))
+
+        with open(path, 'w') as file:
+            for start in range(0, len(vertices), chunk_rows):
+                lines = []
+                for vertex in vertices[start:start + chunk_rows]:
+                    row = [0] * len(vertices)
+                    for neighbor, weight in self._graph_dict[vertex].items():
+                        row[index[neighbor]] = weight
+                    lines.append(' '.join(map(str, row)))
+                file.write('\n'.join(lines) + '\n')
+
+
+    def read_edge_list(self, path: str, use_mmap: bool = False):
+        """
+        Метод потокового чтения графа из текстового файла со списком ребер
+
+        Формат: по одной записи в строке, поля разделяются табуляцией
+            начало<TAB>конец[<TAB>вес] - ребро (вес по умолчанию 1)
+            вершина[<TAB>]             - отдельная вершина
+        В названиях вершин обратная косая черта, табуляция, переводы строк и # в начале
+        экранируются обратной косой чертой (см. write_edge_list), поэтому названия могут
+        содержать пробелы. Строки без табуляции разбираются по любым пробельным символам.
+        Пустые строки и строки, начинающиеся с #, пропускаются. Вес читается как int,
+        а если это не целое число - как float, поэтому большие целые веса не искажаются.
+        Названия вершин читаются как строки: целые названия, записанные write_edge_list,
+        возвращаются строками ('1', а не 1)
+
+        Если файл содержит неверную строку, вызывается исключение, а граф не изменяется
+
+        Параметры
+        ---------
+        path: str
+            путь к файлу
+        use_mmap: bool
+            читать файл через отображение в память (mmap)
+
+        Возвращает Graph
+
+        Пример использования:
+
+            graph = Graph().read_edge_list('graph.edges')
+        """
+
+        loaded = Graph()
+
+        def edges():
+            for line in self._read_lines(path, use_mmap):
+                line = line.decode().rstrip('\r\n')
+                # строка с табуляцией - всегда запись: "<TAB>" - отдельная вершина с пустым названием
+                if ('\t' not in line and not line.strip()) or line.startswith('#'):
+                    continue
+
+                if '\t' in line:
+                    fields = line.split('\t')
+                    if len(fields) == 2 and not fields[1]:
+                        fields.pop()
+                else:
+                    fields = line.split()
+                fields[:2] = [self._unescape_label(field) for field in fields[:2]]
+
+                if len(fields) == 1:
+                    loaded.add_vertex(fields[0])
+                elif len(fields) == 2:
+                    yield fields[0], fields[1], 1
+                elif len(fields) == 3:
+                    yield fields[0], fields[1], self._parse_weight(fields[2], line)
+                else:
+                    raise Exception("Неверная строка списка ребер", line)
+
+        loaded.add_edges(edges())
+
+        return self._replace_with(loaded)
+
+
+    @staticmethod
+    def _parse_weight(field: str, line: str) -> int | float:
+        """
+        Разбор веса из списка ребер: сначала как int (без потери точности больше 2^53), затем как float
+
+        Используется только в методах класса
+        """
+
+        try:
+            return int(field)
+        except ValueError:
+            pass
+
+        try:
+            return float(field)
+        except ValueError:
+            raise Exception("Неверная строка списка ребер", line)
+
+
+    def write_edge_list(self, path: str) -> None:
+        """
+        Метод потоковой записи графа в текстовый файл со списком ребер
+
+        Каждое неориентированное ребро записывается один раз строкой "начало<TAB>конец<TAB>вес",
+        вершины без ребер - строкой из одной вершины. Названия вершин экранируются
+        (формат см. read_edge_list), при чтении они возвращаются строками
+
+        Параметры
+        ---------
+        path: str
+            путь к файлу
+
+        Возвращает None
+        """
+
+        index = {vertex: idx for idx, vertex in enumerate(self._graph_dict)}
+        labels = {vertex: self._escape_label(vertex) for vertex in self._graph_dict}
+
+        with open(path, 'w') as file:
+            for vertex, neighbors in self._graph_dict.items():
+                if not neighbors:
+                    # табуляция в конце отличает отдельную вершину с пробелами в названии от ребра
+                    file.write(f"{labels[vertex]}\t\n")
+                    continue
+
+                file.writelines(f"{labels[vertex]}\t{labels[neighbor]}\t{weight}\n"
+                                for neighbor, weight in neighbors.items() if index[vertex] <= index[neighbor])
+
+
+    def save(self, path: str) -> None:
+        """
+        Метод сохранения графа в компактный двоичный файл
+
+        Формат файла (все числа little-endian, массивы выровнены по 8 байт):
+            заголовок (SNAPSHOT_HEADER_SIZE байт): сигнатура, версия формата, тип весов,
+                тип названий вершин, V, E, размер таблицы названий в байтах, число петель
+            indptr: int64[V + 1]
+            indices: int64[E], внутри строки по возрастанию
+            weights: int64[E] или float64[E]
+            таблица названий: int64[V] для целых названий,
+                либо смещения int64[V + 1] и строки в UTF-8 для строковых
+
+        Параметры
+        ---------
+        path: str
+            путь к файлу
+
+        Возвращает None
+        Вызывает исключение, если названия вершин не все int или не все str
+
+        Пример использования:
+
+            graph = Graph({'A': ['B', 'C'],
+                           'B': ['A', 'C'],
+                           'C': ['A', 'B']})
+            graph.save('graph.bin')
+        """
+
+        indptr, indices, weights, vertices = self.get_adjacency_sparse()
+        # соседи упорядочены по номеру, чтобы CSRGraph.load искал в строках двоичным поиском без копирования
+        indices, weights = _csr_sorted_rows(indptr, indices, weights)
+
+        if all(type(vertex) is int for vertex in vertices):
+            labels_kind = SNAPSHOT_INT_LABELS
+            labels_data = [np.array(vertices, dtype=np.int64)]
+        elif all(isinstance(vertex, str) for vertex in vertices):
+            labels_kind = SNAPSHOT_STR_LABELS
+            encoded = [vertex.encode() for vertex in vertices]
+            offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+            np.cumsum([len(label) for label in encoded], out=offsets[1:])
+            labels_data = [offsets, np.frombuffer(b''.join(encoded), dtype=np.uint8)]
+        else:
+            raise Exception("Названия вершин должны быть одного типа", "int или str")
+
+        # массивы CSRGraph могут быть суженными (indices - int32), в файл они пишутся в типах формата
+        if np.issubdtype(weights.dtype, np.integer):
+            weights_kind, weights = SNAPSHOT_INT_WEIGHTS, weights.astype('<i8', copy=False)
+        else:
+            weights_kind, weights = SNAPSHOT_FLOAT_WEIGHTS, weights.astype('<f8', copy=False)
+        indptr, indices = indptr.astype('<i8', copy=False), indices.astype('<i8', copy=False)
+
+        labels_size = sum(array.nbytes for array in labels_data)
+        header = SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, weights_kind, labels_kind,
+                                      len(vertices), len(indices), labels_size, self._loops_count)
+
+        with open(path, 'wb') as file:
+            file.write(header.ljust(SNAPSHOT_HEADER_SIZE, b'\0'))
+            for array in (indptr, indices, weights, *labels_data):
+                array.astype(array.dtype.newbyteorder('<'), copy=False).tofile(file)
+
+
+    @staticmethod
+    def load_csr(path: str, mmap: bool = True) -> tuple[np.ndarray, np.ndarray, np.ndarray, list]:
+        """
+        Метод загрузки массивов CSR из файла, сохраненного методом save
+
+        При mmap=True массивы не копируются и не читаются целиком, а отображаются
+        из файла через numpy.memmap, поэтому открытие почти мгновенное
+
+        Параметры
+        ---------
+        path: str
+            путь к файлу
+        mmap: bool
+            по умолчанию True - отобразить массивы в память, иначе прочитать их
+
+        Возвращает (indptr, indices, weights, vertices) как у get_adjacency_sparse
+        Вызывает исключение, если файл не является снимком графа
+
+        Пример использования:
+
+            indptr, indices, weights, vertices = Graph.load_csr('graph.bin')
+        """
+
+        return Graph._load_snapshot(path, mmap)[:4]
+
+
+    @staticmethod
+    def _load_snapshot(path: str, mmap: bool) -> tuple[np.ndarray, np.ndarray, np.ndarray, list, int]:
+        """
+        Чтение снимка графа: массивы CSR (см. load_csr) и число петель из заголовка
+
+        Используется только в методах класса
+        """
+
+        with open(path, 'rb') as file:
+            header = file.read(SNAPSHOT_HEADER.size)
+
+        if len(header) != SNAPSHOT_HEADER.size:
+            raise Exception("Файл не является снимком графа", path)
+        magic, version, weights_kind, labels_kind, vertices_count, edges_count, labels_size, loops_count = \
+            SNAPSHOT_HEADER.unpack(header)
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            raise Exception("Файл не является снимком графа", path)
+
+        offset = SNAPSHOT_HEADER_SIZE
+
+        def read_array(dtype, count):
+            nonlocal offset
+            dtype = np.dtype(dtype)
+            if mmap and count:
+                array = np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=(count,))
+            else:
+                array = np.fromfile(path, dtype=dtype, count=count, offset=offset)
+            offset += dtype.itemsize * count
+            return array
+
+        indptr = read_array('<i8', vertices_count + 1)
+        indices = read_array('<i8', edges_count)
+        weights = read_array('<f8' if weights_kind == SNAPSHOT_FLOAT_WEIGHTS else '<i8', edges_count)
+
+        if labels_kind == SNAPSHOT_INT_LABELS:
+            vertices = read_array('<i8', vertices_count).tolist()
+        else:
+            offsets = read_array('<i8', vertices_count + 1).tolist()
+            blob = read_array(np.uint8, labels_size - 8 * (vertices_count + 1)).tobytes()
+            vertices = [blob[start:end].decode() for start, end in zip(offsets, offsets[1:])]
+
+        return indptr, indices, weights, vertices, loops_count
+
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> 'Graph':
+        """
+        Метод загрузки графа из файла, сохраненного методом save
+
+        Параметры
+        ---------
+        path: str
+            путь к файлу
+        mmap: bool
+            по умолчанию True - массивы отображаются из файла через numpy.memmap без копирования
+            и возвращается неизменяемый CSRGraph (см. CSRGraph.load): открытие стоит O(V)
+            на таблицу названий, ребра читаются с диска только при обращении к ним.
+            Изменяемая копия - fork()
+            False - файл читается целиком в изменяемый Graph за O(V + E)
+
+        Возвращает CSRGraph при mmap=True, иначе Graph
+
+        Пример использования:
+
+            graph = Graph.load('graph.bin')
+            print(graph) # Граф с 3 вершинами и 6 ребрами
+            editable = Graph.load('graph.bin', mmap=False)
+            editable.add_edge('A', 'D')
+        """
+
+        if mmap:
+            return CSRGraph.load(path)
+
+        indptr, indices, weights, vertices = cls.load_csr(path, mmap)
+
+        # соседи и веса всех вершин переводятся в объекты Python одним проходом, затем режутся по indptr
+        neighbors = np.array(vertices, dtype=object)[indices].tolist() if len(indices) else []
+        weights = weights.tolist()
+        bounds = indptr.tolist()
+
+        graph = cls()
+        graph._graph_dict = {
+            vertex: dict(zip(neighbors[start:end], weights[start:end]))
+            for vertex, start, end in zip(vertices, bounds, bounds[1:])
+        }
+        graph._recount()
+        graph._mutated(GraphEventKind.GRAPH_RESET)
+
+        return graph
+
+
+    def __str__(self):
+        # ребра считаются по записям в списках соседей, как в get_edges
+        return f"Граф с {self.num_vertices} вершинами и {self._degree_sum} ребрами"
+
+
+    def __iter__(self):
+        return self
+
+
+    def __next__(self):
+        if len(self.get_vertices()) == self.curr_idx:
+            raise StopIteration
+
+        curr = self.get_vertices()[self.curr_idx]
+        self.curr_idx += 1
+        return curr
+
+
+class FrozenGraph(Graph):
+    """
+    Класс FrozenGraph - неизменяемый снимок графа (см. Graph.freeze)
+
+    Все методы чтения Graph работают без изменений, методы изменения вызывают исключение.
+    Вершины и ребра снимка после создания не меняются. Чтение из нескольких потоков
+    безопасно: ленивые кэши (массивы CSR, битовая матрица, нумерация вершин, таблица
+    расстояний, система непересекающихся множеств) заполняются под блокировкой снимка
+    один раз, а поиск представителя множества ничего не записывает. Блокировка берется
+    только методами этих кэшей, обходы и поиски путей идут параллельно. Для изменений
+    снимка используется fork
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        # блокировка создается до Graph.__init__: он уже строит систему множеств
+        self._cache_lock = threading.RLock()
+        super().__init__(*args, **kwargs)
+
+
+    def _frozen(self, *args, **kwargs) -> None:
+        """
+        Запрет изменения снимка
+
+        Используется только в методах класса
+        """
+
+        raise Exception("Граф заморожен", "Снимок графа нельзя изменять, используйте fork")
+
+    add_vertex = add_vertices = delete_vertex = delete_vertices = _frozen
+    add_edge = add_edges = set_edge_weight = delete_edge = delete_edges = _frozen
+    create_from_adjacency_matrix = read_adjacency_matrix = read_edge_list = _frozen
+    # кэш запросов и подписчики изменяют состояние графа при чтении
+    enable_cache = subscribe = _frozen
+
+    _csr_view = _synchronized(Graph._csr_view)
+    _vertex_numbers = _synchronized(Graph._vertex_numbers)
+    _adjacency_bits = _synchronized(Graph._adjacency_bits)
+    all_pairs_distances = _synchronized(Graph.all_pairs_distances)
+    _union_find = _synchronized(Graph._union_find)
+
+
+    def _find_root(self, vertex: str | int) -> str | int:
+        """
+        Поиск представителя множества вершины без сжатия пути: снимок читается из многих
+        потоков, а глубина деревьев при объединении по размеру - O(log V)
+
+        Используется только в методах класса
+        """
+
+        parent = self._uf_parent
+        while parent[vertex] != vertex:
+            vertex = parent[vertex]
+
+        return vertex
+
+
+    def freeze(self) -> 'FrozenGraph':
+        """
+        Метод получения неизменяемого снимка, снимок уже неизменяем
+
+        Возвращает этот же FrozenGraph
+        """
+
+        return self
+
+
+    def fork(self) -> Graph:
+        """
+        Метод получения изменяемой копии снимка
+
+        Копия разделяет словари соседей со снимком и копирует их только при изменении,
+        поэтому создается за O(V) без копирования ребер
+
+        Возвращает Graph
+
+        Пример использования:
+
+            snapshot = Graph({'A': ['B'], 'B': ['A']}).freeze()
+            graph = snapshot.fork()
+            graph.delete_edge('A', 'B')
+            print(snapshot.has_edge('A', 'B'), graph.has_edge('A', 'B')) # True False
+        """
+
+        graph = self._shared_copy(Graph)
+        graph._cow_shared = set(graph._graph_dict)
+
+        return graph
+
+
+    def __iter__(self):
+        # общий счетчик curr_idx не потокобезопасен, каждый обход получает свой итератор
+        return iter(self._graph_dict)
+
+
+class CSRNeighbors(Mapping):
+    """
+    Класс CSRNeighbors - соседи одной вершины CSRGraph в виде словаря {сосед: вес}
+
+    Ничего не копирует, а читает срез indices[start:end] и weights[start:end].
+    Соседи в срезе упорядочены по номеру, поэтому проверка соседа и получение веса -
+    двоичный поиск за O(log степени)
+    """
+
+    def __init__(self, adjacency: 'CSRAdjacency', start: int, end: int) -> None:
+        self._adjacency = adjacency
+        self._start = start
+        self._end = end
+
+
+    def _position(self, neighbor: str | int) -> int | None:
+        """
+        Номер ребра до соседа в массивах CSR или None
+
+        Используется только в методах класса
+        """
+
+        neighbor_id = self._adjacency.index.get(neighbor)
+        if neighbor_id is None:
+            return None
+
+        row = self._adjacency.indices[self._start:self._end]
+        position = int(row.searchsorted(neighbor_id))
+        return self._start + position if position < len(row) and row[position] == neighbor_id else None
+
+
+    def __getitem__(self, neighbor: str | int) -> int:
+        position = self._position(neighbor)
+        if position is None:
+            raise KeyError(neighbor)
+
+        return self._adjacency.weights[position].item()
+
+
+    def __contains__(self, neighbor: str | int) -> bool:
+        return self._position(neighbor) is not None
+
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+
+    def __iter__(self) -> Iterator[str | int]:
+        return map(self._adjacency.vertices.__getitem__, self._adjacency.indices[self._start:self._end].tolist())
+
+
+    def items(self) -> Iterator[tuple[str | int, int]]:
+        # пары читаются одним проходом по срезам, без поиска каждого соседа
+        return zip(self, self.values())
+
+
+    def values(self) -> list[int]:
+        return self._adjacency.weights[self._start:self._end].tolist()
+
+
+class CSRAdjacency(Mapping):
+    """
+    Класс CSRAdjacency - словарь смежности CSRGraph {вершина: CSRNeighbors} поверх массивов CSR
+
+    Атрибуты
+        indptr, indices, weights: np.ndarray
+            массивы CSR как у Graph.get_adjacency_sparse
+        vertices: list
+            названия вершин по плотным номерам
+        index: dict
+            номер вершины по названию
+    """
+
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, weights: np.ndarray, vertices: list) -> None:
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        self.vertices = vertices
+        self.index = {vertex: idx for idx, vertex in enumerate(vertices)}
+
+
+    def __getitem__(self, vertex: str | int) -> CSRNeighbors:
+        idx = self.index[vertex]
+        return CSRNeighbors(self, int(self.indptr[idx]), int(self.indptr[idx + 1]))
+
+
+    def __contains__(self, vertex: str | int) -> bool:
+        return vertex in self.index
+
+
+    def __len__(self) -> int:
+        return len(self.vertices)
+
+
+    def __iter__(self) -> Iterator[str | int]:
+        return iter(self.vertices)
+
+
+class CSRGraph(FrozenGraph):
+    """
+    Класс CSRGraph - неизменяемый граф, хранящийся в массивах CSR
+
+    Вершины получают плотные номера 0..V-1, соседи вершины i - indices[indptr[i]:indptr[i + 1]]
+    по возрастанию номеров с весами weights[indptr[i]:indptr[i + 1]]. Ребро занимает 12-16 байт вместо сотен байт
+    словарей Python, а при загрузке из файла массивы отображаются в память (см. Graph.load_csr).
+    Словарь смежности подменяется представлением CSRAdjacency, поэтому dfs, bfs, shortest_path,
+    get_degree_vertex, get_adjacency_vertices и остальные методы чтения Graph работают без изменений
+    (соседи перечисляются в порядке номеров вершин). Изменяемая копия - fork
+
+    Атрибуты
+        indptr, indices, weights: np.ndarray
+            массивы CSR
+        vertices: list
+            названия вершин по номерам
+    """
+
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, weights: np.ndarray, vertices: list,
+                 loops_count: int | None = None, rows_sorted: bool = False) -> None:
+        """
+        Метод инициализации графа по массивам CSR
+
+        Параметры
+        ---------
+        indptr: np.ndarray
+            границы списков соседей, длина V + 1
+        indices: np.ndarray
+            номера соседей, длина E
+        weights: np.ndarray
+            веса ребер, длина E
+        vertices: list
+            названия вершин по номерам
+        loops_count: int | None
+            известное число петель, по умолчанию считается проходом по массивам
+        rows_sorted: bool
+            соседи в строках уже упорядочены (как в файле Graph.save), проверка
+            и сортировка пропускаются, массивы не читаются целиком
+
+        Пример использования:
+
+            graph = CSRGraph(np.array([0, 1, 2]), np.array([1, 0]), np.array([3, 3]), ['A', 'B'])
+            print(graph.get_edge_weight('A', 'B')) # 3
+        """
+
+        if len(indptr) != len(vertices) + 1 or len(indices) != len(weights) or indptr[-1] != len(indices):
+            raise Exception("Неверные массивы CSR", (len(indptr), len(indices), len(weights), len(vertices)))
+
+        super().__init__()
+
+        if not rows_sorted:
+            indices, weights = _csr_sorted_rows(indptr, indices, weights)
+        self.indptr, self.indices, self.weights, self.vertices = indptr, indices, weights, vertices
+        self._graph_dict = CSRAdjacency(indptr, indices, weights, vertices)
+        self._recount(loops_count)
+        # система множеств пустого графа из Graph.__init__ устарела, компоненты считаются по массивам
+        self._uf_version = -1
+
+
+    @classmethod
+    def from_graph(cls, graph: Graph) -> 'CSRGraph':
+        """
+        Метод построения графа CSR из Graph за O(V + E)
+
+        Номера соседей хранятся в int32, если вершин меньше 2³¹
+
+        Параметры
+        ---------
+        graph: Graph
+            исходный граф
+
+        Возвращает CSRGraph
+
+        Пример использования:
+
+            graph = CSRGraph.from_graph(Graph({'A': ['B', 'C'], 'B': ['A'], 'C': ['A']}))
+            print(list(graph.bfs('A'))) # ['A', 'B', 'C']
+        """
+
+        indptr, indices, weights, vertices = graph.get_adjacency_sparse()
+        if len(vertices) < 2 ** 31:
+            indices = indices.astype(np.int32)
+
+        return cls(indptr, indices, weights, vertices)
+
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> 'CSRGraph':
+        """
+        Метод загрузки графа из файла, сохраненного методом save, без перевода в словари
+
+        Соседи в файле уже упорядочены, а число петель записано в заголовке, поэтому
+        при mmap=True массивы ребер при открытии не читаются: работа O(V) на названия вершин
+
+        Параметры
+        ---------
+        path: str
+            путь к файлу
+        mmap: bool
+            по умолчанию True - массивы отображаются в память и не читаются целиком
+
+        Возвращает CSRGraph
+
+        Пример использования:
+
+            graph = CSRGraph.load('graph.bin')
+            print(graph.shortest_path('A', 'C')) # ('A', 'C')
+        """
+
+        indptr, indices, weights, vertices, loops_count = cls._load_snapshot(path, mmap)
+
+        return cls(indptr, indices, weights, vertices, loops_count, rows_sorted=True)
+
+
+    def _rows(self) -> np.ndarray:
+        """
+        Номер начальной вершины каждого ребра (строки COO)
+
+        Используется только в методах класса
+        """
+
+        return np.repeat(np.arange(len(self.vertices)), np.diff(self.indptr))
+
+
+    def _recount(self, loops_count: int | None = None) -> None:
+        """
+        Пересчет счетчиков размера по массивам CSR без обхода словарей
+
+        Степени берутся из indptr за O(V), петли - из loops_count или проходом по ребрам
+
+        Используется только в методах класса
+        """
+
+        if not isinstance(self._graph_dict, CSRAdjacency):
+            super()._recount()
+            return
+
+        degrees, counts = np.unique(np.diff(self.indptr), return_counts=True)
+        self._degree_counts = Counter(dict(zip(degrees.tolist(), counts.tolist())))
+        self._degree_sum = len(self.indices)
+        if loops_count is None:
+            loops_count = int(np.count_nonzero(self._rows() == self.indices))
+        self._loops_count = loops_count
+        self._max_degree = max(self._degree_counts, default=0)
+        self._cow_shared = set()
+
+
+    @_synchronized
+    def _union_find(self) -> None:
+        """
+        Компоненты связности по массивам CSR: подвешивание корней по ребрам и сжатие путей
+        векторными операциями NumPy, обычно за O(log V) проходов по ребрам
+
+        Используется только в методах класса
+        """
+
+        if not isinstance(self._graph_dict, CSRAdjacency):
+            super()._union_find()
+            return
+
+        if self._uf_version == self._version:
+            return
+
+        rows, columns = self._rows(), np.asarray(self.indices)
+        parent = np.arange(len(self.vertices))
+
+        while True:
+            start_roots, end_roots = parent[rows], parent[columns]
+            differ = start_roots != end_roots
+            if not differ.any():
+                break
+
+            # больший корень подвешивается к меньшему, поэтому циклов не возникает
+            np.minimum.at(parent, np.maximum(start_roots, end_roots)[differ],
+                          np.minimum(start_roots, end_roots)[differ])
+            while not np.array_equal(parent, grandparent := parent[parent]):
+                parent = grandparent
+
+        roots = parent.tolist()
+        vertices = self.vertices
+        sizes = np.bincount(parent, minlength=len(vertices)).tolist()
+
+        self._uf_parent = {vertex: vertices[root] for vertex, root in zip(vertices, roots)}
+        self._uf_size = {vertices[root]: size for root, size in enumerate(sizes) if size}
+        self._components_count = len(self._uf_size)
+        self._uf_version = self._version
+
+
+    def get_vertices(self) -> list[str | int]:
+        return list(self.vertices)
+
+
+    def get_adjacency_sparse(self, sparse_format: str = 'csr') -> tuple[np.ndarray, np.ndarray, np.ndarray, list]:
+        # массивы уже готовы, копируется только список названий вершин
+        if sparse_format not in ('csr', 'coo'):
+            raise Exception("Неизвестный формат", sparse_format)
+
+        first = self.indptr if sparse_format == 'csr' else self._rows()
+        return first, self.indices, self.weights, list(self.vertices)
+
+
+    def get_adjacency_matrix(self, as_array: bool = False) -> tuple[tuple[int, ...], ...] | np.ndarray:
+        matrix = super().get_adjacency_matrix(as_array=True)
+        return matrix if as_array else tuple(map(tuple, matrix.tolist()))
+
+
+class GraphShard:
+    """
+    Класс GraphShard - часть словаря смежности PartitionedGraph, хранимая в рабочем процессе
+
+    Хранит соседей только своих вершин (соседи могут принадлежать другим частям).
+    Методы вызываются координатором по каналу (см. _serve_shard), кроме того хранится
+    состояние обхода в ширину и поиска компонент между шагами (supersteps)
+
+    Атрибуты
+        shard_id: int
+            номер части
+    """
+
+    def __init__(self, shard_id: int) -> None:
+        self.shard_id = shard_id
+        self._graph_dict: AdjacencyDict = {}
+        self._distances: dict = {}
+        self._parents: dict = {}
+        self._labels: dict = {}
+
+
+    def add_vertices(self, vertices: list) -> None:
+        for vertex in vertices:
+            self._graph_dict.setdefault(vertex, {})
+
+
+    def add_half_edges(self, half_edges: list[tuple]) -> None:
+        # как и в Graph.add_edge, у повторного ребра остается первый вес
+        for start_vertex, end_vertex, weight in half_edges:
+            self._graph_dict.setdefault(start_vertex, {}).setdefault(end_vertex, weight)
+
+
+    def add_adjacency(self, adjacency: AdjacencyDict) -> None:
+        for vertex, neighbors in adjacency.items():
+            self._graph_dict.setdefault(vertex, {}).update(neighbors)
+
+
+    def delete_half_edges(self, half_edges: list[tuple]) -> None:
+        for start_vertex, end_vertex in half_edges:
+            neighbors = self._graph_dict.get(start_vertex)
+            if neighbors is not None:
+                neighbors.pop(end_vertex, None)
+
+
+    def pop_vertex(self, vertex: str | int) -> list:
+        if vertex not in self._graph_dict:
+            raise Exception("Вершина ис нот найти", "Нету такой вершины")
+
+        return list(self._graph_dict.pop(vertex))
+
+
+    def has_vertex(self, vertex: str | int) -> bool:
+        return vertex in self._graph_dict
+
+
+    def has_edge(self, start_vertex: str | int, end_vertex: str | int) -> bool:
+        neighbors = self._graph_dict.get(start_vertex)
+        return neighbors is not None and end_vertex in neighbors
+
+
+    def neighbors(self, vertex: str | int) -> dict:
+        return dict(self._graph_dict[vertex])
+
+
+    def vertices(self) -> list:
+        return list(self._graph_dict)
+
+
+    def sizes(self) -> tuple[int, int, int]:
+        """
+        Возвращает (вершины, записи в списках соседей, петли) этой части
+        """
+
+        return (len(self._graph_dict),
+                sum(len(neighbors) for neighbors in self._graph_dict.values()),
+                sum(1 for vertex, neighbors in self._graph_dict.items() if vertex in neighbors))
+
+
+    def bfs_step(self, messages: list[tuple], level: int, expand: bool) -> list[tuple]:
+        """
+        Шаг поуровневого обхода в ширину
+
+        Параметры
+        ---------
+        messages: list[tuple]
+            пары (вершина этой части, родитель), дошедшие до уровня level;
+            на уровне 0 состояние прошлого обхода сбрасывается
+        level: int
+            номер уровня
+        expand: bool
+            отправлять ли соседей новых вершин (False на последнем уровне max_depth)
+
+        Возвращает сообщения (сосед, родитель) для следующего уровня
+        """
+
+        if level == 0:
+            self._distances, self._parents = {}, {}
+
+        frontier = []
+        for vertex, parent in messages:
+            if vertex not in self._distances and vertex in self._graph_dict:
+                self._distances[vertex] = level
+                self._parents[vertex] = parent
+                frontier.append(vertex)
+
+        if not expand:
+            return []
+
+        # соседи из этой же части отсекаются сразу, остальные проверит часть-владелец
+        return [(neighbor, vertex) for vertex in frontier for neighbor in self._graph_dict[vertex]
+                if neighbor not in self._distances]
+
+
+    def bfs_result(self) -> tuple[dict, dict]:
+        return self._distances, self._parents
+
+
+    def components_start(self) -> list[tuple]:
+        """
+        Начало поиска компонент: каждая вершина получает метку (номер части, порядковый номер),
+        метки сравнимы между частями независимо от типов вершин
+
+        Возвращает сообщения (сосед, метка) для всех ребер
+        """
+
+        self._labels = {vertex: (self.shard_id, idx) for idx, vertex in enumerate(self._graph_dict)}
+
+        return [(neighbor, self._labels[vertex])
+                for vertex, neighbors in self._graph_dict.items() for neighbor in neighbors]
+
+
+    def components_step(self, messages: list[tuple]) -> list[tuple]:
+        """
+        Шаг распространения минимальной метки
+
+        Возвращает сообщения (сосед, метка) от вершин, метка которых уменьшилась
+        """
 
-        Возвращает list
+        labels = self._labels
+        changed = set()
+        for vertex, label in messages:
+            if label < labels[vertex]:
+                labels[vertex] = label
+                changed.add(vertex)
+
+        return [(neighbor, labels[vertex]) for vertex in changed for neighbor in self._graph_dict[vertex]]
+
+
+    def components_result(self) -> dict:
+        return self._labels
+
+
+def _serve_shard(connection, shard_id: int) -> None:
+    """
+    Цикл рабочего процесса части графа: принимает (метод, аргументы) по каналу,
+    отвечает ('ok', результат) или ('error', исключение); None завершает процесс
+    """
+
+    shard = GraphShard(shard_id)
+
+    while (request := connection.recv()) is not None:
+        method, args = request
+        try:
+            connection.send(('ok', getattr(shard, method)(*args)))
+        except Exception as error:
+            connection.send(('error', error))
+
+    connection.close()
+
+
+class PartitionedGraph:
+    """
+    Класс PartitionedGraph - граф, вершины которого распределены по нескольким рабочим процессам
+
+    Каждый процесс (GraphShard) хранит соседей только своих вершин, поэтому граф может
+    не помещаться в один процесс. Изменения отправляются части-владельцу вершины,
+    а обход в ширину и поиск компонент связности идут шагами (supersteps):
+    части обрабатывают входящие сообщения одновременно, координатор пересылает
+    исходящие сообщения владельцам по каналам (multiprocessing.Pipe)
+
+    Атрибуты
+        shards: int
+            количество частей (рабочих процессов)
+        partition: str
+            'hash' - часть по хешу вершины, 'range' - по границам bounds
+        bounds: Sequence | None
+            для 'range' - отсортированные границы: вершина v попадает в часть bisect_right(bounds, v)
+    """
+
+    def __init__(self, shards: int = 2, partition: str = 'hash', bounds: Sequence | None = None) -> None:
+        """
+        Метод инициализации пустого распределенного графа, запускает рабочие процессы
+
+        Параметры
+        ---------
+        shards: int
+            количество частей
+        partition: str
+            'hash' (по умолчанию) или 'range'
+        bounds: Sequence | None
+            границы частей для 'range', их shards - 1
 
         Пример использования:
 
-            graph = Graph({'A': ['B', 'C'],
-                           'B': ['A', 'C'],
-                           'C': ['A', 'B']})
-            print(graph.get_adjacency_vertices('B')) # ['A', 'C']
+            with PartitionedGraph(shards=4) as graph:
+                graph.add_edges([('A', 'B'), ('B', 'C'), ('D', 'E')])
+                print(graph.component_count()) # 2
         """
 
-        return [v[0] for v in self._graph_dict[vertex]]
+        if shards < 1:
+            raise Exception("Количество частей должно быть положительным", shards)
+        if partition == 'range':
+            if bounds is None or len(bounds) != shards - 1:
+                raise Exception("Для разбиения по диапазонам нужно shards - 1 границ", bounds)
+        elif partition != 'hash':
+            raise Exception("Неизвестное разбиение", partition)
+
+        self.shards = shards
+        self.partition = partition
+        self.bounds = list(bounds) if bounds is not None else None
+
+        self._connections = []
+        self._processes = []
+        for shard_id in range(shards):
+            connection, worker_connection = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_serve_shard, args=(worker_connection, shard_id), daemon=True)
+            process.start()
+            worker_connection.close()
+            self._connections.append(connection)
+            self._processes.append(process)
+
+
+    @classmethod
+    def from_graph(cls, graph: Graph, shards: int = 2, partition: str = 'hash',
+                   bounds: Sequence | None = None, chunk_size: int = EDGES_CHUNK_SIZE) -> 'PartitionedGraph':
+        """
+        Метод распределения существующего графа по частям
 
+        Словари соседей отправляются частями примерно по chunk_size записей, поэтому
+        координатор не строит вторую полную копию графа. Для графов, не помещающихся
+        в один процесс, используется from_edges с потоком ребер
 
-    def get_addition_graph(self) -> GraphDict:
+        Параметры
+        ---------
+        graph: Graph
+            исходный граф
+        shards, partition, bounds
+            см. __init__
+        chunk_size: int
+            сколько записей соседей накапливать перед отправкой
+
+        Возвращает PartitionedGraph
         """
-        Метод получения дополнение простого графа
 
-        Возвращает GraphDict
+        partitioned = cls(shards, partition, bounds)
+
+        parts: list[dict] = [{} for _ in range(shards)]
+        entries = 0
+        for vertex, neighbors in graph._graph_dict.items():
+            parts[partitioned._owner(vertex)][vertex] = dict(neighbors.items())
+            entries += len(neighbors) + 1
+            if entries >= chunk_size:
+                partitioned._broadcast('add_adjacency', [(part,) for part in parts])
+                parts, entries = [{} for _ in range(shards)], 0
+        partitioned._broadcast('add_adjacency', [(part,) for part in parts])
+
+        return partitioned
+
+
+    @classmethod
+    def from_edges(cls, edges: Iterable[Sequence], shards: int = 2, partition: str = 'hash',
+                   bounds: Sequence | None = None, chunk_size: int = EDGES_CHUNK_SIZE) -> 'PartitionedGraph':
+        """
+        Метод создания распределенного графа из потока ребер (см. add_edges)
+
+        Ребра читаются и отправляются частями, поэтому весь граф ни в одном процессе не собирается
+
+        Параметры
+        ---------
+        edges: Iterable[Sequence]
+            ребра (начало, конец) или (начало, конец, вес), например генератор по файлу
+        shards, partition, bounds
+            см. __init__
+        chunk_size: int
+            сколько ребер отправлять за раз
+
+        Возвращает PartitionedGraph
 
         Пример использования:
 
-            graph = Graph({'A': ['C'],
-                           'B': ['C'],
-                           'C': ['A', 'B']})
-            print(graph.get_addition_graph())
+            graph = PartitionedGraph.from_edges(((i, i + 1) for i in range(10 ** 6)), shards=4)
+        """
+
+        partitioned = cls(shards, partition, bounds)
+        partitioned.add_edges(edges, chunk_size)
 
-            # {'A': ['B'], 'B': ['A'], 'C': []}
+        return partitioned
+
+
+    def _owner(self, vertex: str | int) -> int:
         """
+        Номер части, которой принадлежит вершина
 
-        graph_temp = {}
-        vertices = self.get_vertices()
+        Хеш строк считается через crc32, а не hash(), чтобы не зависеть от PYTHONHASHSEED
 
-        for vertex in vertices:
-            graph_temp[vertex] = list(set(vertices) - set(self.get_graph_not_weight()[vertex]) - set(vertex))
+        Используется только в методах класса
+        """
 
-        return graph_temp
+        if self.partition == 'range':
+            return bisect_right(self.bounds, vertex)
+        if isinstance(vertex, int):
+            return vertex % self.shards
+        if isinstance(vertex, str):
+            return zlib.crc32(vertex.encode()) % self.shards
 
+        return zlib.crc32(repr(vertex).encode()) % self.shards
 
-    def is_addition_graph(self, graph_addition: dict) -> bool:
+
+    def _route(self, messages: Iterable[tuple]) -> list[list]:
         """
-        Метод проверки графа на дополняюший граф
+        Раскладка сообщений (вершина, ...) по частям-владельцам вершин
+
+        Используется только в методах класса
+        """
+
+        routed: list[list] = [[] for _ in range(self.shards)]
+        for message in messages:
+            routed[self._owner(message[0])].append(message)
+
+        return routed
+
+
+    def _receive(self, connection) -> object:
+        status, result = connection.recv()
+        if status == 'error':
+            raise result
+
+        return result
+
+
+    def _call(self, shard_id: int, method: str, *args) -> object:
+        """
+        Вызов метода одной части
+
+        Используется только в методах класса
+        """
+
+        self._connections[shard_id].send((method, args))
+
+        return self._receive(self._connections[shard_id])
+
+
+    def _broadcast(self, method: str, args_list: list[tuple] | None = None) -> list:
+        """
+        Одновременный вызов метода во всех частях: сначала всем отправляются запросы,
+        затем собираются ответы
+
+        Используется только в методах класса
 
         Параметры
         ---------
-        graph_addition: GraphDict
-            граф, который проверяем на дополнение с данным
+        method: str
+            имя метода GraphShard
+        args_list: list[tuple] | None
+            аргументы для каждой части, по умолчанию без аргументов
 
-        Возвращает bool
+        Возвращает список результатов по номерам частей
+        """
 
-        Пример использования:
+        for shard_id, connection in enumerate(self._connections):
+            connection.send((method, args_list[shard_id] if args_list is not None else ()))
 
-            graph = Graph({'A': ['C'],
-                           'B': ['C'],
-                           'C': ['A', 'B']})
-            print(graph.is_addition_graph({'A': ['B'], 'B': ['A'], 'C': []})) # True
+        return [self._receive(connection) for connection in self._connections]
+
+
+    def add_vertex(self, vertex: str | int) -> None:
         """
-        graph_temp = self.get_graph_not_weight()
-        vertices = [v for v in graph_temp]
+        Метод добавления вершины
 
-        for vertex in vertices:
-            if set(graph_addition[vertex]) != (set(vertices) - set(graph_temp[vertex]) - set(vertex)):
-                return False
+        Возвращает None
+        """
 
-        return True
+        self._call(self._owner(vertex), 'add_vertices', [vertex])
 
 
-    def get_adjacency_matrix(self) -> list[list[int]]:
+    def add_edges(self, edges: Iterable[Sequence], chunk_size: int = EDGES_CHUNK_SIZE) -> None:
         """
-        Метод получения матрицы смежности
+        Метод добавления ребер (начало, конец) или (начало, конец, вес)
 
-        Возвращает list[list[int]]
+        Каждое ребро записывается в части обоих концов. Ребра читаются из итерируемого
+        объекта порциями по chunk_size, и каждая порция раскладывается по частям
+        и отправляется до чтения следующей, поэтому в координаторе хранится не больше
+        одной порции
 
-        Пример использования:
+        Параметры
+        ---------
+        edges: Iterable[Sequence]
+            ребра, в том числе генератор
+        chunk_size: int
+            сколько ребер отправлять за раз
 
-            graph = {
-                'A': ['B', 'C'],
-                'B': ['A', 'D', 'E'],
-                'C': ['A', 'F'],
-                'D': ['B'],
-                'E': ['B', 'F'],
-                'F': ['E', 'C'],
-            }
-            print(Graph(graph).get_adjacency_matrix())
+        Возвращает None
+        """
+
+        edges = iter(edges)
 
-            # [[0, 1, 1, 0, 0, 0], [1, 0, 0, 1, 1, 0], [1, 0, 0, 0, 0, 1], [0, 1, 0, 0, 0, 0], [0, 1, 0, 0, 0, 1], [0, 0, 1, 0, 1, 0]]
+        while batch := list(islice(edges, chunk_size)):
+            half_edges = []
+            for edge in batch:
+                start_vertex, end_vertex, weight = edge if len(edge) == 3 else (*edge, 1)
+                half_edges.append((start_vertex, end_vertex, weight))
+                if start_vertex != end_vertex:
+                    half_edges.append((end_vertex, start_vertex, weight))
+
+            self._broadcast('add_half_edges', [(part,) for part in self._route(half_edges)])
+
+
+    def add_edge(self, start_vertex: str | int, end_vertex: str | int, weight: int = 1) -> None:
         """
+        Метод добавления ребра, недостающие вершины добавляются
 
-        matrix = []
-        temp_list = []
+        Возвращает None
+        """
+
+        self.add_edges([(start_vertex, end_vertex, weight)])
 
-        for v1 in self.get_vertices():
-            for v2 in self.get_vertices():
-                v_res = self.find_vertex_list(v1, v2)
-                if v_res:
-                    temp_list.append(v_res[1])
-                else:
-                    temp_list.append(0)
 
-            matrix.append(temp_list)
-            temp_list = []
+    def delete_edge(self, start_vertex: str | int, end_vertex: str | int) -> None:
+        """
+        Метод удаления ребра, отсутствующее ребро пропускается
+
+        Возвращает None
+        """
 
-        return matrix
+        self._broadcast('delete_half_edges', [(part,) for part in self._route(
+            [(start_vertex, end_vertex), (end_vertex, start_vertex)])])
 
 
-    def create_from_adjacency_matrix(self, matrix: list[list[int]]):
+    def delete_vertex(self, vertex_remove: str | int) -> None:
+        """
+        Метод удаления вершины вместе с ребрами
+
+        Возвращает None
+        Вызывает исключение, в случае если вершина не найдена
+        """
+
+        neighbors = self._call(self._owner(vertex_remove), 'pop_vertex', vertex_remove)
+        half_edges = [(neighbor, vertex_remove) for neighbor in neighbors if neighbor != vertex_remove]
+
+        self._broadcast('delete_half_edges', [(part,) for part in self._route(half_edges)])
+
+
+    def has_edge(self, start_vertex: str | int, end_vertex: str | int) -> bool:
+        return self._call(self._owner(start_vertex), 'has_edge', start_vertex, end_vertex)
+
+
+    def get_adjacency_vertices(self, vertex: str | int) -> list:
+        return list(self._call(self._owner(vertex), 'neighbors', vertex))
+
+
+    def get_degree_vertex(self, vertex: str | int) -> int:
+        return len(self._call(self._owner(vertex), 'neighbors', vertex))
+
+
+    def get_vertices(self) -> list:
+        """
+        Метод получения всех вершин, вершины идут по частям
+        """
+
+        return [vertex for part in self._broadcast('vertices') for vertex in part]
+
+
+    @property
+    def num_vertices(self) -> int:
+        return sum(part[0] for part in self._broadcast('sizes'))
+
+
+    @property
+    def num_edges(self) -> int:
+        """
+        Количество ребер неориентированного графа, петля считается один раз
         """
-        Метод создания графа из матрицы смежности
+
+        sizes = self._broadcast('sizes')
+        return (sum(part[1] for part in sizes) + sum(part[2] for part in sizes)) // 2
+
+
+    def bfs_levels(self, start_node: str | int, max_depth: int | None = None) -> tuple[dict, dict]:
+        """
+        Метод поуровневого обхода в ширину шагами по частям
+
+        На каждом шаге части одновременно принимают вершины текущего уровня и отвечают
+        соседями этих вершин, координатор пересылает соседей их владельцам
 
         Параметры
         ---------
-        matrix: list[list[int]]
-            матрица смежности
+        start_node: str | int
+            стартовая вершина
+        max_depth: int | None
+            максимальная глубина обхода, по умолчанию без ограничения
 
-        Возвращает Graph
+        Возвращает кортеж (расстояния, родители) - словари по достигнутым вершинам,
+        как у Graph.shortest_path_lengths(weighted=False)
+        Вызывает исключение, в случае если вершина не найдена
 
         Пример использования:
 
+            with PartitionedGraph.from_graph(Graph({'A': ['B'], 'B': ['A', 'C'], 'C': ['B']})) as graph:
+                print(graph.bfs_levels('A')[0]) # {'A': 0, 'B': 1, 'C': 2}
+        """
 
-            print(Graph().create_from_adjacency_matrix([[0, 1, 1, 0, 0, 0],
-                                                        [1, 0, 0, 1, 1, 0],
-                                                        [1, 0, 0, 0, 0, 1],
-                                                        [0, 1, 0, 0, 0, 0],
-                                                        [0, 1, 0, 0, 0, 1],
-                                                        [0, 0, 1, 0, 1, 0]]))
+        if not self._call(self._owner(start_node), 'has_vertex', start_node):
+            raise Exception("Вершина ис нот найти", "Нету такой вершины")
 
-            # Граф с 6 вершинами и 12 ребрами
+        routed = self._route([(start_node, None)])
+        level = 0
+
+        while True:
+            expand = max_depth is None or level < max_depth
+            outgoing = self._broadcast('bfs_step', [(messages, level, expand) for messages in routed])
+            messages = [message for part in outgoing for message in part]
+            if not messages:
+                break
+
+            routed = self._route(messages)
+            level += 1
+
+        distances, parents = {}, {}
+        for part_distances, part_parents in self._broadcast('bfs_result'):
+            distances.update(part_distances)
+            parents.update(part_parents)
+
+        # порядок как у обхода в ширину: по уровням
+        order = sorted(distances, key=distances.__getitem__)
+        return {vertex: distances[vertex] for vertex in order}, {vertex: parents[vertex] for vertex in order}
+
+
+    def connected_components(self) -> dict:
+        """
+        Метод поиска компонент связности распространением минимальной метки шагами по частям
+
+        Возвращает словарь {вершина: номер компоненты}, номера идут подряд с 0
+
+        Пример использования:
+
+            with PartitionedGraph.from_graph(Graph({'A': ['B'], 'B': ['A'], 'C': []})) as graph:
+                print(graph.connected_components()) # {'A': 0, 'B': 0, 'C': 1}
+        """
+
+        outgoing = self._broadcast('components_start')
+        while messages := [message for part in outgoing for message in part]:
+            outgoing = self._broadcast('components_step', [(part,) for part in self._route(messages)])
+
+        labels = {}
+        for part in self._broadcast('components_result'):
+            labels.update(part)
+
+        numbers = {label: number for number, label in enumerate(sorted(set(labels.values())))}
+        return {vertex: numbers[label] for vertex, label in labels.items()}
+
+
+    def component_count(self) -> int:
+        return len(set(self.connected_components().values()))
+
+
+    def close(self) -> None:
+        """
+        Метод завершения рабочих процессов
+
+        Возвращает None
         """
 
-        vertices = list(string.ascii_uppercase)[:len(matrix)]
+        for connection in self._connections:
+            connection.send(None)
+            connection.close()
+        for process in self._processes:
+            process.join()
 
-        self._graph_dict = {}
-        self.add_vertices(vertices)
+        self._connections, self._processes = [], []
 
-        for vertex_idx in range(len(matrix)):
-            vertex = matrix[vertex_idx]
-            for edge_idx in range(len(vertex)):
-                if vertex[edge_idx]:
-                    self.add_edge(vertices[vertex_idx], vertices[edge_idx], vertex[edge_idx])
 
+    def __enter__(self) -> 'PartitionedGraph':
         return self
 
 
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
     def __str__(self):
-        return f"Граф с {len(self.get_vertices())} вершинами и {len(self.get_edges())} ребрами"
+        sizes = self._broadcast('sizes')
+        return f"Граф с {sum(part[0] for part in sizes)} вершинами и {sum(part[1] for part in sizes)} ребрами"
 
 
-    def __iter__(self):
-        return self
+class AdditionGraphView:
+    """
+    Класс AdditionGraphView - ленивое представление дополнения графа
 
+    Не хранит словарь дополнения, а отвечает на запросы по исходному графу,
+    поэтому всегда соответствует его текущему состоянию
 
-    def __next__(self):
-        if len(self.get_vertices()) == self.curr_idx:
-            raise StopIteration
+    Атрибуты
+        graph: Graph
+            граф, дополнение которого представляется
+    """
 
-        curr = self.get_vertices()[self.curr_idx]
-        self.curr_idx += 1
-        return curr
\ No newline at end of file
+    def __init__(self, graph: Graph) -> None:
+        """
+        Метод инициализации представления
+
+        Параметры
+        ---------
+        graph: Graph
+            исходный граф
+        """
+
+        self._graph = graph
+
+
+    def get_vertices(self) -> list[str | int]:
+        """
+        Метод получения всех вершин (совпадают с вершинами исходного графа)
+
+        Возвращает список вершин
+        """
+
+        return self._graph.get_vertices()
+
+
+    def has_edge(self, start_vertex: str | int, end_vertex: str | int) -> bool:
+        """
+        Метод проверки ребра дополнения за O(1)
+
+        Параметры
+        ---------
+        start_vertex: str | int
+            начальная вершина ребра
+        end_vertex: str | int
+            конечная вершина ребра
+
+        Возвращает bool
+        """
+
+        adjacency = self._graph._graph_dict
+        return start_vertex != end_vertex and start_vertex in adjacency and end_vertex in adjacency \
+            and end_vertex not in adjacency[start_vertex]
+
+
+    def get_degree_vertex(self, vertex: str | int) -> int:
+        """
+        Метод получения степени вершины в дополнении за O(1)
+
+        Параметры
+        ---------
+        vertex: str | int
+            вершина
+
+        Возвращает int
+        """
+
+        neighbors = self._graph._graph_dict[vertex]
+        return len(self._graph._graph_dict) - 1 - len(neighbors) + (vertex in neighbors)
+
+
+    def get_adjacency_vertices(self, vertex: str | int) -> list[str | int]:
+        """
+        Метод получения смежных вершин в дополнении: строится только битовая строка
+        этой вершины (см. Graph._addition_row), битовая матрица всего графа не нужна
+
+        Параметры
+        ---------
+        vertex: str | int
+            вершина
+
+        Возвращает list
+        """
+
+        return self._graph._addition_row(vertex)
+
+
+    def __contains__(self, vertex: str | int) -> bool:
+        return vertex in self._graph._graph_dict
+
+
+    def __getitem__(self, vertex: str | int) -> list[str | int]:
+        return self.get_adjacency_vertices(vertex)
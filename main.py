@@ -7,6 +7,10 @@ from design import Ui_MainWindow
 from graph import Graph 
 
 
+MATRIX_FILTER = "Матрица смежности (*.txt)"
+EDGE_LIST_FILTER = "Список ребер (*.edges)"
+FILE_FILTERS = f"{MATRIX_FILTER};;{EDGE_LIST_FILTER}"
+
 
 class GraphWindow(QMainWindow, Ui_MainWindow):
     """Класс окна приложения"""
@@ -46,21 +50,28 @@ class GraphWindow(QMainWindow, Ui_MainWindow):
 
 
     def importGraph(self):
-        fileName = QFileDialog.getOpenFileName(self, caption="Льал")
+        fileName = QFileDialog.getOpenFileName(self, caption="Льал", filter=FILE_FILTERS)
         if fileName[0]:
-            with open(fileName[0], 'r') as file:
-                self._graph.create_from_adjacency_matrix(
-                    matrix=[list(map(int, line.split(' '))) for line in file.readlines()]
-                )
-                self.updateGraph()
+            # список ребер читается потоково, матрица смежности - кусками строк;
+            # при ошибке в файле граф не изменяется
+            try:
+                if fileName[1] == EDGE_LIST_FILTER:
+                    self._graph.read_edge_list(fileName[0], use_mmap=True)
+                else:
+                    self._graph.read_adjacency_matrix(fileName[0], use_mmap=True)
+            except Exception as error:
+                QMessageBox.warning(self, "Ошибка импорта", str(error))
+                return
+            self.updateGraph()
 
 
     def exportGraph(self):
-        fileName = QFileDialog.getSaveFileName(self, caption="Льал")
+        fileName = QFileDialog.getSaveFileName(self, caption="Льал", filter=FILE_FILTERS)
         if fileName[0]:
-            with open(fileName[0], 'w') as file:
-                for row in self._graph.get_adjacency_matrix():
-                    print(*row, file=file)
+            if fileName[1] == EDGE_LIST_FILTER:
+                self._graph.write_edge_list(fileName[0])
+            else:
+                self._graph.write_adjacency_matrix(fileName[0])
 
 
     def add_vertex(self):
@@ -105,24 +116,13 @@ class GraphWindow(QMainWindow, Ui_MainWindow):
         
         B = nx.Graph()
 
-        _graph_dict = self._graph._graph_dict
-
-        # Составление графа в зависимости от его типа
-        if type(_graph_dict[list(_graph_dict.keys())[0]][0]) == list:
-
-            for node, edges in _graph_dict.items():
-                B.add_node(node)
-
-                for neighbor, weight in edges:
-                    B.add_node(neighbor)
-                    B.add_edge(node, neighbor, weight=weight)
-                
-        else:
+        # Составление графа по словарю смежности {вершина: {сосед: вес}}
+        for node, edges in self._graph._graph_dict.items():
+            B.add_node(node)
 
-            for node, edges in _graph_dict.items():
-                for neighbor in edges:
-                    B.add_edge(node, neighbor)
-   
+            for neighbor, weight in edges.items():
+                B.add_node(neighbor)
+                B.add_edge(node, neighbor, weight=weight)
 
         pos = nx.spring_layout(B)  # Позиционирование
 
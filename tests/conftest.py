@@ -0,0 +1,78 @@
+import os
+import random
+import sys
+from collections import deque
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from graph import Graph
+
+
+def adjacency(graph: Graph) -> dict:
+    """Граф как словарь {вершина: {сосед: вес}} для сравнения"""
+
+    return {vertex: dict(neighbors) for vertex, neighbors in graph.get_graph_weighted().items()}
+
+
+def random_edges(rng: random.Random, vertices_count: int, probability: float,
+                 max_weight: int = 1) -> list[tuple[int, int, int]]:
+    """Случайные ребра без петель между вершинами 0..vertices_count - 1"""
+
+    return [(start, end, rng.randint(1, max_weight))
+            for start in range(vertices_count)
+            for end in range(start + 1, vertices_count)
+            if rng.random() < probability]
+
+
+def build_graph(vertices_count: int, edges: list[tuple[int, int, int]]) -> Graph:
+    """Граф с вершинами 0..vertices_count - 1 (в том числе изолированными) и ребрами edges"""
+
+    graph = Graph()
+    graph.add_vertices(list(range(vertices_count)))
+    for start, end, weight in edges:
+        graph.add_edge(start, end, weight)
+    return graph
+
+
+def hop_distances(graph: Graph, start) -> dict:
+    """{вершина: число ребер от start} обходом в ширину по словарю"""
+
+    distances = {start: 0}
+    queue = deque([start])
+    while queue:
+        vertex = queue.popleft()
+        for neighbor in graph.get_adjacency_vertices(vertex):
+            if neighbor not in distances:
+                distances[neighbor] = distances[vertex] + 1
+                queue.append(neighbor)
+    return distances
+
+
+def weighted_distances(graph: Graph) -> dict:
+    """Флойд-Уоршелл по словарю"""
+
+    vertices = graph.get_vertices()
+    distances = {(u, v): 0 if u == v else graph.get_edge_weight(u, v) for u in vertices for v in vertices}
+    distances = {pair: float('inf') if weight is None else weight for pair, weight in distances.items()}
+    for middle in vertices:
+        for u in vertices:
+            for v in vertices:
+                if distances[u, middle] + distances[middle, v] < distances[u, v]:
+                    distances[u, v] = distances[u, middle] + distances[middle, v]
+    return distances
+
+
+@pytest.fixture
+def random_graphs():
+    """Фабрика небольших случайных графов: random_graphs(количество, max_vertices, max_weight)"""
+
+    def generate(count: int, max_vertices: int = 7, max_weight: int = 1, seed: int = 0):
+        rng = random.Random(seed)
+        for _ in range(count):
+            vertices_count = rng.randint(1, max_vertices)
+            edges = random_edges(rng, vertices_count, rng.uniform(0.2, 0.8), max_weight)
+            yield build_graph(vertices_count, edges)
+
+    return generate
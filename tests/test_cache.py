@@ -0,0 +1,116 @@
+import random
+
+import numpy as np
+import pytest
+
+from conftest import build_graph, random_edges
+from graph import Graph, QueryCache, _estimate_size
+
+
+def results(graph: Graph) -> list:
+    return [
+        graph.shortest_path('A', 'C'),
+        graph.shortest_path('A', 'C', weighted=True),
+        graph.get_edges(),
+        graph.get_edges(weights=False),
+        graph.get_addition_graph(),
+        graph.get_adjacency_matrix(),
+        graph.get_adjacency_matrix(as_array=True),
+    ]
+
+
+def test_query_results_are_immutable_with_and_without_cache():
+    graph = Graph({'A': [['B', 1]], 'B': [['A', 1], ['C', 2]], 'C': [['B', 2]], 'D': []})
+    uncached = results(graph)
+
+    graph.enable_cache()
+    first, second = results(graph), results(graph)
+    assert graph.cache_stats()['hits'] == len(first)
+
+    for before, cached, hit in zip(uncached, first, second):
+        # попадание отдает сохраненный объект без копии
+        assert hit is cached
+        if isinstance(cached, np.ndarray):
+            assert np.array_equal(before, cached)
+            with pytest.raises(ValueError):
+                before[0, 0] = 5
+            with pytest.raises(ValueError):
+                cached[0, 0] = 5
+        else:
+            assert before == cached
+
+    path, (weighted_path, _), edges, _, addition, matrix, _ = first
+    assert path == ('A', 'B', 'C') and weighted_path == ('A', 'B', 'C')
+    assert edges[0] == (('A', 'B'), 1)
+    assert addition['A'] == ('C', 'D')
+    assert matrix[1] == (1, 0, 2, 0)
+    with pytest.raises(TypeError):
+        addition['A'] = ()
+    assert Graph(addition).get_adjacency_vertices('D') == ['A', 'B', 'C']
+
+
+def test_cache_drops_results_after_mutation():
+    graph = Graph({'A': [['B', 1]], 'B': [['A', 1], ['C', 2]], 'C': [['B', 2]]})
+    graph.enable_cache()
+
+    assert graph.shortest_path('A', 'C') == ('A', 'B', 'C')
+    graph.add_edge('A', 'C')
+    assert graph.shortest_path('A', 'C') == ('A', 'C')
+    assert graph.get_adjacency_matrix(as_array=True)[0, 2] == 1
+
+    stats = graph.cache_stats()
+    assert (stats['hits'], stats['misses'], stats['entries']) == (0, 3, 2)
+
+    graph.disable_cache()
+    assert graph.cache_stats() is None
+
+
+def test_cache_evicts_least_recently_used_entries():
+    graph = build_graph(6, [(i, i + 1, 1) for i in range(5)])
+    graph.enable_cache(max_entries=2)
+
+    graph.shortest_path(0, 5)
+    graph.shortest_path(0, 4)
+    graph.shortest_path(0, 5)
+    graph.shortest_path(0, 3)
+    assert graph.cache_stats() == {'hits': 1, 'misses': 3, 'evictions': 1, 'entries': 2, 'bytes': 0}
+
+    # вытеснен давно не использованный (0, 4), а (0, 5) остался
+    graph.shortest_path(0, 5)
+    graph.shortest_path(0, 4)
+    assert graph.cache_stats()['hits'] == 2 and graph.cache_stats()['misses'] == 4
+
+    with pytest.raises(Exception):
+        QueryCache(max_entries=0)
+
+
+def test_cache_keeps_results_within_memory_budget():
+    small_bytes = _estimate_size(np.zeros(10))
+    cache = QueryCache(max_bytes=small_bytes * 2)
+
+    def query(key: str, value: np.ndarray) -> bool:
+        found, _ = cache.get(key, 0)
+        if not found:
+            cache.put(key, value)
+        return found
+
+    # результат больше всего бюджета не сохраняется и ничего не вытесняет
+    query('first', np.zeros(10))
+    query('large', np.zeros(1000))
+    assert query('first', np.zeros(10)) and not query('large', np.zeros(1000))
+
+    # третий результат вытесняет давно не использованный, чтобы уложиться в бюджет
+    query('second', np.ones(10))
+    query('first', np.zeros(10))
+    query('third', np.ones(10))
+    assert cache.stats() == {'hits': 2, 'misses': 5, 'evictions': 1, 'entries': 2, 'bytes': small_bytes * 2}
+    assert query('first', np.zeros(10)) and query('third', np.ones(10)) and not query('second', np.ones(10))
+
+
+def test_cache_size_estimate_counts_nested_results():
+    graph = build_graph(40, random_edges(random.Random(3), 40, 0.3, 5))
+    matrix = graph.get_adjacency_matrix(as_array=True)
+
+    assert matrix.nbytes < _estimate_size(matrix) < matrix.nbytes + 1024
+    assert _estimate_size(graph.get_addition_graph()) > _estimate_size(dict(graph.get_addition_graph())) // 2
+    assert _estimate_size(graph.get_adjacency_matrix()) > 40 * 40 * 8
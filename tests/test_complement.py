@@ -0,0 +1,61 @@
+import random
+
+from conftest import build_graph, random_edges
+from graph import CSRGraph
+
+
+def complement_brute(graph) -> dict:
+    vertices = graph.get_vertices()
+    return {vertex: sorted((other for other in vertices if other != vertex and not graph.has_edge(vertex, other)),
+                           key=repr)
+            for vertex in vertices}
+
+
+def test_addition_graph_and_view_match_brute_force(random_graphs):
+    rng = random.Random(19)
+    for graph in random_graphs(80, max_vertices=12, seed=19):
+        graph.add_edge(0, 0)
+        expected = complement_brute(graph)
+
+        addition = graph.get_addition_graph()
+        assert {vertex: sorted(neighbors, key=repr) for vertex, neighbors in addition.items()} == expected
+        assert graph.is_addition_graph(addition)
+
+        for source in (graph, CSRGraph.from_graph(graph)):
+            view = source.get_addition_view()
+            assert sorted(view.get_vertices(), key=repr) == sorted(expected, key=repr)
+            for vertex, neighbors in expected.items():
+                assert sorted(view.get_adjacency_vertices(vertex), key=repr) == neighbors
+                assert view.get_degree_vertex(vertex) == len(neighbors)
+                other = rng.choice(graph.get_vertices())
+                assert view.has_edge(vertex, other) == (other in neighbors)
+
+
+def test_is_addition_graph_rejects_wrong_complements():
+    rng = random.Random(20)
+    for _ in range(100):
+        vertices_count = rng.randint(2, 9)
+        graph = build_graph(vertices_count, random_edges(rng, vertices_count, 0.5))
+        addition = {vertex: list(neighbors) for vertex, neighbors in complement_brute(graph).items()}
+
+        start, end = rng.sample(range(vertices_count), 2)
+        if end in addition[start]:
+            addition[start].remove(end)
+            addition[end].remove(start)
+        else:
+            addition[start].append(end)
+            addition[end].append(start)
+        assert not graph.is_addition_graph(addition)
+        assert not graph.is_addition_graph({**addition, 'extra': []})
+
+
+def test_addition_view_follows_mutations():
+    graph = build_graph(4, [(0, 1, 1)])
+    view = graph.get_addition_view()
+    assert sorted(view.get_adjacency_vertices(0)) == [2, 3]
+
+    graph.add_edge(0, 2)
+    graph.add_vertex(4)
+    assert sorted(view.get_adjacency_vertices(0)) == [3, 4]
+    graph.delete_vertex(3)
+    assert sorted(view.get_adjacency_vertices(0)) == [4]
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from conftest import adjacency
+from graph import CSRGraph, Graph
+
+
+def test_csr_graph_matches_graph(random_graphs):
+    for graph in random_graphs(50, max_weight=7, seed=40):
+        csr = CSRGraph.from_graph(graph)
+        vertices = graph.get_vertices()
+
+        assert adjacency(csr) == adjacency(graph)
+        assert csr.num_edges == graph.num_edges
+        assert csr.degree_histogram() == graph.degree_histogram()
+        assert csr.component_count() == graph.component_count()
+        assert np.array_equal(csr.get_adjacency_matrix(as_array=True), graph.get_adjacency_matrix(as_array=True))
+        assert csr.get_adjacency_matrix() == graph.get_adjacency_matrix()
+        for start in vertices:
+            assert sorted(csr.bfs(start)) == sorted(graph.bfs(start))
+            for finish in vertices:
+                assert csr.has_edge(start, finish) == graph.has_edge(start, finish)
+                assert csr.get_edge_weight(start, finish) == graph.get_edge_weight(start, finish)
+                assert csr.connected(start, finish) == graph.connected(start, finish)
+                assert csr.shortest_path(start, finish, weighted=True) == graph.shortest_path(start, finish, True)
+
+
+def test_csr_is_read_only_and_forks():
+    csr = CSRGraph.from_graph(Graph({'A': [['B', 2]], 'B': [['C', 3]]}))
+    with pytest.raises(Exception):
+        csr.add_edge('A', 'C')
+
+    fork = csr.fork()
+    fork.add_edge('A', 'C')
+    assert fork.has_edge('A', 'C') and not csr.has_edge('A', 'C')
+    assert csr.get_graph_weighted()['B'] == [['A', 2], ['C', 3]]
+
+
+@pytest.mark.parametrize('weight', [1, 2 ** 40, 0.5])
+def test_csr_snapshot_save_round_trip(tmp_path, random_graphs, weight):
+    for number, graph in enumerate(random_graphs(20, max_weight=5, seed=43)):
+        graph.add_edge(0, 0, weight)
+        csr = CSRGraph.from_graph(graph)
+        # суженные массивы снимка пишутся в файл в типах формата
+        assert csr.indices.dtype == np.int32
+
+        path = tmp_path / f'graph{number}.bin'
+        csr.save(path)
+        expected = adjacency(graph)
+        for loaded in (Graph.load(path, mmap=False), Graph.load(path), CSRGraph.load(path, mmap=False)):
+            assert adjacency(loaded) == expected
+            assert loaded.num_edges == graph.num_edges and loaded.max_degree == graph.max_degree
+            assert all(type(value) is type(weight) for _, value in loaded.get_edges() if value == weight)
+
+        CSRGraph.load(path).save(tmp_path / 'again.bin')
+        assert (tmp_path / 'again.bin').read_bytes() == path.read_bytes()
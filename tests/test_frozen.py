@@ -0,0 +1,79 @@
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from conftest import adjacency, build_graph, random_edges
+from graph import CSRGraph, FrozenGraph
+
+
+def test_freeze_snapshot_is_isolated(random_graphs):
+    rng = random.Random(41)
+    for graph in random_graphs(30, seed=41):
+        snapshot = graph.freeze()
+        expected = adjacency(graph)
+        vertices = graph.get_vertices()
+        for _ in range(10):
+            graph.add_edge(rng.choice(vertices), rng.randrange(10), rng.randint(2, 5))
+        graph.delete_vertex(rng.choice(graph.get_vertices()))
+
+        assert isinstance(snapshot, FrozenGraph) and snapshot.freeze() is snapshot
+        assert adjacency(snapshot) == expected
+        fork = snapshot.fork()
+        fork.add_vertex('new')
+        assert adjacency(snapshot) == expected
+        with pytest.raises(Exception):
+            snapshot.add_edge(0, 1)
+        with pytest.raises(Exception):
+            snapshot.enable_cache()
+
+
+@pytest.mark.parametrize('make_snapshot', [lambda graph: graph.freeze(), CSRGraph.from_graph])
+def test_snapshot_reads_from_many_threads(make_snapshot):
+    rng = random.Random(42)
+    graph = build_graph(300, random_edges(rng, 300, 0.004, 5))
+    # удаление делает систему множеств устаревшей: ее строит первый запрос к снимку
+    graph.delete_vertex(299)
+    expected_components = graph.component_count()
+    pairs = [(rng.randrange(299), rng.randrange(299)) for _ in range(200)]
+    expected_connected = [graph.connected(start, end) for start, end in pairs]
+
+    snapshot = make_snapshot(graph)
+
+    def read(worker: int) -> tuple:
+        connected = [snapshot.connected(start, end) for start, end in pairs]
+        distances, _ = snapshot.all_pairs_distances()
+        addition = snapshot.get_addition_view().get_adjacency_vertices(worker)
+        levels = snapshot.bfs_levels(worker)
+        return connected, snapshot.component_count(), distances, snapshot._csr_view(), addition, levels
+
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(read, range(32)))
+
+    uf_parent = dict(snapshot._uf_parent)
+    for worker, (connected, components, distances, csr, addition, levels) in enumerate(results):
+        assert connected == expected_connected and components == expected_components
+        # ленивые кэши заполнены один раз: все потоки получили одни и те же объекты
+        assert distances is results[0][2] and csr is results[0][3]
+        assert sorted(addition) == sorted(vertex for vertex in graph.get_vertices()
+                                          if vertex != worker and not graph.has_edge(worker, vertex))
+        assert levels[0].tolist() == graph.bfs_levels(worker)[0].tolist()
+
+    # поиск представителя в снимке не сжимает пути
+    for start, end in pairs:
+        snapshot.connected(start, end)
+    assert snapshot._uf_parent == uf_parent
+
+
+def test_snapshot_find_root_does_not_compress_paths():
+    graph = build_graph(64, [])
+    # слияния множеств равного размера дают деревья глубины log V, система множеств копируется в снимок
+    for step in (1, 2, 4, 8, 16, 32):
+        for vertex in range(0, 64, 2 * step):
+            graph.add_edge(vertex, vertex + step)
+    snapshot = graph.freeze()
+    uf_parent = dict(snapshot._uf_parent)
+    assert any(uf_parent[parent] != parent for parent in uf_parent.values())
+
+    assert all(snapshot.connected(0, vertex) for vertex in range(64))
+    assert snapshot._uf_parent == uf_parent
@@ -0,0 +1,231 @@
+import random
+from collections import Counter
+
+import pytest
+
+from conftest import adjacency
+from graph import Graph, GraphEventKind
+
+
+def test_edge_operations_match_reference():
+    rng = random.Random(1)
+    graph, reference = Graph(), {}
+    for _ in range(2000):
+        start, end = rng.randrange(12), rng.randrange(12)
+        action = rng.randrange(4)
+        if action == 0:
+            weight = rng.randint(1, 9)
+            graph.add_edge(start, end, weight)
+            reference.setdefault(start, {})
+            reference.setdefault(end, {})
+            if end not in reference[start]:
+                reference[start][end] = reference[end][start] = weight
+        elif action == 1:
+            graph.delete_edge(start, end)
+            if start in reference and end in reference[start]:
+                del reference[start][end]
+                reference[end].pop(start, None)
+        elif action == 2 and graph.has_edge(start, end):
+            weight = rng.randint(1, 9)
+            graph.set_edge_weight(start, end, weight)
+            reference[start][end] = reference[end][start] = weight
+        else:
+            expected = reference.get(start, {}).get(end)
+            assert graph.has_edge(start, end) == (expected is not None)
+            assert graph.get_edge_weight(start, end) == expected
+            if start in reference:
+                assert graph.find_vertex_list(start, end) == (None if expected is None else [end, expected])
+
+    assert adjacency(graph) == reference
+
+
+def test_delete_missing_edge_keeps_graph_and_snapshot_sharing():
+    graph = Graph({'A': ['B'], 'B': ['A'], 'C': []})
+    snapshot = graph.freeze()
+
+    graph.delete_edge('A', 'C')
+    graph.delete_edge('A', 'D')
+    assert adjacency(graph) == {'A': {'B': 1}, 'B': {'A': 1}, 'C': {}}
+    assert graph.num_edges == 1
+    # словари соседей остались общими со снимком: копирования при записи не было
+    assert graph._graph_dict['A'] is snapshot._graph_dict['A']
+    assert graph._graph_dict['C'] is snapshot._graph_dict['C']
+
+
+def test_delete_vertices_match_reference(random_graphs):
+    rng = random.Random(2)
+    for graph in random_graphs(60, max_vertices=9, seed=2):
+        graph.add_edge(0, 0)
+        reference = adjacency(graph)
+        removed = rng.sample(graph.get_vertices(), rng.randint(1, graph.num_vertices))
+        if len(removed) == 1:
+            graph.delete_vertex(removed[0])
+        else:
+            graph.delete_vertices(removed)
+
+        expected = {vertex: {neighbor: weight for neighbor, weight in neighbors.items() if neighbor not in removed}
+                    for vertex, neighbors in reference.items() if vertex not in removed}
+        assert adjacency(graph) == expected
+
+
+def test_delete_missing_vertices_keeps_graph():
+    graph = Graph({'A': ['B'], 'B': ['A', 'C'], 'C': ['B']})
+    for delete in (lambda: graph.delete_vertex('D'), lambda: graph.delete_vertices(['A', 'D'])):
+        with pytest.raises(Exception):
+            delete()
+        assert adjacency(graph) == {'A': {'B': 1}, 'B': {'A': 1, 'C': 1}, 'C': {'B': 1}}
+
+
+def reference_components(graph: Graph) -> dict:
+    """{вершина: номер компоненты} обходом по словарю смежности"""
+
+    labels = {}
+    for vertex in graph.get_vertices():
+        if vertex in labels:
+            continue
+        labels[vertex] = vertex
+        stack = [vertex]
+        while stack:
+            for neighbor in graph.get_adjacency_vertices(stack.pop()):
+                if neighbor not in labels:
+                    labels[neighbor] = vertex
+                    stack.append(neighbor)
+    return labels
+
+
+def check_components(graph: Graph, rng: random.Random) -> None:
+    labels = reference_components(graph)
+    vertices = graph.get_vertices()
+
+    assert graph.component_count() == len(set(labels.values()))
+    for _ in range(10):
+        start, end = rng.choice(vertices), rng.choice(vertices)
+        assert graph.connected(start, end) == (labels[start] == labels[end])
+        assert (graph.component_of(start) == graph.component_of(end)) == (labels[start] == labels[end])
+
+
+def mutate(graph: Graph, rng: random.Random) -> None:
+    vertices = graph.get_vertices()
+    edges = graph.get_edges(weights=False)
+    action = rng.randrange(8)
+
+    if action == 0 or not vertices:
+        graph.add_vertex(rng.randrange(30))
+    elif action in (1, 2):
+        graph.add_edge(rng.choice(vertices), rng.randrange(30), rng.randint(1, 9))
+    elif action == 3:
+        vertex = rng.choice(vertices)
+        graph.add_edge(vertex, vertex)
+    elif action == 4 and edges:
+        graph.delete_edge(*rng.choice(edges))
+    elif action == 5:
+        graph.delete_vertex(rng.choice(vertices))
+    elif action == 6:
+        graph.delete_vertices(rng.sample(vertices, min(len(vertices), 2)))
+    elif action == 7:
+        graph.add_edges([(rng.randrange(30), rng.randrange(30), rng.randint(1, 9)) for _ in range(3)])
+
+
+def test_union_find_follows_mutations():
+    rng = random.Random(20)
+    for _ in range(30):
+        graph = Graph()
+        for _ in range(150):
+            mutate(graph, rng)
+            # система множеств то перестраивается, то обновляется после изменений
+            if rng.random() < 0.3 and graph.num_vertices:
+                check_components(graph, rng)
+
+
+def test_union_find_is_maintained_from_construction():
+    for graph in (Graph(), Graph({'A': ['B'], 'B': ['A'], 'C': []})):
+        graph.add_edge('A', 'D')
+        graph.add_vertex('E')
+        graph.add_edges([('F', 'G', 2)])
+        # ни одного запроса о компонентах не было, а система множеств уже актуальна
+        assert graph._uf_version == graph._version
+        assert graph.shortest_path('A', 'E') is None
+        assert graph.shortest_path('A', 'D') == ('A', 'D')
+        check_components(graph, random.Random(0))
+
+
+def check_counters(graph: Graph) -> None:
+    edges = {frozenset((start, end)) for start, end in graph.get_edges(weights=False)}
+    degrees = [graph.get_degree_vertex(vertex) for vertex in graph.get_vertices()]
+
+    assert graph.num_vertices == len(degrees)
+    assert graph.num_edges == len(edges)
+    assert graph.max_degree == max(degrees, default=0)
+    assert graph.degree_histogram() == dict(sorted(Counter(degrees).items()))
+    # строка графа считает ребра по записям в списках соседей, как до счетчиков
+    assert str(graph) == f"Граф с {len(graph.get_vertices())} вершинами и {len(graph.get_edges())} ребрами"
+
+
+def test_counters_follow_mutations():
+    rng = random.Random(21)
+    for _ in range(30):
+        graph = Graph()
+        for _ in range(150):
+            mutate(graph, rng)
+            check_counters(graph)
+
+
+def test_counters_after_set_edge_weight_and_snapshot():
+    rng = random.Random(22)
+    graph = Graph()
+    for _ in range(200):
+        mutate(graph, rng)
+
+    snapshot = graph.freeze()
+    frozen_edges = sorted(map(str, snapshot.get_edges()))
+    for start, end in graph.get_edges(weights=False)[:10]:
+        graph.set_edge_weight(start, end, 100)
+    for _ in range(100):
+        mutate(graph, rng)
+        check_counters(graph)
+
+    check_counters(snapshot)
+    check_components(snapshot, rng)
+    assert sorted(map(str, snapshot.get_edges())) == frozen_edges
+
+
+def test_str_counts_adjacency_entries():
+    graph = Graph({'A': ['B', 'A'], 'B': ['A'], 'C': []})
+    assert str(graph) == "Граф с 3 вершинами и 3 ребрами"
+    assert str(Graph()) == "Граф с 0 вершинами и 0 ребрами"
+
+
+def test_events_for_each_mutation(tmp_path):
+    graph, events = Graph(), []
+    graph.subscribe(events.append)
+    graph.add_vertex('A')
+    graph.add_edge('A', 'B', 2)
+    graph.set_edge_weight('A', 'B', 5)
+    graph.delete_edge('A', 'C')
+    graph.delete_edge('A', 'B')
+    graph.write_edge_list(tmp_path / 'graph.txt')
+    graph.read_edge_list(tmp_path / 'graph.txt')
+    graph.unsubscribe(events.append)
+    graph.add_vertex('D')
+
+    assert [(event.kind, event.start_vertex, event.end_vertex, event.weight) for event in events] == [
+        (GraphEventKind.VERTEX_ADDED, 'A', None, None),
+        (GraphEventKind.VERTEX_ADDED, 'B', None, None),
+        (GraphEventKind.EDGE_ADDED, 'A', 'B', 2),
+        (GraphEventKind.EDGE_REWEIGHTED, 'A', 'B', 5),
+        (GraphEventKind.EDGE_REMOVED, 'A', 'B', 5),
+        (GraphEventKind.GRAPH_RESET, None, None, None),
+    ]
+    # каждое событие несет новую версию графа, удаление несуществующего ребра событий не дает
+    assert [event.version for event in events] == list(range(1, len(events) + 1))
+
+
+def test_events_for_vertex_removal():
+    graph = Graph({'A': ['B', 'C'], 'B': ['A'], 'C': ['A']})
+    events = []
+    graph.subscribe(events.append)
+    graph.delete_vertex('A')
+
+    kinds = [event.kind for event in events]
+    assert kinds == [GraphEventKind.EDGE_REMOVED, GraphEventKind.EDGE_REMOVED, GraphEventKind.VERTEX_REMOVED]
+    assert {(event.start_vertex, event.end_vertex) for event in events[:2]} == {('A', 'B'), ('A', 'C')}
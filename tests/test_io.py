@@ -0,0 +1,312 @@
+import random
+
+import numpy as np
+import pytest
+
+from conftest import adjacency
+from graph import CSRGraph, Graph
+
+
+def sequential_graph(edges) -> Graph:
+    """Граф, построенный по одному ребру через add_edge"""
+
+    graph = Graph()
+    for edge in edges:
+        graph.add_edge(*edge)
+    return graph
+
+
+def test_add_edges_matches_add_edge():
+    rng = random.Random(12)
+    for _ in range(50):
+        edges = [(rng.randrange(15), rng.randrange(15), rng.randint(1, 9)) for _ in range(rng.randint(0, 40))]
+        expected = adjacency(sequential_graph(edges))
+
+        for chunk_size in (1, 7, 1000):
+            assert adjacency(Graph.from_edges(edges, chunk_size)) == expected
+            assert adjacency(Graph.from_edges(iter(edges), chunk_size)) == expected
+
+        graph = sequential_graph(edges[:10])
+        graph.add_edges(edges[10:])
+        assert adjacency(graph) == expected
+        assert graph.num_edges == len({frozenset(edge[:2]) for edge in edges})
+
+
+def test_from_edges_numpy_input():
+    rng = np.random.default_rng(13)
+    for _ in range(30):
+        pairs = rng.integers(0, 20, size=(rng.integers(1, 60), 2))
+        weights = rng.integers(1, 9, size=(len(pairs), 1))
+
+        expected = adjacency(sequential_graph(pairs.tolist()))
+        for chunk_size in (1, 5, 1000):
+            graph = Graph.from_edges(pairs, chunk_size)
+            assert adjacency(graph) == expected
+            assert all(type(vertex) is int for vertex in graph.get_vertices())
+
+        weighted = np.hstack([pairs, weights])
+        assert adjacency(Graph.from_edges(weighted)) == adjacency(sequential_graph(weighted.tolist()))
+
+        halves = np.hstack([pairs, weights / 2])
+        graph = Graph.from_edges(halves)
+        assert all(type(vertex) is int for vertex in graph.get_vertices())
+        assert adjacency(graph) == adjacency(sequential_graph((start, end, weight / 2) for start, end, weight
+                                                              in weighted.tolist()))
+
+
+def test_from_edges_rejects_bad_arrays():
+    with pytest.raises(Exception):
+        Graph.from_edges(np.zeros((3, 4)))
+    with pytest.raises(Exception):
+        Graph.from_edges(np.array([[0.5, 1.0, 2.0]]))
+
+
+def test_adjacency_sparse_matches_graph(random_graphs):
+    for graph in random_graphs(50, max_weight=9, seed=14):
+        indptr, indices, weights, vertices = graph.get_adjacency_sparse()
+        rows, coo_indices, coo_weights, coo_vertices = graph.get_adjacency_sparse('coo')
+
+        assert vertices == coo_vertices == graph.get_vertices()
+        assert indptr.dtype == indices.dtype == weights.dtype == np.int64
+        assert indptr[0] == 0 and indptr[-1] == len(indices) == 2 * graph.num_edges
+        assert np.array_equal(indices, coo_indices) and np.array_equal(weights, coo_weights)
+        assert np.array_equal(rows, np.repeat(np.arange(len(vertices)), np.diff(indptr)))
+
+        rebuilt = {vertex: {vertices[column]: weight for column, weight
+                            in zip(indices[indptr[row]:indptr[row + 1]].tolist(),
+                                   weights[indptr[row]:indptr[row + 1]].tolist())}
+                   for row, vertex in enumerate(vertices)}
+        assert rebuilt == adjacency(graph)
+
+        matrix = graph.get_adjacency_matrix(as_array=True)
+        assert np.array_equal(matrix[rows, indices], weights)
+        assert np.count_nonzero(matrix) == len(indices)
+
+
+def test_adjacency_sparse_weight_types():
+    big = 2 ** 60 + 1
+    graph = Graph({'A': [['B', big]], 'B': [['C', 2]]})
+    weights = graph.get_adjacency_sparse()[2]
+    assert weights.dtype == np.int64 and big in weights.tolist()
+
+    graph.add_edge('C', 'D', 0.5)
+    assert graph.get_adjacency_sparse()[2].dtype == np.float64
+
+    huge = Graph({'A': [['B', 2 ** 70]]}).get_adjacency_sparse()[2]
+    assert huge.dtype == np.float64 and huge[0] == 2.0 ** 70
+
+    with pytest.raises(Exception):
+        graph.get_adjacency_sparse('csc')
+
+
+def matrix_reference(matrix, labels) -> dict:
+    """Граф по матрице смежности через add_edge по ячейкам в порядке строк"""
+
+    graph = Graph()
+    graph.add_vertices(labels)
+    for row, values in enumerate(matrix):
+        for column, value in enumerate(values):
+            if value:
+                graph.add_edge(labels[row], labels[column], value)
+    return adjacency(graph)
+
+
+def test_create_from_adjacency_matrix_matches_reference():
+    rng = np.random.default_rng(15)
+    for _ in range(40):
+        size = int(rng.integers(0, 40))
+        # несимметричная матрица: для пары (i, j), (j, i) берется первая по строкам ячейка
+        matrix = rng.integers(0, 4, size=(size, size)) * (rng.random((size, size)) < 0.3)
+        labels = [f'вершина {number}' for number in rng.permutation(size).tolist()]
+
+        graph = Graph().create_from_adjacency_matrix(matrix, labels)
+        assert adjacency(graph) == matrix_reference(matrix.tolist(), labels)
+        assert graph.get_vertices() == labels
+
+        assert adjacency(Graph().create_from_adjacency_matrix(matrix.tolist(), labels)) == adjacency(graph)
+
+
+def test_create_from_adjacency_matrix_default_labels():
+    matrix = np.eye(30, k=1, dtype=np.int64)
+    graph = Graph().create_from_adjacency_matrix(matrix)
+
+    vertices = graph.get_vertices()
+    assert vertices[:3] == ['A', 'B', 'C'] and vertices[25:] == ['Z', 'AA', 'AB', 'AC', 'AD']
+    assert graph.has_edge('Z', 'AA') and graph.has_edge('AC', 'AD') and graph.num_edges == 29
+    assert Graph._default_labels(703)[-2:] == ['ZZ', 'AAA']
+
+
+def test_create_from_adjacency_matrix_errors():
+    graph = Graph({'A': ['B']})
+    with pytest.raises(Exception):
+        graph.create_from_adjacency_matrix([[0, 1, 0], [1, 0, 0]])
+    with pytest.raises(Exception):
+        graph.create_from_adjacency_matrix([[0, 1], [1, 0]], labels=['A'])
+
+
+TRICKY_LABELS = ['plain', 'with space', 'tab\there', 'back\\slash', '#hash', 'new\nline', ' lead', 'x#', '']
+
+
+def relabeled(graph: Graph, label) -> Graph:
+    copy = Graph()
+    copy.add_vertices([label(vertex) for vertex in graph.get_vertices()])
+    for (start, end), weight in graph.get_edges():
+        copy.add_edge(label(start), label(end), weight)
+    return copy
+
+
+def test_edge_list_round_trip(random_graphs, tmp_path):
+    path = str(tmp_path / 'graph.edges')
+    rng = random.Random(16)
+    for graph in random_graphs(60, max_weight=9, seed=16):
+        names = rng.sample(TRICKY_LABELS, len(TRICKY_LABELS))
+        graph = relabeled(graph, lambda vertex: names[vertex] if vertex < len(names) else f'v {vertex}')
+        graph.write_edge_list(path)
+
+        for use_mmap in (False, True):
+            loaded = Graph()
+            loaded.read_edge_list(path, use_mmap=use_mmap)
+            assert adjacency(loaded) == adjacency(graph)
+
+
+def test_edge_list_weights_round_trip(tmp_path):
+    path = str(tmp_path / 'graph.edges')
+    graph = Graph({'A': [['B', 2 ** 60 + 1], ['C', 0.1]], 'C': [['D', -3]], 'E': [['F', 2.5e300]]})
+    graph.write_edge_list(path)
+
+    loaded = Graph()
+    loaded.read_edge_list(path)
+    assert adjacency(loaded) == adjacency(graph)
+    assert loaded.get_edge_weight('A', 'B') == 2 ** 60 + 1
+
+
+def test_edge_list_isolated_vertex_with_empty_label(tmp_path):
+    path = str(tmp_path / 'graph.edges')
+    Graph({'': [], 'A': []}).write_edge_list(path)
+
+    loaded = Graph()
+    loaded.read_edge_list(path)
+    assert adjacency(loaded) == {'': {}, 'A': {}}
+
+
+def test_edge_list_integer_labels_become_strings(tmp_path):
+    path = str(tmp_path / 'graph.edges')
+    Graph({1: [[2, 3]], 4: []}).write_edge_list(path)
+
+    loaded = Graph()
+    loaded.read_edge_list(path)
+    assert adjacency(loaded) == {'1': {'2': 3}, '2': {'1': 3}, '4': {}}
+
+
+def test_legacy_whitespace_edge_list(tmp_path):
+    path = tmp_path / 'graph.edges'
+    path.write_text('# comment\nA B 2\n\n   \nB C\nD\nC E 0.5\n')
+
+    loaded = Graph()
+    loaded.read_edge_list(str(path))
+    assert adjacency(loaded) == {'A': {'B': 2}, 'B': {'A': 2, 'C': 1}, 'C': {'B': 1, 'E': 0.5},
+                                 'D': {}, 'E': {'C': 0.5}}
+
+
+@pytest.mark.parametrize('text', ['X\tY\t1\nY\tZ\tnot-a-weight\n', 'X\tY\t1\nA\tB\tC\tD\n'])
+def test_malformed_edge_list_keeps_graph(tmp_path, text):
+    graph = Graph({'A': [['B', 4]], 'B': [['A', 4]]})
+    path = tmp_path / 'bad.edges'
+    path.write_text(text)
+
+    with pytest.raises(Exception):
+        graph.read_edge_list(str(path))
+    assert adjacency(graph) == {'A': {'B': 4}, 'B': {'A': 4}}
+    assert graph.num_edges == 1
+
+
+def test_adjacency_matrix_round_trip(random_graphs, tmp_path):
+    path = str(tmp_path / 'graph.txt')
+    for graph in random_graphs(40, max_weight=9, seed=17):
+        labels = graph.get_vertices()
+        for chunk_cells in (1, 10, 1 << 20):
+            graph.write_adjacency_matrix(path, chunk_cells)
+            for use_mmap in (False, True):
+                loaded = Graph()
+                loaded.read_adjacency_matrix(path, labels, use_mmap=use_mmap, chunk_cells=chunk_cells)
+                assert adjacency(loaded) == adjacency(graph)
+
+
+def test_adjacency_matrix_weight_types(tmp_path):
+    path = str(tmp_path / 'graph.txt')
+    for weights in ([2 ** 60 + 1, 3], [0.5, 2], [1e300, -4], [2 ** 53 + 1, 2 ** 62]):
+        graph = Graph({'A': [['B', weights[0]]], 'B': [['C', weights[1]]]})
+        graph.write_adjacency_matrix(path)
+
+        loaded = Graph()
+        loaded.read_adjacency_matrix(path, ['A', 'B', 'C'])
+        assert adjacency(loaded) == adjacency(graph)
+        if all(isinstance(weight, int) for weight in weights):
+            assert all(type(weight) is int for _, weight in loaded.get_edges())
+
+
+def test_adjacency_matrix_text_format(tmp_path):
+    path = tmp_path / 'graph.txt'
+    path.write_text('0\t2  0\n\n2 0 1\r\n0 1 0\n')
+
+    loaded = Graph()
+    loaded.read_adjacency_matrix(str(path), chunk_cells=2)
+    assert adjacency(loaded) == {'A': {'B': 2}, 'B': {'A': 2, 'C': 1}, 'C': {'B': 1}}
+    assert all(type(weight) is int for _, weight in loaded.get_edges())
+
+
+@pytest.mark.parametrize('text', ['0 1\n1 0 0\n', '0 1\n1 x\n', '0 1\n1 0\n0 0\n', '0 1 0\n1 0 0\n'])
+def test_malformed_adjacency_matrix_keeps_graph(tmp_path, text):
+    graph = Graph({'A': [['B', 4]], 'B': [['A', 4]]})
+    path = tmp_path / 'bad.txt'
+    path.write_text(text)
+
+    for chunk_cells in (1, 1 << 20):
+        with pytest.raises(Exception):
+            graph.read_adjacency_matrix(str(path), chunk_cells=chunk_cells)
+        assert adjacency(graph) == {'A': {'B': 4}, 'B': {'A': 4}}
+
+
+def test_save_load_round_trip(random_graphs, tmp_path):
+    path = str(tmp_path / 'graph.bin')
+    for number, graph in enumerate(random_graphs(40, max_weight=9, seed=18)):
+        if number % 2:
+            graph = relabeled(graph, lambda vertex: f'вершина {vertex}')
+        graph.add_edge(graph.get_vertices()[0], graph.get_vertices()[0], 3)
+        graph.save(path)
+
+        mapped = Graph.load(path)
+        loaded = Graph.load(path, mmap=False)
+        assert isinstance(mapped, CSRGraph) and type(loaded) is Graph
+        for other in (mapped, loaded, CSRGraph.load(path, mmap=False)):
+            assert adjacency(other) == adjacency(graph)
+            assert other.get_vertices() == graph.get_vertices()
+            assert other.num_edges == graph.num_edges
+            assert other.degree_histogram() == graph.degree_histogram()
+        assert Graph.load_csr(path)[3] == graph.get_vertices()
+
+        fork = mapped.fork()
+        fork.add_edge('new', graph.get_vertices()[0])
+        assert fork.num_edges == graph.num_edges + 1
+        with pytest.raises(Exception):
+            mapped.add_edge('new', graph.get_vertices()[0])
+        del mapped, fork
+
+
+def test_save_load_weights_and_empty_graph(tmp_path):
+    path = str(tmp_path / 'graph.bin')
+    for graph in (Graph({1: [[2, 0.5]], 2: [[3, 2.25]], 4: []}), Graph({'A': [['B', 2 ** 62 + 1]]}), Graph()):
+        graph.save(path)
+        for mmap in (True, False):
+            assert adjacency(Graph.load(path, mmap=mmap)) == adjacency(graph)
+
+
+def test_save_rejects_mixed_labels_and_load_rejects_other_files(tmp_path):
+    with pytest.raises(Exception):
+        Graph({1: ['A']}).save(str(tmp_path / 'graph.bin'))
+
+    path = tmp_path / 'other.bin'
+    path.write_bytes(b'not a graph snapshot' * 4)
+    for load in (Graph.load, CSRGraph.load):
+        with pytest.raises(Exception):
+            load(str(path))
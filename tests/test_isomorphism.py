@@ -0,0 +1,116 @@
+import random
+from itertools import permutations
+
+from conftest import build_graph, random_edges
+from graph import Graph
+
+
+def edge_set(graph: Graph) -> set[frozenset]:
+    return {frozenset((start, end)) for start, end in graph.get_edges(weights=False)}
+
+
+def is_isomorph_brute(graph: Graph, other: Graph) -> bool:
+    vertices, other_vertices = graph.get_vertices(), other.get_vertices()
+    if len(vertices) != len(other_vertices):
+        return False
+    edges, other_edges = edge_set(graph), edge_set(other)
+    return any({frozenset(mapping[v] for v in edge) for edge in edges} == other_edges
+               for mapping in (dict(zip(vertices, image)) for image in permutations(other_vertices)))
+
+
+def embeddings_brute(host: Graph, pattern: Graph, induced: bool) -> set[tuple]:
+    pattern_vertices = pattern.get_vertices()
+    pattern_edges, host_edges = edge_set(pattern), edge_set(host)
+    found = set()
+    for image in permutations(host.get_vertices(), len(pattern_vertices)):
+        mapping = dict(zip(pattern_vertices, image))
+        mapped = {frozenset(mapping[v] for v in edge) for edge in pattern_edges}
+        if not mapped <= host_edges:
+            continue
+        if induced and any(frozenset(pair) in host_edges
+                           for pair in permutations(image, 2) if frozenset(pair) not in mapped):
+            continue
+        found.add(image)
+    return found
+
+
+def relabeled(graph: Graph, rng: random.Random) -> Graph:
+    """Копия графа со случайной перестановкой и строковыми названиями вершин"""
+
+    vertices = graph.get_vertices()
+    images = [f'v{number}' for number in range(len(vertices))]
+    rng.shuffle(images)
+    mapping = dict(zip(vertices, images))
+    copy = Graph()
+    copy.add_vertices(images[::-1])
+    for start, end in graph.get_edges(weights=False):
+        copy.add_edge(mapping[start], mapping[end])
+    return copy
+
+
+def test_is_isomorph_matches_brute_force():
+    rng = random.Random(10)
+    for _ in range(300):
+        vertices_count = rng.randint(1, 6)
+        graph = build_graph(vertices_count, random_edges(rng, vertices_count, rng.uniform(0.2, 0.8)))
+        other = build_graph(vertices_count, random_edges(rng, vertices_count, rng.uniform(0.2, 0.8)))
+
+        assert graph.is_isomorph(other) == is_isomorph_brute(graph, other)
+
+        copy = relabeled(graph, rng)
+        assert graph.is_isomorph(copy)
+        assert graph.weisfeiler_lehman_hash() == copy.weisfeiler_lehman_hash()
+
+        mapping = graph.find_isomorphism(copy)
+        assert sorted(mapping.values()) == sorted(copy.get_vertices())
+        assert {frozenset(mapping[v] for v in edge) for edge in edge_set(graph)} == edge_set(copy)
+
+
+def test_is_isomorph_regular_graphs():
+    # шестиугольник и две треугольные компоненты: одинаковые степени и цвета Вейсфейлера-Лемана
+    hexagon = Graph({number: [(number + 1) % 6] for number in range(6)})
+    triangles = Graph({0: [1, 2], 1: [2], 3: [4, 5], 4: [5]})
+    assert not hexagon.is_isomorph(triangles)
+    assert not triangles.is_isomorph(hexagon)
+    assert hexagon.is_isomorph({'a': ['c'], 'c': ['e'], 'e': ['b'], 'b': ['f'], 'f': ['d'], 'd': ['a']})
+
+
+def test_subgraph_embeddings_match_brute_force():
+    rng = random.Random(11)
+    for _ in range(200):
+        host_count, pattern_count = rng.randint(1, 6), rng.randint(1, 4)
+        host = build_graph(host_count, random_edges(rng, host_count, rng.uniform(0.3, 0.9)))
+        pattern = build_graph(pattern_count, random_edges(rng, pattern_count, rng.uniform(0.3, 0.9)))
+        pattern_vertices = pattern.get_vertices()
+
+        for induced in (False, True):
+            embeddings = [tuple(mapping[v] for v in pattern_vertices)
+                          for mapping in host.find_subgraph_embeddings(pattern, induced)]
+            assert len(embeddings) == len(set(embeddings))
+            assert set(embeddings) == embeddings_brute(host, pattern, induced)
+
+        limited = list(host.find_subgraph_embeddings(pattern, limit=2))
+        assert len(limited) == min(2, len(embeddings_brute(host, pattern, False)))
+
+
+def test_is_subgraph_matches_edge_sets():
+    rng = random.Random(12)
+    for _ in range(200):
+        vertices_count = rng.randint(1, 7)
+        graph = build_graph(vertices_count, random_edges(rng, vertices_count, 0.5, max_weight=3))
+        edges = graph.get_edges()
+
+        picked = [edge for edge in edges if rng.random() < 0.5]
+        subgraph = Graph()
+        for (start, end), weight in picked:
+            subgraph.add_edge(start, end, weight)
+        assert graph.is_subgraph(subgraph) and graph.is_subgraph(subgraph, weights=True)
+
+        if picked:
+            (start, end), weight = picked[0]
+            reweighted = Graph()
+            reweighted.add_edge(start, end, weight + 1)
+            assert graph.is_subgraph(reweighted) and not graph.is_subgraph(reweighted, weights=True)
+
+        start, end = rng.randrange(vertices_count), rng.randrange(vertices_count + 1)
+        assert graph.is_subgraph({start: [end]}) == graph.has_edge(start, end)
@@ -0,0 +1,132 @@
+import random
+
+import numpy as np
+import pytest
+
+from conftest import adjacency, build_graph, hop_distances, random_edges, weighted_distances
+from graph import Graph, PartitionedGraph
+
+
+def degree_of_source(indptr: np.ndarray, indices: np.ndarray, weights: np.ndarray, source: int) -> int:
+    return int(indptr[source + 1] - indptr[source])
+
+
+def test_run_many_matches_single_source():
+    rng = random.Random(45)
+    graph = build_graph(25, random_edges(rng, 25, 0.12, max_weight=6))
+    vertices = graph.get_vertices()
+    expected = weighted_distances(graph)
+
+    hops = dict(graph.run_many(vertices, processes=2, chunksize=3))
+    weighted = dict(graph.run_many(vertices, 'dijkstra', processes=2))
+    degrees = dict(graph.run_many(vertices, degree_of_source, processes=2))
+    assert sorted(hops) == sorted(weighted) == sorted(degrees) == vertices
+    for start in vertices:
+        assert hops[start].tolist() == graph.hop_distances(start).tolist()
+        assert weighted[start].tolist() == [expected[start, vertex] for vertex in vertices]
+        assert degrees[start] == graph.get_degree_vertex(start)
+
+
+def test_run_many_rejects_bad_arguments():
+    graph = Graph({'A': [['B', -1]], 'B': [['A', -1]]})
+    with pytest.raises(Exception):
+        graph.run_many(['A'], 'unknown')
+    with pytest.raises(Exception):
+        graph.run_many(['C'])
+    with pytest.raises(Exception):
+        graph.run_many(['A'], 'dijkstra')
+
+
+@pytest.mark.parametrize('partition, bounds', [('hash', None), ('range', [8, 16])])
+def test_partitioned_graph_matches_graph(partition, bounds):
+    rng = random.Random(46)
+    graph = build_graph(24, random_edges(rng, 24, 0.08))
+
+    with PartitionedGraph.from_graph(graph, shards=3, partition=partition, bounds=bounds, chunk_size=7) as parts:
+        for _ in range(2):
+            assert sorted(parts.get_vertices()) == sorted(graph.get_vertices())
+            assert parts.num_vertices == graph.num_vertices
+            assert parts.num_edges == graph.num_edges
+            assert parts.component_count() == graph.component_count()
+            components = parts.connected_components()
+            assert all((components[start] == components[end]) == graph.connected(start, end)
+                       for start in graph.get_vertices() for end in graph.get_vertices())
+            for start in graph.get_vertices():
+                assert sorted(parts.get_adjacency_vertices(start)) == sorted(graph.get_adjacency_vertices(start))
+                assert parts.get_degree_vertex(start) == graph.get_degree_vertex(start)
+                assert parts.bfs_levels(start)[0] == hop_distances(graph, start)
+                assert parts.bfs_levels(start, 2)[0] == {vertex: depth for vertex, depth
+                                                         in hop_distances(graph, start).items() if depth <= 2}
+
+            edges = [(rng.randrange(24), rng.randrange(24)) for _ in range(5)]
+            for start, end in edges:
+                if start != end:
+                    graph.add_edge(start, end)
+                    parts.add_edge(start, end)
+                assert parts.has_edge(start, end) == graph.has_edge(start, end)
+            removed = rng.randrange(24)
+            graph.delete_vertex(removed)
+            parts.delete_vertex(removed)
+            graph.add_vertex(removed)
+            parts.add_vertex(removed)
+
+
+def test_partitioned_graph_from_edge_stream():
+    rng = random.Random(47)
+    edges = random_edges(rng, 30, 0.1, max_weight=4) + [(5, 5, 2)]
+    graph = build_graph(30, edges)
+
+    with PartitionedGraph.from_edges(iter(edges), shards=4, chunk_size=5) as parts:
+        reference = {vertex: neighbors for vertex, neighbors in adjacency(graph).items() if neighbors}
+        assert sorted(parts.get_vertices()) == sorted(reference)
+        assert parts.num_edges == graph.num_edges
+        components = parts.connected_components()
+        assert all((components[start] == components[end]) == graph.connected(start, end)
+                   for start in reference for end in reference)
+        # изолированных вершин поток ребер не содержит, строка считает ребра как у Graph
+        assert str(parts) == f"Граф с {len(reference)} вершинами и {len(graph.get_edges())} ребрами"
+
+
+def test_partitioned_graph_rejects_bad_arguments():
+    for kwargs in ({'shards': 0}, {'partition': 'range'}, {'partition': 'range', 'bounds': [1, 2]},
+                   {'partition': 'random'}):
+        with pytest.raises(Exception):
+            PartitionedGraph(**kwargs)
+
+
+def test_shortest_paths_many_match_shortest_path():
+    rng = random.Random(48)
+    graph = build_graph(25, random_edges(rng, 25, 0.12, max_weight=6))
+    graph.add_vertex(25)
+    vertices = graph.get_vertices()
+    expected = weighted_distances(graph)
+
+    pairs = [(rng.choice(vertices), rng.choice(vertices)) for _ in range(60)] + [(0, 25), (3, 3), (0, 1), (0, 1)]
+    paths = graph.shortest_paths_many(pairs, processes=2)
+    weighted_paths = graph.shortest_paths_many(pairs, weighted=True, processes=2)
+    for (start, finish), path, weighted_path in zip(pairs, paths, weighted_paths):
+        reference = graph.shortest_path(start, finish)
+        if reference is None:
+            assert path is None and weighted_path is None
+            continue
+        # пути - кортежи, как у shortest_path
+        assert type(path) is tuple and type(weighted_path[0]) is tuple
+        assert path[0] == start and path[-1] == finish and len(path) == len(reference)
+        assert all(graph.has_edge(*edge) for edge in zip(path, path[1:]))
+        assert weighted_path[1] == expected[start, finish]
+        assert weighted_path[1] == sum(graph.get_edge_weight(*edge) for edge in zip(weighted_path[0], weighted_path[0][1:]))
+
+    unordered = list(graph.shortest_paths_many(pairs, processes=2, ordered=False))
+    assert sorted(pair for pair, _ in unordered) == sorted(pairs)
+    for pair, result in unordered:
+        reference = paths[pairs.index(pair)]
+        assert (result is None and reference is None) or len(result) == len(reference)
+
+
+def test_shortest_paths_many_rejects_bad_arguments():
+    graph = Graph({'A': [['B', -1]], 'B': [['A', -1]], 'C': []})
+    assert graph.shortest_paths_many([('A', 'C'), ('A', 'B')]) == [None, ('A', 'B')]
+    with pytest.raises(Exception):
+        graph.shortest_paths_many([('A', 'D')])
+    with pytest.raises(Exception):
+        graph.shortest_paths_many([('A', 'B')], weighted=True)
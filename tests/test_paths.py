@@ -0,0 +1,166 @@
+import pytest
+
+from conftest import hop_distances, weighted_distances
+from graph import Graph
+
+
+def simple_paths(graph: Graph, start, finish) -> list[tuple]:
+    """Все простые пути перебором"""
+
+    adjacency = graph.get_graph_weighted()
+    found = []
+
+    def extend(path):
+        if path[-1] == finish:
+            found.append(tuple(path))
+            return
+        for neighbor, _ in adjacency[path[-1]]:
+            if neighbor not in path:
+                extend(path + [neighbor])
+
+    extend([start])
+    return found
+
+
+def path_weight(graph: Graph, path) -> int:
+    return sum(graph.get_edge_weight(start, end) for start, end in zip(path, path[1:]))
+
+
+def is_path(graph: Graph, path, start, finish) -> bool:
+    return (path[0] == start and path[-1] == finish and len(set(path)) == len(path)
+            and all(graph.has_edge(u, v) for u, v in zip(path, path[1:])))
+
+
+def test_shortest_paths_match_brute_force(random_graphs):
+    for graph in random_graphs(60, max_weight=6, seed=7):
+        distances = weighted_distances(graph)
+        for start in graph.get_vertices():
+            hops = hop_distances(graph, start)
+            lengths, parents = graph.shortest_path_lengths(start)
+            assert lengths == {vertex: distances[start, vertex] for vertex in graph.get_vertices()
+                               if distances[start, vertex] != float('inf')}
+            assert graph.shortest_path_lengths(start, weighted=False)[0] == hops
+            assert parents[start] is None
+            for vertex, parent in parents.items():
+                if vertex != start:
+                    assert lengths[vertex] == lengths[parent] + graph.get_edge_weight(parent, vertex)
+
+            for finish in graph.get_vertices():
+                path = graph.shortest_path(start, finish)
+                weighted = graph.shortest_path(start, finish, weighted=True)
+                if finish not in hops:
+                    assert path is None and weighted is None
+                    continue
+                assert is_path(graph, path, start, finish) and len(path) - 1 == hops[finish]
+                assert is_path(graph, weighted[0], start, finish)
+                assert weighted[1] == path_weight(graph, weighted[0]) == distances[start, finish]
+
+
+
+def test_bidirectional_and_astar_match_brute_force(random_graphs):
+    for graph in random_graphs(60, max_weight=6, seed=8):
+        distances = weighted_distances(graph)
+        for start in graph.get_vertices():
+            hops = hop_distances(graph, start)
+            for finish in graph.get_vertices():
+                results = {
+                    'hops': graph.bidirectional_shortest_path(start, finish),
+                    'weighted': graph.bidirectional_shortest_path(start, finish, weighted=True),
+                    'astar': graph.astar_path(start, finish, lambda vertex, target: 0),
+                }
+                if finish not in hops:
+                    assert all(path is None and length is None for path, length, _ in results.values())
+                    continue
+
+                path, length, _ = results.pop('hops')
+                assert is_path(graph, path, start, finish) and length == len(path) - 1 == hops[finish]
+                for path, length, _ in results.values():
+                    assert is_path(graph, path, start, finish)
+                    assert length == path_weight(graph, path) == distances[start, finish]
+
+
+def test_astar_heuristic_on_grid():
+    size = 12
+    graph = Graph()
+    for x in range(size):
+        for y in range(size):
+            if x + 1 < size:
+                graph.add_edge((x, y), (x + 1, y), 1 + (x * y) % 3)
+            if y + 1 < size:
+                graph.add_edge((x, y), (x, y + 1), 1 + (x + y) % 3)
+
+    def manhattan(vertex, target):
+        return abs(vertex[0] - target[0]) + abs(vertex[1] - target[1])
+
+    distances, _ = graph.shortest_path_lengths((0, 0))
+    for target in [(size - 1, size - 1), (3, 7), (0, 0)]:
+        path, length, expanded = graph.astar_path((0, 0), target, manhattan)
+        _, _, expanded_blind = graph.astar_path((0, 0), target, lambda vertex, finish: 0)
+
+        assert is_path(graph, path, (0, 0), target)
+        assert length == path_weight(graph, path) == distances[target]
+        assert expanded <= expanded_blind
+
+
+@pytest.mark.parametrize('method', ['floyd_warshall', 'dijkstra', 'auto'])
+def test_all_pairs_distances_match_brute_force(random_graphs, method):
+    for graph in random_graphs(30, max_weight=6, seed=9):
+        for _ in range(2):
+            expected = weighted_distances(graph)
+            distances, index = graph.all_pairs_distances(method)
+            assert not distances.flags.writeable
+            for (start, finish), distance in expected.items():
+                assert distances[index[start], index[finish]] == distance
+            # таблица пересчитывается после изменения графа
+            graph.add_edge(graph.get_vertices()[0], 'new', 1)
+
+
+def test_dfs_and_bfs_paths_match_brute_force(random_graphs):
+    for graph in random_graphs(60):
+        vertices = graph.get_vertices()
+        for start in vertices:
+            for finish in vertices:
+                if start == finish:
+                    continue
+                expected = simple_paths(graph, start, finish)
+                dfs = [tuple(path) for path in graph.dfs_paths(start, finish)]
+                bfs = [tuple(path) for path in graph.bfs_paths(start, finish)]
+
+                assert sorted(dfs) == sorted(expected)
+                assert sorted(bfs) == sorted(expected)
+                assert [len(path) for path in bfs] == sorted(len(path) for path in bfs)
+
+
+def test_paths_max_length_and_limit(random_graphs):
+    for graph in random_graphs(40, seed=1):
+        vertices = graph.get_vertices()
+        start, finish = vertices[0], vertices[-1]
+        if start == finish:
+            continue
+        expected = simple_paths(graph, start, finish)
+        for max_length in range(1, len(vertices)):
+            short = sorted(path for path in expected if len(path) - 1 <= max_length)
+            assert sorted(map(tuple, graph.dfs_paths(start, finish, max_length))) == short
+            assert sorted(map(tuple, graph.bfs_paths(start, finish, max_length))) == short
+
+        shortest = sorted(len(path) for path in expected)[:2]
+        assert [len(path) for path in graph.bfs_paths(start, finish, limit=2)] == shortest
+
+
+def test_k_shortest_paths_match_brute_force(random_graphs):
+    for graph in random_graphs(60, max_weight=5, seed=2):
+        vertices = graph.get_vertices()
+        for start in vertices:
+            for finish in vertices:
+                if start == finish:
+                    continue
+                expected = sorted(path_weight(graph, path) for path in simple_paths(graph, start, finish))
+                for k in (1, 3, 10):
+                    result = graph.k_shortest_paths(start, finish, k)
+
+                    assert [length for _, length in result] == expected[:k]
+                    assert len({tuple(path) for path, _ in result}) == len(result)
+                    for path, length in result:
+                        assert path[0] == start and path[-1] == finish
+                        assert len(set(path)) == len(path)
+                        assert path_weight(graph, path) == length
@@ -0,0 +1,85 @@
+import pytest
+
+from conftest import hop_distances
+from graph import CSRGraph, Graph
+
+
+@pytest.mark.parametrize('method', ['dfs', 'bfs'])
+def test_traversal_visits_each_reachable_vertex_once(random_graphs, method):
+    for graph in random_graphs(80, max_vertices=9, seed=3):
+        for start in graph.get_vertices():
+            visited = list(getattr(graph, method)(start))
+            assert visited[0] == start
+            assert len(visited) == len(set(visited))
+            assert set(visited) == set(hop_distances(graph, start))
+            # каждая вершина, кроме стартовой, открыта из уже посещенного соседа
+            for position, vertex in enumerate(visited[1:], 1):
+                assert any(graph.has_edge(vertex, earlier) for earlier in visited[:position])
+
+
+def test_bfs_visits_by_levels(random_graphs):
+    for graph in random_graphs(80, max_vertices=9, seed=4):
+        for start in graph.get_vertices():
+            hops = hop_distances(graph, start)
+            levels = [hops[vertex] for vertex in graph.bfs(start)]
+            assert levels == sorted(levels)
+
+
+@pytest.mark.parametrize('method', ['dfs', 'bfs'])
+def test_traversal_max_depth_reaches_every_vertex_within_depth(random_graphs, method):
+    for graph in random_graphs(80, max_vertices=9, seed=5):
+        for start in graph.get_vertices():
+            hops = hop_distances(graph, start)
+            for max_depth in range(0, 4):
+                visited = list(getattr(graph, method)(start, max_depth=max_depth))
+                assert len(visited) == len(set(visited))
+                assert set(visited) == {vertex for vertex, depth in hops.items() if depth <= max_depth}
+
+
+def test_traversal_stop_and_callbacks(random_graphs):
+    for graph in random_graphs(30, max_vertices=8, seed=6):
+        start = graph.get_vertices()[0]
+        discovered, finished = [], []
+        visited = list(graph.dfs(start, on_discover=lambda vertex, depth: discovered.append(vertex),
+                                 on_finish=finished.append))
+        assert discovered == visited
+        assert sorted(finished, key=repr) == sorted(visited, key=repr)
+
+        target = visited[-1]
+        stopped = list(graph.bfs(start, stop=lambda vertex: vertex == target))
+        assert stopped[-1] == target
+
+
+def test_bfs_levels_match_brute_force(random_graphs):
+    for graph in random_graphs(50, max_vertices=9, seed=42):
+        graph_csr = CSRGraph.from_graph(graph)
+        vertices = graph.get_vertices()
+        position = {vertex: number for number, vertex in enumerate(vertices)}
+        for start in vertices:
+            hops = hop_distances(graph, start)
+            expected = [hops.get(vertex, -1) for vertex in vertices]
+            distances, parents = graph.bfs_levels(start)
+
+            assert distances.tolist() == expected
+            assert graph_csr.bfs_levels(start)[0].tolist() == expected
+            assert graph.hop_distances(start, 1).tolist() == [-1 if depth > 1 else depth for depth in expected]
+            for vertex, parent in zip(vertices, parents.tolist()):
+                if vertex == start or vertex not in hops:
+                    assert parent == -1
+                else:
+                    assert graph.has_edge(vertices[parent], vertex)
+                    assert distances[position[vertex]] == distances[parent] + 1
+
+
+def test_bfs_levels_follow_mutations():
+    graph = Graph({'A': ['B'], 'B': ['A'], 'C': []})
+    assert graph.hop_distances('A').tolist() == [0, 1, -1]
+
+    # массивы CSR кэшируются до изменения графа
+    graph.add_edge('B', 'C')
+    assert graph.hop_distances('A').tolist() == [0, 1, 2]
+    graph.delete_vertex('B')
+    assert graph.hop_distances('A').tolist() == [0, -1]
+
+    with pytest.raises(Exception):
+        graph.bfs_levels('B')